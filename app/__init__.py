@@ -0,0 +1,4 @@
+import time
+
+# Reference point for the startup report: the first import of any app module
+IMPORT_STARTED = time.perf_counter()
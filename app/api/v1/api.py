@@ -1,6 +1,6 @@
 # app/api/v1/api.py
 from fastapi import APIRouter
-from app.api.v1.endpoints import surveys, health, filters
+from app.api.v1.endpoints import surveys, health, filters, admin
 
 api_router = APIRouter()
 
@@ -13,3 +13,6 @@ api_router.include_router(health.router, prefix="/health", tags=["health"])
 
 # Include filters router
 api_router.include_router(filters.router, prefix="/filters", tags=["filters"])
+
+# Include admin endpoints (dataset reload)
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
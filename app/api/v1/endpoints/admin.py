@@ -0,0 +1,57 @@
+import hmac
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.services import data_service
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(default=None)):
+    """Allow the request only with ``X-Admin-Token`` matching ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not x_admin_token or not hmac.compare_digest(
+        x_admin_token, settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post("/reload", dependencies=[Depends(require_admin_token)])
+async def reload_data(
+    full: bool = Query(
+        False, description="Reload everything even if only new delta files arrived"
+    )
+):
+    """Refresh the dataset and swap it in without dropping requests
+
+    New delta files are merged incrementally; any other change (or
+    ``full=true``) rebuilds the dataset and its indexes. Either runs on a
+    worker thread while the current one keeps serving; the response reports
+    the duration.
+    """
+    try:
+        return await run_in_threadpool(data_service.refresh_data_service, full)
+    except Exception as e:
+        logger.error(f"Error in reload_data endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/compact", dependencies=[Depends(require_admin_token)])
+async def compact_data():
+    """Fold merged delta files into a compacted dataset now"""
+    try:
+        result = await run_in_threadpool(data_service.compact_data_service, True)
+        return result or {"status": "unchanged"}
+    except Exception as e:
+        logger.error(f"Error in compact_data endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/reload", dependencies=[Depends(require_admin_token)])
+async def reload_status():
+    """Outcome and duration of the most recent reload"""
+    return data_service.last_reload or {"status": "never"}
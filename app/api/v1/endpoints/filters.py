@@ -1,33 +1,28 @@
-from fastapi import APIRouter, HTTPException, Body
+from fastapi import APIRouter, HTTPException, Body, Query, Request
 from app.models.filter import FilterOptions
 from app.core.config import settings
-from typing import List, Optional, Dict
+from app.services.data_service import get_data_service
+from typing import List, Literal, Optional, Dict
 import logging
 
-# Conditionally import the service based on configuration
-if settings.USE_LOCAL_DATA:
-    from app.services.local_data_service import LocalDataService as DataService
-else:
-    from app.services.dremio_service import DremioService as DataService
-
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_data_service():
-    """Dependency to get data service"""
-    if settings.USE_LOCAL_DATA:
-        return DataService(csv_path=settings.LOCAL_DATA_PATH)
-    else:
-        return DataService()
-
-
 @router.get("/options", response_model=FilterOptions)
-async def get_filter_options():
-    """Get all available filter options without any filters applied"""
+async def get_filter_options(
+    limit: Optional[int] = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+    sort: Literal["value", "frequency"] = Query(default="value"),
+):
+    """Get all available filter options without any filters applied
+
+    Every option list can be capped with ``limit``/``offset`` and ordered by
+    value or by frequency; ``totals`` reports the full size of each list.
+    """
     try:
         data_service = get_data_service()
-        options = data_service.get_filter_options()
+        options = data_service.get_filter_options(limit=limit, offset=offset, sort=sort)
 
         logger.info(f"Returning filter options with {len(options.msl_names)} MSL names")
 
@@ -37,29 +32,139 @@ async def get_filter_options():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _progressive_options(
+    applied_filters: Dict[str, List[str]],
+    target_filter: Optional[str],
+    limit: Optional[int],
+    offset: int,
+    sort: str,
+    approx: bool,
+):
+    """Progressive options for the POST and GET forms of the endpoint"""
+    data_service = get_data_service()
+
+    if approx:
+        estimated = data_service.estimate_filter_options(
+            applied_filters, target_filter, limit, offset, sort
+        )
+        return {
+            **estimated["options"],
+            "totals": estimated["totals"],
+            "estimates": estimated["estimates"],
+            "approx": estimated["approx"],
+        }
+
+    if target_filter:
+        # Get options for a specific filter field
+        page = data_service.get_progressive_filter_page(
+            target_filter, applied_filters, limit, offset, sort
+        )
+        return {
+            target_filter: page["values"],
+            "totals": {target_filter: page["total"]},
+        }
+    else:
+        # Get all filter options based on current selections
+        return data_service.get_filter_options(
+            applied_filters, limit=limit, offset=offset, sort=sort
+        )
+
+
 @router.post("/progressive")
 async def get_progressive_filters(
     applied_filters: Dict[str, List[str]] = Body(...),
     target_filter: Optional[str] = Body(None),
+    limit: Optional[int] = Body(None, ge=1),
+    offset: int = Body(0, ge=0),
+    sort: Literal["value", "frequency"] = Body("value"),
+    approx: bool = Body(False),
 ):
     """Get progressive filter options based on currently applied filters
 
     This endpoint allows filtering options to update dynamically based on
-    other selected filters, providing a progressive disclosure UX.
+    other selected filters, providing a progressive disclosure UX. With
+    ``approx`` the options are estimated from a sample and ``estimates``
+    lists each value's estimated row count and 95% interval.
+    """
+    try:
+        return _progressive_options(
+            applied_filters, target_filter, limit, offset, sort, approx
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_progressive_filters endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/progressive")
+async def get_progressive_filters_query(
+    request: Request,
+    target_filter: Optional[str] = Query(default=None),
+    limit: Optional[int] = Query(default=None, ge=1),
+    offset: int = Query(default=0, ge=0),
+    sort: Literal["value", "frequency"] = Query(default="value"),
+    approx: bool = Query(default=False),
+):
+    """Progressive filter options with the selections in the query string
+
+    Same as the POST form, with applied filters passed as repeated query
+    parameters (e.g. ``?regions=EU&regions=US&target_filter=products``).
+    Being a GET, responses carry an ETag for the dataset version, so
+    clients re-polling on every selection change can revalidate cheaply.
+    """
+    try:
+        data_service = get_data_service()
+        applied_filters = {
+            key: request.query_params.getlist(key)
+            for key in data_service.FILTER_FIELD_MAPPING
+            if key in request.query_params
+        }
+
+        return _progressive_options(
+            applied_filters, target_filter, limit, offset, sort, approx
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_progressive_filters_query endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{field}/suggest")
+async def suggest_filter_values(
+    field: str,
+    request: Request,
+    prefix: str = Query(default=""),
+    limit: int = Query(default=20, ge=1, le=200),
+):
+    """Typeahead lookup for a single filter field
+
+    Returns values of ``field`` starting with ``prefix`` (case-insensitive).
+    Any other filter fields passed as query parameters (e.g.
+    ``?regions=EU&regions=US``) restrict the suggestions to values present
+    under those selections.
     """
     try:
         data_service = get_data_service()
 
-        if target_filter:
-            # Get options for a specific filter field
-            options = data_service.get_progressive_filter_options(
-                target_filter, applied_filters
+        if field not in data_service.FILTER_FIELD_MAPPING:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown filter field: {field}"
             )
-            return {target_filter: options}
-        else:
-            # Get all filter options based on current selections
-            return data_service.get_filter_options(applied_filters)
 
+        applied_filters = {
+            key: request.query_params.getlist(key)
+            for key in data_service.FILTER_FIELD_MAPPING
+            if key in request.query_params
+        }
+
+        return data_service.suggest_filter_values(field, prefix, applied_filters, limit)
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in get_progressive_filters endpoint: {str(e)}")
+        logger.error(f"Error in suggest_filter_values endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
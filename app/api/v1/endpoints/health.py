@@ -1,28 +1,25 @@
 import logging
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from app.core.config import settings
-
-# Conditionally import the service based on configuration
-if settings.USE_LOCAL_DATA:
-    from app.services.local_data_service import LocalDataService as DataService
-else:
-    from app.services.dremio_service import DremioService as DataService
+from app.core.startup import startup_report
+from app.services.data_service import data_service_pending, get_data_service
+from app.services.air_api_service import air_api_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_data_service():
-    """Get the appropriate data service based on configuration"""
-    if settings.USE_LOCAL_DATA:
-        return DataService(csv_path=settings.LOCAL_DATA_PATH)
-    else:
-        return DataService()
-
-
 @router.get("/health")
 async def health_check():
     """Health check endpoint"""
+    if data_service_pending():
+        raise HTTPException(
+            status_code=503,
+            detail="Service unhealthy: data is still loading",
+            headers={"Retry-After": "5"},
+        )
+
     try:
         data_service = get_data_service()
 
@@ -56,3 +53,18 @@ async def health_check():
 async def health_check_root():
     """Alternative health check at root of health router"""
     return await health_check()
+
+
+@router.get("/air-api")
+async def air_api_status():
+    """Connection pool, admission control, circuit breaker and cache metrics"""
+    return air_api_service.get_metrics()
+
+
+@router.get("/ready")
+async def readiness():
+    """Readiness probe: 200 once the startup warm-up has finished, 503 before"""
+    report = startup_report.as_dict()
+    return JSONResponse(
+        status_code=200 if startup_report.ready else 503, content=report
+    )
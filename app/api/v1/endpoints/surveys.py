@@ -1,31 +1,23 @@
-from typing import List, Optional, Dict
-from fastapi import APIRouter, HTTPException, Query, Body
-from app.models.filter import SurveyFilter, FilterOptions
+from datetime import date
+from typing import AsyncIterator, List, Literal, Optional, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from app.models.chat import ChatBatchRequest
+from app.models.filter import SurveyBatchRequest, SurveyFilter, FilterOptions
 from app.core.config import settings
+from app.services.data_service import data_service_pending, get_data_service
+import json
 import logging
 
-# Conditionally import the service based on configuration
-if settings.USE_LOCAL_DATA:
-    from app.services.local_data_service import LocalDataService as DataService
-else:
-    from app.services.dremio_service import DremioService as DataService
-
+from app.core.resilience import AdmissionRejected, CircuitOpenError
 from app.services.air_api_service import air_api_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def get_data_service():
-    """Dependency to get data service"""
-    if settings.USE_LOCAL_DATA:
-        return DataService(csv_path=settings.LOCAL_DATA_PATH)
-    else:
-        return DataService()
-
-
-@router.get("/", response_model=dict)
-async def get_surveys(
+def survey_filter_params(
     # Geographic filters
     country_geo_ids: Optional[List[str]] = Query(default=None),
     territories: Optional[List[str]] = Query(default=None),
@@ -50,33 +42,61 @@ async def get_surveys(
     # Event filters
     channels: Optional[List[str]] = Query(default=None),
     assignment_types: Optional[List[str]] = Query(default=None),
+) -> Dict[str, List[str]]:
+    """Dependency collecting the standard survey filter query parameters"""
+    return {
+        "country_geo_ids": country_geo_ids or [],
+        "territories": territories or [],
+        "regions": regions or [],
+        "msl_names": msl_names or [],
+        "titles": titles or [],
+        "departments": departments or [],
+        "user_types": user_types or [],
+        "survey_names": survey_names or [],
+        "questions": questions or [],
+        "products": products or [],
+        "product_expertise": product_expertise or [],
+        "tumor_types": tumor_types or [],
+        "account_names": account_names or [],
+        "institutions": institutions or [],
+        "specialties": specialties or [],
+        "practice_settings": practice_settings or [],
+        "channels": channels or [],
+        "assignment_types": assignment_types or [],
+    }
+
+
+@router.get("/", response_model=dict)
+async def get_surveys(
+    filter_params: Dict[str, List[str]] = Depends(survey_filter_params),
+    # Start date range
+    date_from: Optional[date] = Query(default=None),
+    date_to: Optional[date] = Query(default=None),
     # Pagination
     page: int = Query(default=1, ge=1),
     size: int = Query(default=50, ge=1, le=1000),
+    # Ordering
+    sort: Optional[str] = Query(
+        default=None, description="Sort field, e.g. start_date or regions:desc"
+    ),
+    approx: bool = Query(default=False, description="Estimate the total from a sample"),
 ):
-    """Get surveys with multiple filter support"""
+    """Get surveys with multiple filter support
+
+    ``sort`` orders the results by a filter field, ``start_date`` or
+    ``survey_qstn_resp_id`` (ascending unless suffixed with ``:desc``);
+    missing values come last. With ``approx`` the total is an estimate,
+    described (with its 95% interval) under ``approx``.
+    """
     try:
         filters = SurveyFilter(
-            country_geo_ids=country_geo_ids or [],
-            territories=territories or [],
-            regions=regions or [],
-            msl_names=msl_names or [],
-            titles=titles or [],
-            departments=departments or [],
-            user_types=user_types or [],
-            survey_names=survey_names or [],
-            questions=questions or [],
-            products=products or [],
-            product_expertise=product_expertise or [],
-            tumor_types=tumor_types or [],
-            account_names=account_names or [],
-            institutions=institutions or [],
-            specialties=specialties or [],
-            practice_settings=practice_settings or [],
-            channels=channels or [],
-            assignment_types=assignment_types or [],
+            **filter_params,
+            date_from=date_from,
+            date_to=date_to,
             page=page,
             size=size,
+            sort=sort,
+            approx=approx,
         )
 
         logger.info(f"Received filters: {filters.dict(exclude_unset=True)}")
@@ -90,11 +110,144 @@ async def get_surveys(
 
         return result
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in get_surveys endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/batch")
+async def get_surveys_batch(batch: SurveyBatchRequest):
+    """Evaluate several /surveys/ queries in one call
+
+    Each item carries a request ``id`` and the filters, page and sort of one
+    ``/surveys/`` query. Results are keyed by id; each has ``status`` "ok"
+    with the usual page fields, or "error" with an ``error`` message.
+    """
+    try:
+        ids = [item.id for item in batch.items]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(status_code=400, detail="Request ids must be unique")
+
+        data_service = get_data_service()
+        results = await run_in_threadpool(
+            data_service.get_surveys_batch,
+            {item.id: item.filters for item in batch.items},
+            settings.SURVEY_BATCH_WORKERS,
+        )
+        return {"results": results}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_surveys_batch endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/aggregate")
+async def aggregate_surveys(
+    group_by: str = Query(
+        ..., description="Comma-separated fields, e.g. region,response"
+    ),
+    metric: Literal["count", "distinct_accounts"] = Query(default="count"),
+    filter_params: Dict[str, List[str]] = Depends(survey_filter_params),
+):
+    """Grouped counts over the filtered surveys
+
+    ``group_by`` accepts filter parameter names (``regions``) or column names
+    (``region``). Results are cached per (filters, group_by, metric).
+    """
+    try:
+        fields = [field.strip() for field in group_by.split(",") if field.strip()]
+        if not fields:
+            raise HTTPException(status_code=400, detail="group_by is required")
+
+        data_service = get_data_service()
+        return data_service.aggregate_surveys(filter_params, fields, metric)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in aggregate_surveys endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/timeseries")
+async def get_timeseries(
+    bucket: Literal["day", "week", "month"] = Query(default="month"),
+    group_by: Optional[str] = Query(default=None),
+    date_from: Optional[date] = Query(default=None),
+    date_to: Optional[date] = Query(default=None),
+    filter_params: Dict[str, List[str]] = Depends(survey_filter_params),
+):
+    """Survey counts per time bucket of the start date
+
+    ``group_by`` optionally splits the series by one field (filter parameter
+    or column name).
+    """
+    try:
+        data_service = get_data_service()
+        return data_service.get_timeseries(
+            filter_params, bucket, group_by, date_from, date_to
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in get_timeseries endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/count")
+async def count_surveys(
+    date_from: Optional[date] = Query(default=None),
+    date_to: Optional[date] = Query(default=None),
+    filter_params: Dict[str, List[str]] = Depends(survey_filter_params),
+):
+    """Number of surveys matching the filters of ``/surveys/``, without the rows"""
+    try:
+        data_service = get_data_service()
+        return data_service.count_surveys(filter_params, date_from, date_to)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in count_surveys endpoint: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/chat/batch")
+async def chat_batch(request: Request, batch: ChatBatchRequest):
+    """Answer several chat questions concurrently
+
+    Results are streamed back as newline-delimited JSON, one line per item
+    as soon as its answer is ready. Identical questions are only sent to
+    the AI-API service once.
+    """
+    fanout = min(
+        batch.max_concurrency or settings.AIR_API_BATCH_FANOUT,
+        settings.AIR_API_BATCH_FANOUT,
+    )
+    results = air_api_service.send_chat_batch(
+        [item.dict() for item in batch.items], fanout
+    )
+
+    async def lines():
+        try:
+            async for result in results:
+                if await request.is_disconnected():
+                    logger.info("Batch chat client disconnected, cancelling batch")
+                    break
+                yield json.dumps(result) + "\n"
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/{survey_id}")
 async def get_survey(survey_id: str):
     """Get specific survey by ID"""
@@ -116,14 +269,66 @@ async def get_survey(survey_id: str):
 
 @router.post("/chat")
 async def chat_with_data(
+    request: Request,
     query: str = Body(..., embed=True),
     filters: Optional[Dict[str, List[str]]] = Body(default=None, embed=True),
+    stream: bool = Body(default=False, embed=True),
+    include_context: bool = Body(default=False, embed=True),
 ):
-    """Send a natural language query to the AI-API service"""
+    """Send a natural language query to the AI-API service
+
+    With ``stream: true`` (or ``Accept: text/event-stream``) the AI-API
+    output is relayed as server-sent events as it is produced; otherwise
+    the complete reply is returned as JSON. With ``include_context: true``
+    a summary of the filtered data (row count, top responses and products,
+    date span) is sent along with the query.
+    """
+    context = None
+    if include_context and data_service_pending():
+        logger.warning("Data still loading, sending chat query without data context")
+    elif include_context:
+        try:
+            context = get_data_service().get_data_summary(filters)
+        except Exception as e:
+            logger.warning(f"Could not build chat data context: {str(e)}")
+
+    if stream or "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _relay_events(
+                request, air_api_service.stream_chat_query(query, filters, context)
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     try:
-        response = await air_api_service.send_chat_query(query, filters)
+        response = await air_api_service.send_chat_query(
+            query, filters, context=context
+        )
         return response
 
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "1"}
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, int(e.retry_after)))},
+        )
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _relay_events(request: Request, events: AsyncIterator[str]):
+    """Relay SSE events, stopping the upstream stream if the browser goes away"""
+    try:
+        async for event in events:
+            if await request.is_disconnected():
+                logger.info("Chat client disconnected, cancelling AI-API stream")
+                break
+            yield event
+    finally:
+        await events.aclose()
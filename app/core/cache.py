@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts
+
+    Dict keys are sorted, so two filter dicts with the same selections in a
+    different order map to the same key.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def canonical_filters(filters: Optional[dict]) -> dict:
+    """Drop empty selections and sort values so equivalent filters compare equal"""
+    filters = filters or {}
+    return {
+        field: sorted(str(v) for v in filters[field])
+        for field in sorted(filters)
+        if filters[field]
+    }
+
+
+class LRUCache:
+    """Small thread-safe LRU cache with optional per-entry TTL"""
+
+    def __init__(self, maxsize: int = 256, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PersistentLRUCache(LRUCache):
+    """LRUCache that can be saved to and restored from a JSON file
+
+    Keys must be strings and values JSON-serializable. Remaining TTLs are
+    stored as wall-clock expiry times so entries survive a restart but still
+    expire on schedule. The file is rewritten every ``save_every`` writes
+    and on ``save()``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: int = 256,
+        ttl: Optional[float] = None,
+        save_every: int = 20,
+    ):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.path = path
+        self.save_every = save_every
+        self._writes = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load cache file {self.path}: {str(e)}")
+            return
+
+        now, now_monotonic = time.time(), time.monotonic()
+        with self._lock:
+            for key, value, expires_at in entries[-self.maxsize :]:
+                if expires_at is not None:
+                    if expires_at <= now:
+                        continue
+                    expires_at = now_monotonic + (expires_at - now)
+                self._data[key] = (value, expires_at)
+        logger.info(f"Loaded {len(self._data)} cache entries from {self.path}")
+
+    def save(self):
+        now, now_monotonic = time.time(), time.monotonic()
+        with self._lock:
+            entries = [
+                [key, value, None if exp is None else now + (exp - now_monotonic)]
+                for key, (value, exp) in self._data.items()
+            ]
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save cache file {self.path}: {str(e)}")
+
+    def set(self, key: Hashable, value: Any):
+        super().set(key, value)
+        self._writes += 1
+        if self.save_every and self._writes % self.save_every == 0:
+            self.save()
@@ -35,12 +35,83 @@ class Settings(BaseSettings):
         "DREMIO_TABLE_PATH",
         '"Global Development"."Business Applications"."Medical Affairs"."GFMI".p_med_affairs_crm_survey_details',
     )
+    # How long Dremio responses are treated as unchanged for ETags (seconds)
+    DREMIO_DATA_VERSION_TTL: int = int(os.getenv("DREMIO_DATA_VERSION_TTL", "300"))
+    # Percentage of the table read by TABLESAMPLE for approx=true totals
+    DREMIO_SAMPLE_PERCENT: float = float(os.getenv("DREMIO_SAMPLE_PERCENT", "1"))
+
+    # Cache-Control max-age sent with ETagged read responses (seconds)
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "0"))
+
+    # Worker threads evaluating the items of one /surveys/batch request
+    SURVEY_BATCH_WORKERS: int = int(os.getenv("SURVEY_BATCH_WORKERS", "4"))
+
     # Local testing flag
     USE_LOCAL_DATA: bool = os.getenv("USE_LOCAL_DATA", "true").lower() == "true"
     LOCAL_DATA_PATH: str = os.getenv("LOCAL_DATA_PATH", "data/survey_data.csv")
+    # Directory for the shared, memory-mapped copy of the local dataset (e.g.
+    # /dev/shm/gfmi). When set, all workers map one copy instead of each
+    # loading the CSV; empty keeps a private copy per worker.
+    LOCAL_DATA_SHARED_DIR: str = os.getenv("LOCAL_DATA_SHARED_DIR", "")
+    # Directory of delta files applied on top of LOCAL_DATA_PATH, in name
+    # order: ``*.append.csv`` rows are appended, other ``*.csv`` files upsert
+    # by survey_qstn_resp_id. Empty disables deltas.
+    LOCAL_DATA_DELTA_DIR: str = os.getenv("LOCAL_DATA_DELTA_DIR", "")
+    # Compact once merged delta rows reach this fraction of the dataset
+    LOCAL_DATA_COMPACT_RATIO: float = float(
+        os.getenv("LOCAL_DATA_COMPACT_RATIO", "0.1")
+    )
+    # Fraction of rows in the stratified sample behind approx=true answers
+    LOCAL_DATA_SAMPLE_RATE: float = float(os.getenv("LOCAL_DATA_SAMPLE_RATE", "0.01"))
+    # Seconds between checks of the local data source for changes (hot
+    # reload); 0 disables the watcher
+    DATA_WATCH_INTERVAL: float = float(os.getenv("DATA_WATCH_INTERVAL", "10"))
+
+    # Token for the /admin endpoints (X-Admin-Token); they are disabled
+    # while it is empty
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
 
     AIR_API_BASE_URL: str = os.getenv("AIR_API_BASE_URL", "http://localhost:8080")
 
+    # AIR-API connection pool (shared client owned by the app lifespan)
+    AIR_API_CONNECT_TIMEOUT: float = float(os.getenv("AIR_API_CONNECT_TIMEOUT", "5"))
+    AIR_API_READ_TIMEOUT: float = float(os.getenv("AIR_API_READ_TIMEOUT", "60"))
+    AIR_API_POOL_TIMEOUT: float = float(os.getenv("AIR_API_POOL_TIMEOUT", "5"))
+    AIR_API_MAX_CONNECTIONS: int = int(os.getenv("AIR_API_MAX_CONNECTIONS", "20"))
+    AIR_API_MAX_KEEPALIVE: int = int(os.getenv("AIR_API_MAX_KEEPALIVE", "10"))
+    AIR_API_KEEPALIVE_EXPIRY: float = float(os.getenv("AIR_API_KEEPALIVE_EXPIRY", "30"))
+    AIR_API_HTTP2: bool = os.getenv("AIR_API_HTTP2", "false").lower() == "true"
+
+    # AIR-API admission control and circuit breaker
+    AIR_API_MAX_CONCURRENT: int = int(os.getenv("AIR_API_MAX_CONCURRENT", "8"))
+    AIR_API_MAX_QUEUE: int = int(os.getenv("AIR_API_MAX_QUEUE", "16"))
+    AIR_API_QUEUE_TIMEOUT: float = float(os.getenv("AIR_API_QUEUE_TIMEOUT", "2"))
+    AIR_API_BREAKER_THRESHOLD: int = int(os.getenv("AIR_API_BREAKER_THRESHOLD", "5"))
+    AIR_API_BREAKER_RESET: float = float(os.getenv("AIR_API_BREAKER_RESET", "30"))
+
+    # Default and maximum fan-out for /surveys/chat/batch
+    AIR_API_BATCH_FANOUT: int = int(os.getenv("AIR_API_BATCH_FANOUT", "4"))
+
+    # AIR-API chat response cache (persisted to AIR_API_CACHE_PATH when set)
+    AIR_API_CACHE_ENABLED: bool = (
+        os.getenv("AIR_API_CACHE_ENABLED", "true").lower() == "true"
+    )
+    AIR_API_CACHE_TTL: float = float(os.getenv("AIR_API_CACHE_TTL", "3600"))
+    AIR_API_CACHE_SIZE: int = int(os.getenv("AIR_API_CACHE_SIZE", "512"))
+    AIR_API_CACHE_PATH: str = os.getenv("AIR_API_CACHE_PATH", "")
+
+    # Warm-up at startup: "blocking" (serve only once warm), "background"
+    # (serve immediately, /ready reports 503 until warm) or "off"
+    STARTUP_WARMUP: str = os.getenv("STARTUP_WARMUP", "blocking")
+
+    # On-demand request profiling (X-Profile: <token> header);
+    # the middleware is only installed when enabled and a token is set
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_DIR: str = os.getenv("PROFILING_DIR", "profiles")
+    PROFILING_MODE: str = os.getenv("PROFILING_MODE", "sampling")
+    PROFILING_MIN_INTERVAL: float = float(os.getenv("PROFILING_MIN_INTERVAL", "10"))
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,83 @@
+from typing import Tuple
+from urllib.parse import parse_qsl
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.cache import make_cache_key
+from app.core.config import settings
+from app.services.data_service import data_service_pending, get_data_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)"""
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """Conditional GET support for read endpoints
+
+    The ETag is derived from the dataset version and the canonical request
+    (path plus sorted query parameters), so it is known before the endpoint
+    runs. A matching ``If-None-Match`` is answered with 304 without doing
+    any filtering or serialization, and reloading the dataset changes the
+    version and therefore every tag.
+    """
+
+    def __init__(self, app: ASGIApp, prefixes: Tuple[str, ...]):
+        self.app = app
+        self.prefixes = prefixes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in ("GET", "HEAD")
+            or not scope["path"].startswith(self.prefixes)
+            # Still loading in the background: don't wait for it here
+            or data_service_pending()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            version = get_data_service().version
+        except Exception as e:
+            # Let the endpoint report data service errors itself
+            logger.warning(f"No dataset version for ETag: {str(e)}")
+            await self.app(scope, receive, send)
+            return
+
+        query = sorted(parse_qsl(scope["query_string"].decode("latin-1"), True))
+        etag = f'"{make_cache_key(version, scope["path"], query)[:32]}"'
+        cache_control = (
+            f"private, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+        )
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, etag):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (b"etag", etag.encode("latin-1")),
+                        (b"cache-control", cache_control.encode("latin-1")),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message: Message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = etag
+                headers["Cache-Control"] = cache_control
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
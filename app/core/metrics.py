@@ -0,0 +1,282 @@
+import bisect
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Latency buckets in seconds, from sub-millisecond lookups to slow AI calls
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Stage timings collected for the current request (for Server-Timing)
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{str(value)}"'.replace("\n", " ")
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[position] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labels + ("le",), label_values + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """Gauge whose samples are read from callbacks at scrape time"""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._callbacks: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set_function(self, callback: Callable[[], float], *label_values: str):
+        self._callbacks[label_values] = callback
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for label_values, callback in sorted(self._callbacks.items()):
+            try:
+                value = float(callback())
+            except Exception:
+                continue
+            lines.append(
+                f"{self.name}{_format_labels(self.labels, label_values)} {value}"
+            )
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration = registry.register(
+    Histogram(
+        "gfmi_http_request_duration_seconds",
+        "HTTP request latency by route",
+        labels=("method", "route", "status"),
+    )
+)
+stage_duration = registry.register(
+    Histogram(
+        "gfmi_stage_duration_seconds",
+        "Latency of internal processing stages",
+        labels=("stage",),
+    )
+)
+cache_requests = registry.register(
+    Gauge(
+        "gfmi_cache_requests",
+        "Cache lookups by cache and result",
+        labels=("cache", "result"),
+    )
+)
+cache_hit_ratio = registry.register(
+    Gauge("gfmi_cache_hit_ratio", "Cache hit ratio", labels=("cache",))
+)
+dataset_rows = registry.register(
+    Gauge("gfmi_dataset_rows", "Rows in the loaded dataset")
+)
+dataset_memory = registry.register(
+    Gauge(
+        "gfmi_dataset_memory_bytes",
+        "Memory used by the loaded dataset",
+        labels=("component",),
+    )
+)
+dataset_generation = registry.register(
+    Gauge(
+        "gfmi_dataset_generation",
+        "Shared dataset generation attached by this worker (0 when not shared)",
+    )
+)
+air_api_gauges = registry.register(
+    Gauge(
+        "gfmi_air_api",
+        "AIR-API in-flight requests, queue depth and circuit state",
+        labels=("kind",),
+    )
+)
+
+
+@contextmanager
+def stage(name: str):
+    """Time a processing stage into the stage histogram and Server-Timing"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stage_duration.observe(elapsed, name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+def in_request_context(function: Callable) -> Callable:
+    """``function`` bound to the calling request's context, for worker threads
+
+    Executor threads start without the request's context variables, so
+    stages they time would be missing from its Server-Timing header. Each
+    call runs in its own copy of the context, so calls can overlap; the
+    copies share the request's timings list.
+    """
+    context = copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(function, *args, **kwargs)
+
+    return run
+
+
+def register_cache(name: str, cache):
+    """Expose hit/miss counts and hit ratio of an LRUCache"""
+    cache_requests.set_function(lambda: cache.hits, name, "hit")
+    cache_requests.set_function(lambda: cache.misses, name, "miss")
+    cache_hit_ratio.set_function(
+        lambda: (
+            cache.hits / (cache.hits + cache.misses)
+            if cache.hits + cache.misses
+            else 0.0
+        ),
+        name,
+    )
+
+
+class MetricsMiddleware:
+    """Record per-route request latency and emit Server-Timing headers"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._templates: Optional[List[Tuple[Pattern, str]]] = None
+
+    def _route_template(self, scope: Scope) -> str:
+        """Path template for the request, keeping label cardinality bounded
+
+        Templates come from the OpenAPI schema rather than the matched route,
+        so responses short-circuited before routing (e.g. 304s from the ETag
+        middleware) are attributed to their route as well.
+        """
+        if self._templates is None:
+            paths = scope["app"].openapi().get("paths", {})
+            templates = sorted(paths, key=lambda t: (t.count("{"), -len(t)))
+            self._templates = [
+                (re.compile(re.sub(r"\\{[^/]+?\\}", "[^/]+", re.escape(t)) + "$"), t)
+                for t in templates
+            ]
+        path = scope["path"]
+        for pattern, template in self._templates:
+            if pattern.match(path):
+                return template
+        return "unmatched"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings: List[Tuple[str, float]] = []
+        token = _request_timings.set(timings)
+        status = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                entries = [
+                    f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in timings
+                ]
+                entries.append(f"total;dur={(time.perf_counter() - start) * 1000:.2f}")
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", ", ".join(entries)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                self._route_template(scope),
+                str(status),
+            )
@@ -0,0 +1,170 @@
+import cProfile
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+
+
+class StackSampler:
+    """Sampling profiler for one thread, producing folded stacks
+
+    A background thread snapshots the target thread's stack every
+    ``interval`` seconds. The output is the "folded" format understood by
+    flamegraph.pl, speedscope and inferno: one ``frame;frame;frame count``
+    line per distinct stack, outermost frame first.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                filename = os.path.basename(code.co_filename)
+                stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingMiddleware:
+    """Profile individual requests on demand
+
+    A request is profiled when it carries ``X-Profile: <token>`` matching
+    the configured admin token. The token is only read from the header, so
+    it stays out of URLs and therefore access logs and cache keys. Only one
+    request is profiled at a time, and at most one every ``min_interval``
+    seconds; others run normally with ``X-Profile: skipped``. The profile is
+    written to ``directory`` and its file name returned in ``X-Profile``.
+
+    ``mode="sampling"`` writes folded stacks (``.folded``) for flame graphs;
+    ``mode="cprofile"`` writes deterministic ``cProfile`` stats (``.prof``)
+    for snakeviz or flameprof. Both observe the event loop thread, so work
+    of other requests interleaved on the loop can show up in the profile.
+
+    The middleware is only installed when profiling is enabled, so it costs
+    nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str,
+        directory: str = "profiles",
+        mode: str = "sampling",
+        min_interval: float = 10.0,
+        sample_interval: float = 0.001,
+    ):
+        if mode not in ("sampling", "cprofile"):
+            raise ValueError(f"Unknown profiling mode '{mode}'")
+        self.app = app
+        self.token = token
+        self.directory = directory
+        self.mode = mode
+        self.min_interval = min_interval
+        self.sample_interval = sample_interval
+        self._active = False
+        self._last_started = float("-inf")
+
+    def _requested(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return hmac.compare_digest(value.decode("latin-1"), self.token)
+        return False
+
+    def _acquire(self) -> bool:
+        now = time.monotonic()
+        if self._active or now - self._last_started < self.min_interval:
+            return False
+        self._active = True
+        self._last_started = now
+        return True
+
+    def _profile_path(self, scope: Scope) -> str:
+        route = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        extension = "folded" if self.mode == "sampling" else "prof"
+        name = f"{stamp}-{scope['method']}-{route}.{extension}"
+        return os.path.join(self.directory, name)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        if not self._acquire():
+            await self.app(scope, receive, _with_header(send, "skipped"))
+            return
+
+        path = self._profile_path(scope)
+        sampler: Optional[StackSampler] = None
+        profiler: Optional[cProfile.Profile] = None
+        started = time.perf_counter()
+        try:
+            if self.mode == "sampling":
+                sampler = StackSampler(threading.get_ident(), self.sample_interval)
+                sampler.start()
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+            await self.app(scope, receive, _with_header(send, os.path.basename(path)))
+        finally:
+            if sampler is not None:
+                sampler.stop()
+            if profiler is not None:
+                profiler.disable()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                if sampler is not None:
+                    sampler.write(path)
+                else:
+                    profiler.dump_stats(path)
+                logger.info(
+                    f"Profiled {scope['method']} {scope['path']} "
+                    f"({elapsed * 1000:.1f} ms) -> {path}"
+                )
+            except OSError as e:
+                logger.warning(f"Could not write profile {path}: {str(e)}")
+
+
+def _with_header(send: Send, value: str) -> Send:
+    async def wrapped(message: Message):
+        if message["type"] == "http.response.start":
+            MutableHeaders(scope=message).append("X-Profile", value)
+        await send(message)
+
+    return wrapped
@@ -0,0 +1,174 @@
+import json
+import logging
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app import IMPORT_STARTED
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Timings of the import and warm-up phases, plus readiness state"""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.state = "starting"
+        self.error: Optional[str] = None
+        self._started = IMPORT_STARTED
+        self._ready_after: Optional[float] = None
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = round(seconds * 1000, 1)
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def mark_ready(self):
+        self.state = "ready"
+        self._ready_after = time.perf_counter() - self._started
+        logger.info(f"Startup complete: {json.dumps(self.as_dict())}")
+
+    def mark_failed(self, error: Exception):
+        self.state = "failed"
+        self.error = str(error)
+
+    def as_dict(self) -> Dict[str, Any]:
+        report = {"state": self.state, "phases_ms": dict(self.phases)}
+        if self._ready_after is not None:
+            report["ready_after_ms"] = round(self._ready_after * 1000, 1)
+        if self.error:
+            report["error"] = self.error
+        return report
+
+
+startup_report = StartupReport()
+
+
+def warm_up(app) -> None:
+    """Load the data service and prime everything the first request would pay for
+
+    Runs the dataset load and index build, computes the unfiltered filter
+    options once and generates the OpenAPI schema, which also builds every
+    request and response model schema.
+    """
+    from fastapi.encoders import jsonable_encoder
+
+    from app.services.data_service import get_data_service
+
+    data_service = get_data_service()
+
+    if hasattr(data_service, "get_filter_options"):
+        with startup_report.phase("prime_filter_options"):
+            jsonable_encoder(data_service.get_filter_options())
+
+    with startup_report.phase("openapi_schema"):
+        app.openapi()
+
+
+class WarmUpGateMiddleware:
+    """Answer data requests with 503 while a background warm-up is running
+
+    Data endpoints fetch the service on the event loop; before it exists
+    that waits for the whole load and stalls every other request, /ready
+    included. Requests under ``prefixes`` (except ``exempt`` ones) are
+    turned away with ``Retry-After`` instead until the service is built.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefixes: Tuple[str, ...],
+        exempt: Tuple[str, ...] = (),
+        retry_after: int = 5,
+    ):
+        self.app = app
+        self.prefixes = prefixes
+        self.exempt = exempt
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        from app.services.data_service import data_service_pending
+
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.prefixes)
+            or scope["path"].startswith(self.exempt)
+            or not data_service_pending()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Data is still loading"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", str(self.retry_after).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def import_time_report(module: str = "app.main", top: int = 20) -> Dict[str, Any]:
+    """Import ``module`` in a fresh interpreter and report the slowest imports
+
+    Uses ``python -X importtime``; times are cumulative (a package includes
+    everything it imports).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [p.strip() for p in line[len("import time:") :].split("|")]
+        if len(fields) != 3 or not fields[0].isdigit():
+            continue
+        self_us, cumulative_us, name = fields
+        timings.append((name, int(self_us), int(cumulative_us)))
+
+    total = next((cumulative for name, _, cumulative in timings if name == module), 0)
+    slowest = sorted(timings, key=lambda t: t[2], reverse=True)[:top]
+    return {
+        "module": module,
+        "total_ms": round(total / 1000, 1),
+        "slowest": [
+            {
+                "module": name,
+                "self_ms": round(s / 1000, 1),
+                "cumulative_ms": round(c / 1000, 1),
+            }
+            for name, s, c in slowest
+        ],
+        "heavy_modules_loaded": [
+            name
+            for name in ("pandas", "numpy", "requests")
+            if any(t[0] == name for t in timings)
+        ],
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(import_time_report(*sys.argv[1:2]), indent=2))
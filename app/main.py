@@ -1,8 +1,19 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from app import IMPORT_STARTED
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.api.v1.endpoints import health
+from app.api.v1.endpoints import health, metrics
+from app.core.etag import ETagMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.startup import WarmUpGateMiddleware, startup_report, warm_up
+from app.services.data_watcher import DataWatcher
+from app.services.air_api_service import air_api_service
 import logging
 
 # Configure logging
@@ -12,12 +23,70 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+startup_report.record("import_app", time.perf_counter() - IMPORT_STARTED)
+
+
+async def _warm_up(app: FastAPI):
+    """Warm the data service off the event loop and flip readiness"""
+    try:
+        with startup_report.phase("warm_up"):
+            await run_in_threadpool(warm_up, app)
+    except Exception as e:
+        logger.error(f"Warm-up failed: {str(e)}")
+        startup_report.mark_failed(e)
+        return
+    startup_report.mark_ready()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Own shared resources for the lifetime of the app"""
+    await air_api_service.start()
+
+    watcher = None
+    if settings.USE_LOCAL_DATA and settings.DATA_WATCH_INTERVAL > 0:
+        watcher = DataWatcher(settings.DATA_WATCH_INTERVAL)
+        watcher.start()
+
+    warm_up_task = None
+    if settings.STARTUP_WARMUP == "blocking":
+        await _warm_up(app)
+    elif settings.STARTUP_WARMUP == "background":
+        warm_up_task = asyncio.create_task(_warm_up(app))
+    else:
+        startup_report.mark_ready()
+
+    yield
+
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    if watcher is not None:
+        watcher.stop()
+    await air_api_service.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="GFMI Insight Buddy API - Survey Data Management",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+)
+
+# Conditional GET (ETag / If-None-Match) for read endpoints; added before
+# CORS so that 304 responses still carry the CORS headers
+app.add_middleware(
+    ETagMiddleware,
+    prefixes=(f"{settings.API_V1_STR}/surveys", f"{settings.API_V1_STR}/filters"),
+)
+
+# Data requests during a background warm-up get 503 instead of stalling the
+# event loop until the load finishes; chat only needs the AIR-API
+app.add_middleware(
+    WarmUpGateMiddleware,
+    prefixes=(f"{settings.API_V1_STR}/surveys", f"{settings.API_V1_STR}/filters"),
+    exempt=(f"{settings.API_V1_STR}/surveys/chat",),
 )
 
 # CORS middleware
@@ -29,9 +98,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# On-demand request profiling; not installed at all unless enabled
+if settings.PROFILING_ENABLED and settings.PROFILING_TOKEN:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        directory=settings.PROFILING_DIR,
+        mode=settings.PROFILING_MODE,
+        min_interval=settings.PROFILING_MIN_INTERVAL,
+    )
+
+# Request latency metrics and Server-Timing headers; outermost so the
+# timings cover every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Register API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 
 
 @app.get("/")
@@ -47,6 +131,8 @@ async def root():
             "docs": "/docs",
             "redoc": "/redoc",
             "health": "/health",
+            "ready": "/ready",
+            "metrics": "/metrics",
             "surveys": f"{settings.API_V1_STR}/surveys/",
             "filters": f"{settings.API_V1_STR}/filters/options",
         },
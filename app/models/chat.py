@@ -0,0 +1,23 @@
+from typing import Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class ChatBatchItem(BaseModel):
+    """A single question in a batch chat request"""
+
+    id: Optional[str] = Field(
+        default=None, description="Caller-supplied identifier echoed in the result"
+    )
+    query: str = Field(..., description="Natural language query")
+    filters: Optional[Dict[str, List[str]]] = Field(
+        default=None, description="Selected filter values for this query"
+    )
+
+
+class ChatBatchRequest(BaseModel):
+    """Batch of chat questions answered concurrently"""
+
+    items: List[ChatBatchItem] = Field(..., min_length=1, max_length=200)
+    max_concurrency: Optional[int] = Field(
+        default=None, ge=1, description="Fan-out limit (capped by the server)"
+    )
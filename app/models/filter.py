@@ -1,4 +1,5 @@
-from typing import List, Optional
+from datetime import date
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -61,10 +62,47 @@ class SurveyFilter(BaseModel):
         default=None, description="List of assignment types"
     )
 
+    # Date range (applied to the survey start date)
+    date_from: Optional[date] = Field(
+        default=None, description="Earliest survey start date (inclusive)"
+    )
+    date_to: Optional[date] = Field(
+        default=None, description="Latest survey start date (inclusive)"
+    )
+
     # Pagination
     page: Optional[int] = Field(default=1, ge=1, description="Page number")
     size: Optional[int] = Field(default=50, ge=1, le=1000, description="Page size")
 
+    # Ordering
+    sort: Optional[str] = Field(
+        default=None,
+        description="Sort field (filter parameter or column name), optionally "
+        "suffixed with :asc or :desc",
+    )
+
+    # Estimate the total from a sample instead of counting every match
+    approx: Optional[bool] = Field(
+        default=False,
+        description="Return an estimated total with a 95% confidence interval",
+    )
+
+
+class SurveyBatchItem(BaseModel):
+    """One /surveys/ query of a batch"""
+
+    id: str = Field(..., description="Request id the result is keyed by")
+    filters: SurveyFilter = Field(
+        default_factory=SurveyFilter,
+        description="Filters, pagination and sort, as for /surveys/",
+    )
+
+
+class SurveyBatchRequest(BaseModel):
+    """Several /surveys/ queries evaluated together"""
+
+    items: List[SurveyBatchItem] = Field(..., min_length=1, max_length=50)
+
 
 class FilterOptions(BaseModel):
     """Available filter options"""
@@ -85,3 +123,6 @@ class FilterOptions(BaseModel):
     companies: List[str] = Field(default_factory=list)
     channels: List[str] = Field(default_factory=list)
     assignment_types: List[str] = Field(default_factory=list)
+
+    # Total number of available values per option list, before paging
+    totals: Dict[str, int] = Field(default_factory=dict)
@@ -1,19 +1,185 @@
 # app/services/air_api_service.py
+import asyncio
 import httpx
 import json
-from typing import Dict, List, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.core.cache import (
+    LRUCache,
+    PersistentLRUCache,
+    canonical_filters,
+    make_cache_key,
+)
 from app.core.config import settings
+from app.core.metrics import air_api_gauges, register_cache, stage
+from app.core.resilience import (
+    AdmissionRejected,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimiter,
+)
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def _is_upstream_failure(error: BaseException) -> bool:
+    """Errors that indicate AIR-API itself is slow or down"""
+    if isinstance(error, httpx.PoolTimeout):
+        return False
+    if isinstance(error, httpx.TransportError):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return False
+
+
 class AIRAPIService:
     """Service to interact with the AIR-API chat endpoint"""
 
     def __init__(self):
         self.base_url = settings.AIR_API_BASE_URL
-        self.timeout = 60.0  # 60 seconds timeout for AI responses
+        self.timeout = httpx.Timeout(
+            connect=settings.AIR_API_CONNECT_TIMEOUT,
+            read=settings.AIR_API_READ_TIMEOUT,
+            write=settings.AIR_API_CONNECT_TIMEOUT,
+            pool=settings.AIR_API_POOL_TIMEOUT,
+        )
+        self.limits = httpx.Limits(
+            max_connections=settings.AIR_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.AIR_API_MAX_KEEPALIVE,
+            keepalive_expiry=settings.AIR_API_KEEPALIVE_EXPIRY,
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Cache of chat responses keyed on the normalized formatted query
+        self.cache: Optional[LRUCache] = None
+        if settings.AIR_API_CACHE_ENABLED:
+            if settings.AIR_API_CACHE_PATH:
+                self.cache = PersistentLRUCache(
+                    settings.AIR_API_CACHE_PATH,
+                    maxsize=settings.AIR_API_CACHE_SIZE,
+                    ttl=settings.AIR_API_CACHE_TTL,
+                )
+            else:
+                self.cache = LRUCache(
+                    maxsize=settings.AIR_API_CACHE_SIZE, ttl=settings.AIR_API_CACHE_TTL
+                )
+
+        # Admission control and failure isolation for the AIR-API dependency
+        self.limiter = ConcurrencyLimiter(
+            max_concurrent=settings.AIR_API_MAX_CONCURRENT,
+            max_queue=settings.AIR_API_MAX_QUEUE,
+            queue_timeout=settings.AIR_API_QUEUE_TIMEOUT,
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.AIR_API_BREAKER_THRESHOLD,
+            reset_timeout=settings.AIR_API_BREAKER_RESET,
+            is_failure=_is_upstream_failure,
+        )
+
+        # Pool usage counters
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.pool_timeouts = 0
+
+        if self.cache is not None:
+            register_cache("air_api", self.cache)
+        air_api_gauges.set_function(lambda: self.in_flight, "in_flight")
+        air_api_gauges.set_function(lambda: self.limiter.waiting, "queue_depth")
+        air_api_gauges.set_function(
+            lambda: self.breaker.state != CircuitBreaker.CLOSED, "circuit_open"
+        )
+
+    async def start(self):
+        """Create the shared HTTP client (called from the app lifespan)"""
+        if self._client is not None:
+            return
+
+        http2 = settings.AIR_API_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("AIR_API_HTTP2 is set but 'h2' is not installed")
+                http2 = False
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=http2,
+            headers={"Content-Type": "application/json"},
+        )
+        logger.info(
+            f"AIR-API client started (max {self.limits.max_connections} connections, http2={http2})"
+        )
+
+    async def close(self):
+        """Close the shared HTTP client and its pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if isinstance(self.cache, PersistentLRUCache):
+            self.cache.save()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            raise RuntimeError("AIR-API client not started")
+        return self._client
+
+    @asynccontextmanager
+    async def _track_request(self):
+        """Count a request against the pool usage counters while it runs"""
+        self.in_flight += 1
+        self.requests_total += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def get_metrics(self) -> Dict:
+        """Pool, admission, circuit breaker and cache metrics"""
+        max_connections = self.limits.max_connections
+        return {
+            "max_connections": max_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": self.in_flight / max_connections if max_connections else 0,
+            "requests_total": self.requests_total,
+            "pool_timeouts": self.pool_timeouts,
+            "admission": self.limiter.get_metrics(),
+            "circuit_breaker": self.breaker.get_metrics(),
+            "cache": (
+                {
+                    "size": len(self.cache),
+                    "hits": self.cache.hits,
+                    "misses": self.cache.misses,
+                }
+                if self.cache is not None
+                else None
+            ),
+        }
+
+    def cache_key(
+        self,
+        user_query: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Cache key for a chat query
+
+        Built from the formatted query with filters in a canonical order, then
+        lower-cased with whitespace collapsed, so trivially different
+        phrasings of the same request share an entry.
+        """
+        formatted_query = self.format_query_with_filters(
+            user_query, canonical_filters(filters)
+        )
+        return make_cache_key(" ".join(formatted_query.lower().split()), context)
 
     def format_query_with_filters(
         self, user_query: str, filters: Optional[Dict[str, List[str]]] = None
@@ -74,7 +240,11 @@ class AIRAPIService:
         return formatted_query
 
     async def send_chat_query(
-        self, query: str, filters: Optional[Dict[str, List[str]]] = None
+        self,
+        query: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        use_cache: bool = True,
+        context: Optional[Dict[str, Any]] = None,
     ) -> Dict:
         """
         Send a chat query to the AIR-API service
@@ -82,28 +252,53 @@ class AIRAPIService:
         Args:
             query: User's natural language query
             filters: Selected filter values
+            use_cache: Serve repeated queries from the response cache
+            context: Optional summary of the filtered data, sent to the
+                AI service as ``data_context``
 
         Returns:
-            Response from the AIR-API service
+            Response from the AIR-API service, with ``cached`` set to whether
+            it was served from the response cache
         """
         try:
+            cache_key = None
+            if self.cache is not None and use_cache:
+                cache_key = self.cache_key(query, filters, context)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Serving AIR-API response from cache")
+                    return {**cached, "cached": True}
+
             # Format the query with filters
             formatted_query = self.format_query_with_filters(query, filters)
 
             # Prepare the request payload
             payload = {"query": formatted_query}
+            if context is not None:
+                payload["data_context"] = context
 
-            # Send request to AIR-API
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/chat",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                )
+            if self._client is None:
+                await self.start()
 
+            # Send request to AIR-API over the shared pooled client
+            async with self.breaker.guard(), self.limiter.acquire():
+                async with self._track_request():
+                    with stage("air_api_call"):
+                        response = await self.client.post("/chat", json=payload)
                 response.raise_for_status()
-                return response.json()
 
+            result = response.json()
+
+            if not isinstance(result, dict):
+                return result
+            if cache_key is not None:
+                self.cache.set(cache_key, result)
+            return {**result, "cached": False}
+
+        except httpx.PoolTimeout:
+            self.pool_timeouts += 1
+            logger.error("AIR-API connection pool exhausted")
+            raise Exception("AI service is busy. Please try again.")
         except httpx.TimeoutException:
             logger.error("AIR-API request timed out")
             raise Exception("Request to AI service timed out. Please try again.")
@@ -114,6 +309,132 @@ class AIRAPIService:
             logger.error(f"AIR-API error: {str(e)}")
             raise
 
+    async def stream_chat_query(
+        self,
+        query: str,
+        filters: Optional[Dict[str, List[str]]] = None,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat query to the AIR-API service as server-sent events
+
+        Upstream SSE lines are relayed as-is; any other streamed body is
+        wrapped into ``data:`` events chunk by chunk. A final ``done`` event
+        (or an ``error`` event) closes the stream. Closing this generator
+        closes the upstream response, which cancels the AIR-API request.
+
+        Args:
+            query: User's natural language query
+            filters: Selected filter values
+            context: Optional summary of the filtered data
+
+        Yields:
+            SSE-formatted event strings
+        """
+        formatted_query = self.format_query_with_filters(query, filters)
+        payload = {"query": formatted_query, "stream": True}
+        if context is not None:
+            payload["data_context"] = context
+
+        if self._client is None:
+            await self.start()
+
+        try:
+            async with self.breaker.guard(), self.limiter.acquire(), self._track_request():
+                # Timed from the request until the upstream stream ends
+                with stage("air_api_call"):
+                    async with self.client.stream(
+                        "POST",
+                        "/chat",
+                        json=payload,
+                        headers={"Accept": "text/event-stream"},
+                    ) as response:
+                        response.raise_for_status()
+
+                        content_type = response.headers.get("content-type", "")
+                        if content_type.startswith("text/event-stream"):
+                            async for line in response.aiter_lines():
+                                yield f"{line}\n"
+                        else:
+                            async for chunk in response.aiter_text():
+                                if chunk:
+                                    yield _sse_event(chunk)
+
+            yield _sse_event("[DONE]", event="done")
+
+        except (AdmissionRejected, CircuitOpenError) as e:
+            logger.warning(f"AIR-API stream rejected: {str(e)}")
+            yield _sse_event(str(e), event="error")
+        except httpx.TimeoutException:
+            logger.error("AIR-API stream timed out")
+            yield _sse_event(
+                "Request to AI service timed out. Please try again.", event="error"
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"AIR-API HTTP error while streaming: {str(e)}")
+            yield _sse_event(
+                f"Error communicating with AI service: {str(e)}", event="error"
+            )
+
+    async def send_chat_batch(
+        self, items: List[Dict[str, Any]], fanout: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer a batch of chat queries concurrently
+
+        Items whose formatted queries are identical (same normalization as
+        the response cache) are sent once and share the answer. At most
+        ``fanout`` distinct queries are in flight at a time, and results are
+        yielded as each query completes, not in request order. Closing the
+        generator cancels any queries still running.
+
+        Args:
+            items: Dicts with ``query``, optional ``filters`` and ``id``
+            fanout: Maximum number of concurrent AIR-API calls
+
+        Yields:
+            One result dict per item with ``index``, ``id``, ``status`` and
+            either ``response`` or ``error``
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            key = self.cache_key(item["query"], item.get("filters"))
+            groups.setdefault(key, []).append(index)
+
+        logger.info(
+            f"Chat batch: {len(items)} items, {len(groups)} distinct queries, fan-out {fanout}"
+        )
+
+        semaphore = asyncio.Semaphore(fanout)
+
+        async def run(indices: List[int]):
+            item = items[indices[0]]
+            async with semaphore:
+                try:
+                    response = await self.send_chat_query(
+                        item["query"], item.get("filters")
+                    )
+                    return indices, {"status": "ok", "response": response}
+                except Exception as e:
+                    return indices, {"status": "error", "error": str(e)}
+
+        tasks = [asyncio.create_task(run(indices)) for indices in groups.values()]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                indices, outcome = await completed
+                for index in indices:
+                    yield {"index": index, "id": items[index].get("id"), **outcome}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def _sse_event(data: str, event: Optional[str] = None) -> str:
+    """Format a server-sent event, splitting multi-line data across data: fields"""
+    lines = [f"event: {event}"] if event else []
+    lines.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(lines) + "\n\n"
+
 
 # Create singleton instance
 air_api_service = AIRAPIService()
@@ -0,0 +1,404 @@
+# app/services/column_store.py
+import bisect
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def extend_buffer(buffer: np.ndarray, length: int, values: np.ndarray) -> np.ndarray:
+    """Write ``values`` after the first ``length`` entries of ``buffer``
+
+    Returns the buffer now holding ``length + len(values)`` entries: the
+    same one when it is writable and has room, otherwise a larger copy with
+    headroom, so repeated appends cost O(appended values) amortized. Views
+    of the first ``length`` entries are never modified, which is what lets
+    an older snapshot keep serving while a newer one is built on the same
+    buffer. Only the newest holder of a buffer may extend it.
+    """
+    end = length + len(values)
+    dtype = np.result_type(buffer.dtype, values.dtype)
+    if not buffer.flags.writeable or len(buffer) < end or dtype != buffer.dtype:
+        grown = np.empty(max(end, length + length // 4 + 1024), dtype=dtype)
+        grown[:length] = buffer[:length]
+        buffer = grown
+    buffer[length:end] = values
+    return buffer
+
+
+class StringDictionary:
+    """Sorted distinct strings packed as UTF-8 bytes plus offsets
+
+    Two flat arrays instead of a list of Python strings, so the dictionary
+    can be saved and memory mapped like any other column. UTF-8 byte order
+    matches code point order, so lookups are a binary search over the
+    encoded values without decoding the whole dictionary.
+
+    Values added by ``extended`` go to an unsorted tail after the packed
+    values, so existing codes never move; ``ColumnStore.compact`` sorts
+    them back in.
+    """
+
+    def __init__(
+        self, data: np.ndarray, offsets: np.ndarray, tail: Optional[List[str]] = None
+    ):
+        self.data = data
+        self.offsets = offsets
+        self.tail: List[str] = tail or []
+        self._tail_codes = {value: self.packed + i for i, value in enumerate(self.tail)}
+        self._decoded: Optional[List[str]] = None
+        self._decoded_packed: Optional[List[str]] = None
+        self._tail_key_cache: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_values(cls, values: List[str]) -> "StringDictionary":
+        encoded = [value.encode("utf-8") for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return cls(data, offsets)
+
+    @property
+    def packed(self) -> int:
+        """Number of sorted values held in the packed arrays"""
+        return len(self.offsets) - 1
+
+    def __len__(self) -> int:
+        return self.packed + len(self.tail)
+
+    def _encoded(self, code: int) -> bytes:
+        return self.data[self.offsets[code] : self.offsets[code + 1]].tobytes()
+
+    def __getitem__(self, code: int) -> str:
+        if self._decoded is not None:
+            return self._decoded[code]
+        if code >= self.packed:
+            return self.tail[code - self.packed]
+        return self._encoded(code).decode("utf-8")
+
+    def to_list(self) -> List[str]:
+        """All values decoded; kept so later lookups skip decoding"""
+        if self._decoded is None:
+            if self._decoded_packed is None:
+                blob = self.data.tobytes()
+                offsets = self.offsets.tolist()
+                self._decoded_packed = [
+                    blob[offsets[i] : offsets[i + 1]].decode("utf-8")
+                    for i in range(self.packed)
+                ]
+            self._decoded = (
+                self._decoded_packed + self.tail if self.tail else self._decoded_packed
+            )
+        return self._decoded
+
+    def _position(self, value: str) -> int:
+        """Insertion point of ``value`` among the packed (sorted) values"""
+        if self._decoded_packed is not None:
+            return bisect.bisect_left(self._decoded_packed, value)
+
+        key = value.encode("utf-8")
+        lo, hi = 0, self.packed
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._encoded(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def code_of(self, value: str) -> int:
+        """Code of ``value``, or -1 when it is not in the dictionary"""
+        code = self._position(value)
+        if code < self.packed and self[code] == value:
+            return code
+        return self._tail_codes.get(value, -1)
+
+    def sort_keys(self, codes: np.ndarray) -> np.ndarray:
+        """Float keys that order ``codes`` by value, with missing (-1) last
+
+        A packed code is its own key; a tail value gets a key between the
+        packed values around it, so keys compare correctly across both.
+        """
+        keys = codes.astype(np.float64)
+        keys[codes < 0] = np.inf
+        if self.tail:
+            tail = codes >= self.packed
+            keys[tail] = self._tail_keys()[codes[tail] - self.packed]
+        return keys
+
+    def _tail_keys(self) -> np.ndarray:
+        if self._tail_key_cache is None:
+            ranked = sorted(range(len(self.tail)), key=self.tail.__getitem__)
+            keys = np.empty(len(self.tail), dtype=np.float64)
+            for rank, i in enumerate(ranked):
+                # Within (position - 1, position), ordered among the tail
+                position = self._position(self.tail[i])
+                keys[i] = position - 1 + (rank + 1) / (len(self.tail) + 1)
+            self._tail_key_cache = keys
+        return self._tail_key_cache
+
+    def extended(self, values: List[str]) -> Tuple["StringDictionary", np.ndarray]:
+        """Dictionary that also holds ``values``, and the code of each value
+
+        Unknown values are added to a copy of the tail; the packed arrays
+        (and their decoded form) are shared with this dictionary, which is
+        left unchanged.
+        """
+        tail = list(self.tail)
+        added = {}
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            code = self.code_of(value)
+            if code < 0:
+                code = added.get(value, -1)
+                if code < 0:
+                    code = added[value] = len(self) + len(added)
+                    tail.append(value)
+            codes[i] = code
+
+        if not added:
+            return self, codes
+        dictionary = StringDictionary(self.data, self.offsets, tail)
+        dictionary._decoded_packed = self._decoded_packed
+        return dictionary, codes
+
+
+class ColumnStore:
+    """Read-only columnar copy of the dataset held in flat numpy arrays
+
+    String columns are dictionary encoded: int32 codes per row (-1 for
+    missing values) into a sorted ``StringDictionary``. Numeric columns are
+    kept as their numpy arrays. Nothing is a Python object per row, so the
+    arrays can be memory mapped from a shared snapshot (see
+    ``shared_dataset``) and rows are only decoded when they are returned.
+    """
+
+    def __init__(self, columns: List[str], arrays: Dict[str, np.ndarray]):
+        self.columns = list(columns)
+        self._arrays = arrays
+        self._dictionaries: Dict[str, StringDictionary] = {}
+        for column in self.columns:
+            if f"{column}/codes" in arrays:
+                self._dictionaries[column] = StringDictionary(
+                    arrays[f"{column}/data"], arrays[f"{column}/offsets"]
+                )
+
+        first = self.columns[0] if self.columns else None
+        self.row_count = len(self._column_array(first)) if first else 0
+
+        # Per-row arrays are views of these buffers, which may hold spare
+        # capacity for rows appended later (see ``append``)
+        self._buffers = {
+            name: array
+            for name, array in arrays.items()
+            if name.endswith(("/codes", "/values"))
+        }
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "ColumnStore":
+        """Encode every column of ``df``"""
+        arrays = {}
+        for column in df.columns:
+            series = df[column]
+            values = series.to_numpy()
+            if values.dtype.kind in "biuf":
+                arrays[f"{column}/values"] = values
+                continue
+
+            present = series.notna().to_numpy()
+            codes = np.full(len(series), -1, dtype=np.int32)
+            row_codes, uniques = pd.factorize(series[present].astype(str), sort=True)
+            codes[present] = row_codes
+
+            dictionary = StringDictionary.from_values([str(v) for v in uniques])
+            arrays[f"{column}/codes"] = codes
+            arrays[f"{column}/data"] = dictionary.data
+            arrays[f"{column}/offsets"] = dictionary.offsets
+
+        return cls(list(df.columns), arrays)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self.columns
+
+    @property
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return self._arrays
+
+    @property
+    def has_tail(self) -> bool:
+        """Whether any dictionary holds values added since the last compaction"""
+        return any(d.tail for d in self._dictionaries.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self._arrays.values())
+
+    def _column_array(self, column: str) -> np.ndarray:
+        if column in self._dictionaries:
+            return self._arrays[f"{column}/codes"]
+        return self._arrays[f"{column}/values"]
+
+    def is_string(self, column: str) -> bool:
+        return column in self._dictionaries
+
+    def codes(self, column: str) -> np.ndarray:
+        return self._arrays[f"{column}/codes"]
+
+    def dictionary(self, column: str) -> StringDictionary:
+        return self._dictionaries[column]
+
+    def isin(
+        self, column: str, values: List[Any], rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Boolean row mask of rows whose ``column`` is one of ``values``
+
+        Covers every row, or only the row positions ``rows`` when given.
+        """
+        if column not in self.columns:
+            raise KeyError(column)
+
+        if self.is_string(column):
+            dictionary = self._dictionaries[column]
+            # Lookup table indexed by code + 1, so missing values (-1) map to False
+            table = np.zeros(len(dictionary) + 1, dtype=bool)
+            for value in values:
+                table[dictionary.code_of(str(value)) + 1] = True
+            table[0] = False
+            codes = self.codes(column)
+            return table[(codes if rows is None else codes[rows]) + 1]
+
+        numbers = pd.to_numeric(pd.Series(list(values), dtype=object), errors="coerce")
+        array = self._column_array(column)
+        if rows is not None:
+            array = array[rows]
+        return np.isin(array, numbers.dropna().to_numpy())
+
+    def series(self, column: str) -> pd.Series:
+        """Materialize a full column as a pandas Series"""
+        if not self.is_string(column):
+            return pd.Series(self._column_array(column), name=column)
+        values = np.array(self._dictionaries[column].to_list() + [None], dtype=object)
+        return pd.Series(values[self.codes(column)], name=column)
+
+    def first_values(
+        self, codes: np.ndarray, column: str, rows: Optional[np.ndarray] = None
+    ) -> Dict[int, str]:
+        """Value of ``column`` on the first row carrying each code
+
+        Rows where either the code or the value is missing are skipped.
+        ``rows`` restricts the search to those row positions.
+        """
+        if rows is None:
+            rows = np.arange(self.row_count)
+
+        if self.is_string(column):
+            value_codes = self.codes(column)
+            rows = rows[(codes[rows] >= 0) & (value_codes[rows] >= 0)]
+            found, first = np.unique(codes[rows], return_index=True)
+            dictionary = self._dictionaries[column]
+            return {
+                int(code): dictionary[value_code]
+                for code, value_code in zip(found, value_codes[rows[first]])
+            }
+
+        values = self._column_array(column)
+        rows = rows[(codes[rows] >= 0) & pd.notna(values[rows])]
+        found, first = np.unique(codes[rows], return_index=True)
+        return {int(code): str(values[row]) for code, row in zip(found, rows[first])}
+
+    def take(self, rows: np.ndarray) -> List[Dict[str, Any]]:
+        """Rows as dicts, decoding only the requested row positions
+
+        Missing values come back as None, so the records are valid JSON.
+        """
+        columns = []
+        for column in self.columns:
+            if self.is_string(column):
+                dictionary = self._dictionaries[column]
+                columns.append(
+                    [
+                        dictionary[code] if code >= 0 else None
+                        for code in self.codes(column)[rows].tolist()
+                    ]
+                )
+            else:
+                columns.append(
+                    [
+                        None if value != value else value
+                        for value in self._column_array(column)[rows].tolist()
+                    ]
+                )
+        return [dict(zip(self.columns, row)) for row in zip(*columns)]
+
+    def append(self, df: pd.DataFrame) -> "ColumnStore":
+        """Store with the rows of ``df`` added after the existing ones
+
+        Only the new rows are encoded: new string values go to the
+        dictionary tails and codes and values are written into spare
+        capacity of the row buffers. Columns missing from ``df`` are filled
+        with missing values and extra columns are ignored. This store is
+        left unchanged and keeps serving its own rows.
+        """
+        df = df.reindex(columns=self.columns)
+        length, added = self.row_count, len(df)
+
+        arrays = dict(self._arrays)
+        buffers = dict(self._buffers)
+        dictionaries = dict(self._dictionaries)
+        for column in self.columns:
+            series = df[column]
+            if self.is_string(column):
+                name = f"{column}/codes"
+                present = series.notna().to_numpy()
+                row_codes, uniques = pd.factorize(series[present].astype(str))
+                dictionary, codes = self._dictionaries[column].extended(
+                    [str(v) for v in uniques]
+                )
+                dictionaries[column] = dictionary
+                values = np.full(added, -1, dtype=np.int32)
+                values[present] = codes[row_codes]
+            else:
+                name = f"{column}/values"
+                values = pd.to_numeric(series, errors="coerce").to_numpy()
+                if values.dtype.kind not in "biuf":
+                    values = values.astype(np.float64)
+
+            buffers[name] = extend_buffer(self._buffers[name], length, values)
+            arrays[name] = buffers[name][: length + added]
+
+        store = ColumnStore.__new__(ColumnStore)
+        store.columns = self.columns
+        store._arrays = arrays
+        store._buffers = buffers
+        store._dictionaries = dictionaries
+        store.row_count = length + added
+        return store
+
+    def compact(self, rows: np.ndarray) -> "ColumnStore":
+        """Store holding only ``rows``, with every dictionary sorted again
+
+        Tails are merged back into the packed, sorted dictionaries and values
+        no longer used by any kept row are dropped; row codes are remapped
+        with one vectorized lookup per column.
+        """
+        arrays = {}
+        for column in self.columns:
+            if not self.is_string(column):
+                arrays[f"{column}/values"] = self._column_array(column)[rows]
+                continue
+
+            values = self._dictionaries[column].to_list()
+            codes = self.codes(column)[rows]
+            used = np.flatnonzero(np.bincount(codes[codes >= 0], minlength=len(values)))
+            order = sorted(used.tolist(), key=values.__getitem__)
+
+            # Indexed by old code + 1, so missing values (-1) stay -1
+            remap = np.full(len(values) + 1, -1, dtype=np.int32)
+            remap[np.array(order, dtype=np.int64) + 1] = np.arange(
+                len(order), dtype=np.int32
+            )
+            dictionary = StringDictionary.from_values([values[c] for c in order])
+            arrays[f"{column}/codes"] = remap[codes + 1]
+            arrays[f"{column}/data"] = dictionary.data
+            arrays[f"{column}/offsets"] = dictionary.offsets
+
+        return ColumnStore(self.columns, arrays)
@@ -0,0 +1,191 @@
+# app/services/data_service.py
+import logging
+import threading
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import stage
+from app.core.startup import startup_report
+
+logger = logging.getLogger(__name__)
+
+_service = None
+_create_lock = threading.Lock()
+_reload_lock = threading.Lock()
+
+# Outcome of the most recent reload, reported by the admin endpoint
+last_reload: Dict[str, Any] = {}
+
+
+def _create_service(record_phases: bool = True):
+    def phase(name):
+        return startup_report.phase(name) if record_phases else nullcontext()
+
+    # Backends are imported here so only the configured one (and pandas or
+    # requests behind it) is ever loaded
+    if settings.USE_LOCAL_DATA:
+        with phase("import_backend"):
+            from app.services.local_data_service import LocalDataService
+
+        with phase("load_data"):
+            return LocalDataService(
+                csv_path=settings.LOCAL_DATA_PATH,
+                shared_dir=settings.LOCAL_DATA_SHARED_DIR or None,
+                delta_dir=settings.LOCAL_DATA_DELTA_DIR or None,
+                compact_ratio=settings.LOCAL_DATA_COMPACT_RATIO,
+                sample_rate=settings.LOCAL_DATA_SAMPLE_RATE,
+            )
+    else:
+        with phase("import_backend"):
+            from app.services.dremio_service import DremioService
+
+        with phase("load_data"):
+            return DremioService()
+
+
+def get_data_service():
+    """Get the shared data service for this process
+
+    The service is created on first use and reused afterwards, so the CSV
+    (and the indexes built on top of it) is only loaded once instead of on
+    every request. Fetch it once per request and keep the reference: a
+    reload swaps in a new service, and requests already holding the old
+    one finish on it.
+    """
+    global _service
+    service = _service
+    if service is None:
+        with _create_lock:
+            if _service is None:
+                _service = _create_service()
+            service = _service
+    return service
+
+
+def data_service_pending() -> bool:
+    """Whether a background warm-up is still building the data service
+
+    Getting the service then blocks on the creation lock until the load
+    finishes, so code on the event loop checks this first and backs off.
+    """
+    return settings.STARTUP_WARMUP == "background" and _service is None
+
+
+def _swap_service(
+    status: str, stage_name: str, build, details: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build a replacement with ``build(previous)`` and swap it in
+
+    Replacements are serialized and on failure the current service stays in
+    place. The outcome, plus anything ``build`` put in ``details``, is
+    recorded in ``last_reload``.
+    """
+    global _service
+    with _reload_lock:
+        previous = _service
+        started = time.perf_counter()
+        try:
+            with stage(stage_name):
+                service = build(previous)
+        except Exception as e:
+            logger.error(f"Data {status} failed: {str(e)}")
+            last_reload.clear()
+            last_reload.update(
+                {
+                    "status": "failed",
+                    "error": str(e),
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                    "finished_at": time.time(),
+                }
+            )
+            raise
+
+        _service = service
+        result = {
+            "status": status,
+            "previous_version": getattr(previous, "version", None),
+            "version": getattr(service, "version", None),
+            "generation": getattr(service, "generation", None),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            "finished_at": time.time(),
+            **(details or {}),
+        }
+        last_reload.clear()
+        last_reload.update(result)
+
+    logger.info(
+        f"Data service {status} in {result['duration_ms']} ms "
+        f"(version {result['previous_version']} -> {result['version']})"
+    )
+    return result
+
+
+def reload_data_service() -> Dict[str, Any]:
+    """Build a new data service and swap it in
+
+    The new dataset, indexes and rollups are built while the current
+    service keeps serving, then published with a single assignment. Reloads
+    are serialized and on failure the current service stays in place.
+    Blocking, so call it off the event loop.
+    """
+    return _swap_service(
+        "reloaded",
+        "data_reload",
+        lambda previous: _create_service(record_phases=False),
+    )
+
+
+def refresh_data_service(full: bool = False) -> Dict[str, Any]:
+    """Bring the data service up to date with its source
+
+    New delta files are merged into the current service incrementally; any
+    other change, or ``full``, reloads everything. Blocking.
+    """
+    service = get_data_service()
+    pending = None if full else getattr(service, "pending_deltas", lambda: None)()
+    if not pending:
+        return reload_data_service()
+
+    details = {"deltas": []}
+
+    def ingest(previous):
+        # Checked again under the lock: another refresh may have won
+        deltas = previous.pending_deltas()
+        if deltas is None:
+            return _create_service(record_phases=False)
+        details["deltas"] = [name for name, _, _ in deltas]
+        return previous.with_deltas(deltas) if deltas else previous
+
+    return _swap_service("ingested", "data_ingest", ingest, details)
+
+
+def compact_data_service(force: bool = False) -> Optional[Dict[str, Any]]:
+    """Compact the merged deltas of the data service, if due (or ``force``)
+
+    Returns None when there was nothing to do. Blocking.
+    """
+    service = _service
+    if service is None or not hasattr(service, "needs_compaction"):
+        return None
+    if not service.delta_rows or not (force or service.needs_compaction()):
+        return None
+    return _swap_service(
+        "compacted",
+        "data_compact",
+        lambda previous: previous.compacted() if previous.delta_rows else previous,
+    )
+
+
+def data_source_state() -> Optional[Tuple[tuple, tuple]]:
+    """Current and loaded identity of the data behind the current service
+
+    None when the backend has no local source to watch (Dremio). Does not
+    load the service when nothing has used it yet.
+    """
+    service = _service
+    if service is None:
+        return (), ()
+    if not hasattr(service, "source_state"):
+        return None
+    return service.source_state()
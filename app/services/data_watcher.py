@@ -0,0 +1,63 @@
+# app/services/data_watcher.py
+import logging
+import threading
+from typing import Optional
+from app.services.data_service import (
+    compact_data_service,
+    data_source_state,
+    refresh_data_service,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DataWatcher:
+    """Background thread refreshing the data service when its source changes
+
+    Polls the loaded service every ``interval`` seconds (a stat of the CSV
+    and delta files and, with a shared dataset, a read of the current
+    generation). A change is only acted on once the new source looks the
+    same on two consecutive polls, so a file that is still being written is
+    not loaded half way. New delta files are merged incrementally, other
+    changes reload everything, and merged deltas are compacted once enough
+    of them pile up. All of it runs on this thread, never on the request path.
+    """
+
+    def __init__(self, interval: float = 10.0):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="data-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching the data source every {self.interval}s")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def _run(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            try:
+                state = data_source_state()
+                if state is None:
+                    logger.info("Data service has no local source to watch")
+                    return
+                current, loaded = state
+                if current == loaded:
+                    pending = None
+                elif current == pending:
+                    refresh_data_service()
+                    pending = None
+                else:
+                    pending = current
+                compact_data_service()
+            except Exception as e:
+                # The current service keeps serving; try again next poll
+                logger.error(f"Data watcher error: {str(e)}")
+                pending = None
@@ -0,0 +1,257 @@
+# app/services/date_index.py
+import copy
+import numpy as np
+import pandas as pd
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from app.services.column_store import extend_buffer
+
+
+def _truncate(dates: np.ndarray, bucket: str) -> np.ndarray:
+    """Truncate datetime64[D] values to the start of their bucket"""
+    if bucket == "month":
+        return dates.astype("datetime64[M]").astype("datetime64[D]")
+    if bucket == "week":
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        days = dates.astype(np.int64)
+        return (days - (days + 3) % 7).astype("datetime64[D]")
+    return dates
+
+
+class DateIndex:
+    """Sorted index over a date column with precomputed time buckets
+
+    Row positions are kept in date order so a date range is resolved with
+    two binary searches, and every row carries a bucket code per supported
+    granularity so time series are a single ``np.bincount``.
+
+    Rows added by ``appended`` are kept in a second, small sorted run
+    (``tail_order``) that range lookups search as well, so appending never
+    re-sorts the existing rows.
+    """
+
+    BUCKETS = ("day", "week", "month")
+
+    def __init__(self, column: str, dates: np.ndarray):
+        self.column = column
+        self.size = len(dates)
+
+        valid = ~np.isnat(dates)
+        positions = np.flatnonzero(valid)
+
+        self.dates = dates
+        self.order = positions[np.argsort(dates[valid], kind="stable")]
+        self.sorted_dates = dates[self.order]
+
+        self.bucket_codes: Dict[str, np.ndarray] = {}
+        self.bucket_starts: Dict[str, np.ndarray] = {}
+        for bucket in self.BUCKETS:
+            starts, inverse = np.unique(
+                _truncate(dates[valid], bucket), return_inverse=True
+            )
+            codes = np.full(self.size, -1, dtype=np.int32)
+            codes[positions] = inverse
+            self.bucket_codes[bucket] = codes
+            self.bucket_starts[bucket] = starts
+        self._init_tail()
+        self._label_buckets()
+
+    def _init_tail(self):
+        self.tail_order = np.empty(0, dtype=np.int64)
+        self.tail_dates = np.empty(0, dtype="datetime64[D]")
+        self._buffers = {"dates": self.dates, **self.bucket_codes}
+
+    @classmethod
+    def from_series(cls, column: str, series: pd.Series) -> "DateIndex":
+        """Parse a column of date strings; unparseable values count as missing"""
+        dates = pd.to_datetime(series, errors="coerce").to_numpy()
+        return cls(column, dates.astype("datetime64[D]"))
+
+    @classmethod
+    def from_arrays(cls, column: str, arrays: Dict[str, np.ndarray]) -> "DateIndex":
+        """Rebuild an index from ``arrays()`` without sorting again"""
+        index = cls.__new__(cls)
+        index.column = column
+        index.dates = arrays["dates"]
+        index.size = len(index.dates)
+        index.order = arrays["order"]
+        index.sorted_dates = arrays["sorted_dates"]
+        index.bucket_codes = {b: arrays[f"{b}/codes"] for b in cls.BUCKETS}
+        index.bucket_starts = {b: arrays[f"{b}/starts"] for b in cls.BUCKETS}
+        index._init_tail()
+        index._label_buckets()
+        return index
+
+    def appended(self, dates: np.ndarray) -> "DateIndex":
+        """Index with rows carrying ``dates`` added after the existing ones
+
+        Costs O(appended rows), plus a re-sort of the rows appended since
+        the index was built. Buckets first seen in ``dates`` are added after
+        the existing ones, which keeps every code stable as long as they
+        start after the last existing bucket (the usual case for new data);
+        otherwise the whole index is rebuilt. This index is left unchanged.
+        """
+        start, added = self.size, len(dates)
+        index = copy.copy(self)
+        index._buffers = dict(self._buffers)
+        index._buffers["dates"] = extend_buffer(self._buffers["dates"], start, dates)
+        index.dates = index._buffers["dates"][: start + added]
+        index.size = start + added
+
+        valid = ~np.isnat(dates)
+        positions = start + np.flatnonzero(valid)
+        index.bucket_codes = {}
+        index.bucket_starts = {}
+        for bucket in self.BUCKETS:
+            starts = self.bucket_starts[bucket]
+            truncated = _truncate(dates[valid], bucket)
+            new_starts = np.setdiff1d(truncated, starts)
+            if len(new_starts) and len(starts) and new_starts[0] < starts[-1]:
+                return DateIndex(self.column, index.dates)
+
+            starts = np.concatenate([starts, new_starts])
+            codes = np.full(added, -1, dtype=np.int32)
+            codes[valid] = np.searchsorted(starts, truncated)
+            index._buffers[bucket] = extend_buffer(self._buffers[bucket], start, codes)
+            index.bucket_codes[bucket] = index._buffers[bucket][: start + added]
+            index.bucket_starts[bucket] = starts
+
+        tail = np.concatenate([self.tail_order, positions])
+        index.tail_order = tail[np.argsort(index.dates[tail], kind="stable")]
+        index.tail_dates = index.dates[index.tail_order]
+        index._label_buckets()
+        return index
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Every array of the index, for sharing through ``from_arrays``"""
+        arrays = {
+            "dates": self.dates,
+            "order": self.order,
+            "sorted_dates": self.sorted_dates,
+        }
+        for bucket in self.BUCKETS:
+            arrays[f"{bucket}/codes"] = self.bucket_codes[bucket]
+            arrays[f"{bucket}/starts"] = self.bucket_starts[bucket]
+        return arrays
+
+    def _label_buckets(self):
+        self.bucket_labels: Dict[str, List[str]] = {
+            bucket: [
+                str(start)[:7] if bucket == "month" else str(start)
+                for start in self.bucket_starts[bucket]
+            ]
+            for bucket in self.BUCKETS
+        }
+
+    def range_rows(
+        self, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> np.ndarray:
+        """Row positions with a date within [date_from, date_to]
+
+        In date order, except that rows appended since the index was built
+        follow the others.
+        """
+        rows = self._run_range(self.order, self.sorted_dates, date_from, date_to)
+        if len(self.tail_order):
+            rows = np.concatenate(
+                [
+                    rows,
+                    self._run_range(
+                        self.tail_order, self.tail_dates, date_from, date_to
+                    ),
+                ]
+            )
+        return rows
+
+    @staticmethod
+    def _run_range(order, sorted_dates, date_from, date_to) -> np.ndarray:
+        lo, hi = 0, len(sorted_dates)
+        if date_from is not None:
+            lo = np.searchsorted(sorted_dates, np.datetime64(date_from, "D"))
+        if date_to is not None:
+            hi = np.searchsorted(
+                sorted_dates, np.datetime64(date_to, "D"), side="right"
+            )
+        return order[lo:hi]
+
+    def range_mask(
+        self, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> np.ndarray:
+        """Boolean row mask for rows with a date within [date_from, date_to]"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.range_rows(date_from, date_to)] = True
+        return mask
+
+    def in_range(
+        self,
+        rows: np.ndarray,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> np.ndarray:
+        """Boolean mask over ``rows`` of those with a date within [date_from, date_to]"""
+        dates = self.dates[rows]
+        selected = ~np.isnat(dates)
+        if date_from is not None:
+            selected &= dates >= np.datetime64(date_from, "D")
+        if date_to is not None:
+            selected &= dates <= np.datetime64(date_to, "D")
+        return selected
+
+    def span(
+        self, mask: Optional[np.ndarray] = None
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """Earliest and latest date among the masked rows"""
+        if mask is None:
+            dates = np.concatenate(
+                [self.sorted_dates[:1], self.sorted_dates[-1:], self.tail_dates]
+            )
+        else:
+            dates = self.dates[mask]
+            dates = dates[~np.isnat(dates)]
+        if len(dates) == 0:
+            return None, None
+        return str(dates.min()), str(dates.max())
+
+    def bucket_range(
+        self,
+        bucket: str,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> slice:
+        """Slice of bucket positions whose start falls within [date_from, date_to]"""
+        starts = self.bucket_starts[bucket]
+        lo, hi = 0, len(starts)
+        if date_from is not None:
+            lo = np.searchsorted(starts, np.datetime64(date_from, "D"))
+        if date_to is not None:
+            hi = np.searchsorted(starts, np.datetime64(date_to, "D"), side="right")
+        return slice(lo, hi)
+
+    def rollup(
+        self,
+        bucket: str,
+        codes: Optional[np.ndarray] = None,
+        n_values: int = 0,
+        rows: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """Row counts per (bucket, value) as a (n_buckets, n_values + 1) matrix
+
+        Column 0 holds rows with a missing value; without ``codes`` the
+        matrix has a single column of per-bucket totals. ``rows`` restricts
+        the counts to a subset of row positions.
+        """
+        bucket_codes = self.bucket_codes[bucket]
+        if rows is not None:
+            bucket_codes = bucket_codes[rows]
+            if codes is not None:
+                codes = codes[rows]
+
+        valid = bucket_codes >= 0
+        n_buckets = len(self.bucket_starts[bucket])
+        width = n_values + 1
+
+        flat = bucket_codes[valid].astype(np.int64) * width
+        if codes is not None:
+            flat += codes[valid] + 1
+
+        return np.bincount(flat, minlength=n_buckets * width).reshape(n_buckets, width)
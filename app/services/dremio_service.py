@@ -1,10 +1,14 @@
 import requests
 import json
+import math
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from app.core.config import settings
 import logging
 
+from app.core.cache import LRUCache, canonical_filters, make_cache_key
+from app.core.metrics import in_request_context, register_cache, stage
 from app.models.filter import FilterOptions, SurveyFilter
 
 logger = logging.getLogger(__name__)
@@ -41,19 +45,21 @@ class DremioAPI:
             logger.info(f"Executing Dremio query: {sql_query}")
 
             # Submit the SQL query
-            response = self._api_post("sql", body={"sql": sql_query})
+            with stage("dremio_submit"):
+                response = self._api_post("sql", body={"sql": sql_query})
             job_id = response["id"]
             logger.info(f"Job submitted with ID: {job_id}")
 
             # Poll for job completion
-            response = self._api_get(f"job/{job_id}/")
-            job_status = response["jobState"]
-
-            while job_status not in ["COMPLETED", "FAILED", "CANCELED"]:
-                time.sleep(1)
+            with stage("dremio_poll"):
                 response = self._api_get(f"job/{job_id}/")
                 job_status = response["jobState"]
-                logger.info(f"Job status: {job_status}")
+
+                while job_status not in ["COMPLETED", "FAILED", "CANCELED"]:
+                    time.sleep(1)
+                    response = self._api_get(f"job/{job_id}/")
+                    job_status = response["jobState"]
+                    logger.info(f"Job status: {job_status}")
 
             if job_status == "FAILED":
                 error_msg = response.get("errorMessage", "Unknown error")
@@ -67,13 +73,14 @@ class DremioAPI:
             results = []
             offset = 0
 
-            while offset < row_count:
-                current_limit = min(limit, row_count - offset)
-                response = self._api_get(
-                    f"job/{job_id}/results?offset={offset}&limit={current_limit}"
-                )
-                results.extend(response["rows"])
-                offset += limit
+            with stage("dremio_fetch"):
+                while offset < row_count:
+                    current_limit = min(limit, row_count - offset)
+                    response = self._api_get(
+                        f"job/{job_id}/results?offset={offset}&limit={current_limit}"
+                    )
+                    results.extend(response["rows"])
+                    offset += limit
 
             logger.info(f"Retrieved {len(results)} rows")
             return results
@@ -88,6 +95,17 @@ class DremioService:
     def __init__(self):
         self.api = DremioAPI(server=settings.DREMIO_SERVER, token=settings.DREMIO_TOKEN)
         self.table_path = settings.DREMIO_TABLE_PATH
+        self._aggregate_cache = LRUCache(maxsize=256, ttl=300)
+        register_cache("aggregate", self._aggregate_cache)
+
+    @property
+    def version(self) -> str:
+        """Dataset version used for ETags
+
+        Dremio does not expose a cheap change marker, so the version rolls
+        over every DREMIO_DATA_VERSION_TTL seconds.
+        """
+        return f"dremio-{int(time.time() // settings.DREMIO_DATA_VERSION_TTL)}"
 
     # Map filter parameter names to actual database column names
     FILTER_FIELD_MAPPING = {
@@ -111,6 +129,41 @@ class DremioService:
         "institutions": "company",
     }
 
+    # Map FilterOptions fields to the filter parameter they list values for
+    OPTION_FIELD_MAPPING = {
+        "country_geo_ids": "country_geo_ids",
+        "territories": "territories",
+        "regions": "regions",
+        "msl_names": "msl_names",
+        "titles": "titles",
+        "departments": "departments",
+        "user_types": "user_types",
+        "survey_names": "survey_names",
+        "questions": "questions",
+        "products": "products",
+        "product_expertise_options": "product_expertise",
+        "responses": "tumor_types",
+        "account_names": "account_names",
+        "companies": "institutions",
+        "channels": "channels",
+        "assignment_types": "assignment_types",
+    }
+
+    # Aggregate metrics and the filter field they count distinct values of
+    AGGREGATE_METRICS = {"count": None, "distinct_accounts": "account_names"}
+
+    # Most fields an aggregate can be grouped by at once
+    MAX_GROUP_BY_FIELDS = 6
+
+    # Top-k lists included in chat data-context summaries
+    SUMMARY_FIELDS = {"top_responses": "tumor_types", "top_products": "products"}
+
+    # Date column used for date-range filters and time series
+    DATE_COLUMN = "start_date"
+
+    # Columns /surveys/ can be sorted by
+    SORT_COLUMNS = {*FILTER_FIELD_MAPPING.values(), DATE_COLUMN, "survey_qstn_resp_id"}
+
     def build_where_clause(self, filters: Dict[str, Any]) -> str:
         """Build WHERE clause from filters, supporting multiple values
         
@@ -143,13 +196,232 @@ class DremioService:
 
         return where_clause
 
+    def build_date_clause(self, date_from=None, date_to=None) -> str:
+        """Build the extra WHERE conditions for a start date range"""
+        conditions = []
+        if date_from is not None:
+            conditions.append(
+                f"CAST(\"{self.DATE_COLUMN}\" AS DATE) >= DATE '{date_from.isoformat()}'"
+            )
+        if date_to is not None:
+            conditions.append(
+                f"CAST(\"{self.DATE_COLUMN}\" AS DATE) <= DATE '{date_to.isoformat()}'"
+            )
+        return "".join(f" AND {c}" for c in conditions)
+
+    def resolve_sort(self, sort: Optional[str]) -> Optional[Tuple[str, bool]]:
+        """Parse ``field[:asc|:desc]`` into (column, descending)
+
+        ``field`` is a filter parameter or column name; raises ValueError
+        for anything that cannot be sorted by, so only known column names
+        ever reach the SQL.
+        """
+        if not sort:
+            return None
+        field, _, direction = sort.partition(":")
+        direction = direction.lower() or "asc"
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Unknown sort direction: {direction}")
+        column = self.FILTER_FIELD_MAPPING.get(field, field)
+        if column not in self.SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by unknown field: {field}")
+        return column, direction == "desc"
+
+    def build_order_clause(self, sort: Optional[str] = None) -> str:
+        """ORDER BY expressions for a ``sort`` parameter
+
+        The primary key always comes last so pages stay stable across ties.
+        """
+        resolved = self.resolve_sort(sort)
+        if resolved is None:
+            return "survey_qstn_resp_id"
+
+        column, descending = resolved
+        expression = f'"{column}"'
+        if column == self.DATE_COLUMN:
+            expression = f"CAST({expression} AS DATE)"
+        direction = "DESC" if descending else "ASC"
+        return f"{expression} {direction} NULLS LAST, survey_qstn_resp_id"
+
+    def _count(self, where_clause: str) -> int:
+        """COUNT(*) of the rows matching a WHERE clause, cached like the aggregates"""
+        cache_key = make_cache_key("count", where_clause)
+        cached = self._aggregate_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        count_query = f"""
+            SELECT COUNT(*) as total_count
+            FROM {self.table_path}
+            WHERE {where_clause}
+        """
+        count_result = self.api.execute_query(count_query)
+        total_count = count_result[0]["total_count"] if count_result else 0
+        self._aggregate_cache.set(cache_key, total_count)
+        return total_count
+
+    def _sampled_count(self, where_clause: str) -> Dict[str, Any]:
+        """COUNT(*) estimated from a TABLESAMPLE, with a 95% interval
+
+        Rows are sampled independently (Bernoulli), so the number of
+        matching rows in the sample is binomial. Cached like the aggregates.
+        """
+        percent = settings.DREMIO_SAMPLE_PERCENT
+        cache_key = make_cache_key("sampled_count", where_clause, percent)
+        cached = self._aggregate_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
+        sample_query = f"""
+            SELECT COUNT(*) as sample_count
+            FROM {self.table_path} TABLESAMPLE BERNOULLI({percent})
+            WHERE {where_clause}
+        """
+        sample_result = self.api.execute_query(sample_query)
+        matched = sample_result[0]["sample_count"] if sample_result else 0
+
+        count, low, high = self._scale_sample(matched, percent)
+        estimate = {
+            "total": count,
+            "exact": False,
+            "low": low,
+            "high": high,
+            "confidence": 0.95,
+            "sample_percent": percent,
+        }
+        self._aggregate_cache.set(cache_key, estimate)
+        return dict(estimate)
+
+    @staticmethod
+    def _scale_sample(matched: int, percent: float) -> Tuple[int, int, int]:
+        """Estimated count and 95% interval from ``matched`` sampled rows
+
+        Rows are sampled independently (Bernoulli), so ``matched`` is
+        binomial.
+        """
+        rate = percent / 100
+        total = matched / rate
+        # No match in the sample still leaves room for a few rows
+        margin = 1.96 * math.sqrt(max(matched, 1) * (1 - rate)) / rate
+        return (
+            int(round(total)),
+            max(int(math.floor(total - margin)), matched),
+            int(math.ceil(total + margin)),
+        )
+
+    def _sampled_value_counts(
+        self, column: str, where_clause: str
+    ) -> List[Tuple[str, int]]:
+        """(value, sampled rows) of a column over a TABLESAMPLE, cached"""
+        percent = settings.DREMIO_SAMPLE_PERCENT
+        cache_key = make_cache_key("sampled_values", column, where_clause, percent)
+        cached = self._aggregate_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        sample_query = f"""
+            SELECT "{column}" AS value, COUNT(*) AS sample_count
+            FROM {self.table_path} TABLESAMPLE BERNOULLI({percent})
+            WHERE {where_clause} AND "{column}" IS NOT NULL
+            GROUP BY "{column}"
+        """
+        rows = self.api.execute_query(sample_query, limit=500)
+        counts = [(str(row["value"]), row["sample_count"]) for row in rows]
+        self._aggregate_cache.set(cache_key, counts)
+        return counts
+
+    def estimate_filter_options(
+        self,
+        applied_filters: Dict[str, List[str]],
+        target_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "value",
+    ) -> Dict[str, Any]:
+        """Filter options estimated from a TABLESAMPLE, for approx=true
+
+        Covers every option list, or only ``target_filter`` (ignoring its
+        own selection). One sampled GROUP BY runs per list, concurrently.
+        Each listed value comes with an estimated row count and 95%
+        interval; values too rare to be sampled are missing, so totals
+        count the values seen.
+        """
+        try:
+            if target_filter:
+                if target_filter not in self.FILTER_FIELD_MAPPING:
+                    raise ValueError(f"Unknown filter field: {target_filter}")
+                fields = {target_filter: target_filter}
+                applied_filters = {
+                    k: v for k, v in applied_filters.items() if k != target_filter
+                }
+            else:
+                fields = self.OPTION_FIELD_MAPPING
+
+            where_clause = self.build_where_clause(applied_filters or {})
+            columns = [self.FILTER_FIELD_MAPPING[p] for p in fields.values()]
+            workers = max(1, min(settings.SURVEY_BATCH_WORKERS, len(columns)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sampled = list(
+                    executor.map(
+                        in_request_context(
+                            lambda column: self._sampled_value_counts(
+                                column, where_clause
+                            )
+                        ),
+                        columns,
+                    )
+                )
+
+            percent = settings.DREMIO_SAMPLE_PERCENT
+            end = None if limit is None else offset + limit
+            options, totals, estimates = {}, {}, {}
+            for option_name, counts in zip(fields, sampled):
+                if sort == "frequency":
+                    counts = sorted(counts, key=lambda vc: (-vc[1], vc[0]))
+                else:
+                    counts = sorted(counts)
+                page = counts[offset:end]
+
+                options[option_name] = [value for value, _ in page]
+                totals[option_name] = len(counts)
+                estimates[option_name] = []
+                for value, matched in page:
+                    count, low, high = self._scale_sample(matched, percent)
+                    estimates[option_name].append(
+                        {"value": value, "count": count, "low": low, "high": high}
+                    )
+
+            return {
+                "options": options,
+                "totals": totals,
+                "estimates": estimates,
+                "approx": {"confidence": 0.95, "sample_percent": percent},
+            }
+
+        except Exception as e:
+            logger.error(f"Error in estimate_filter_options: {str(e)}")
+            raise
+
+    def count_surveys(
+        self, filters: Dict[str, List[str]], date_from=None, date_to=None
+    ) -> Dict[str, Any]:
+        """Number of surveys matching the filters, as a single cached COUNT"""
+        try:
+            where_clause = self.build_where_clause(filters)
+            where_clause += self.build_date_clause(date_from, date_to)
+            return {"total": self._count(where_clause)}
+
+        except Exception as e:
+            logger.error(f"Error in count_surveys: {str(e)}")
+            raise
+
     def get_surveys(self, filters: SurveyFilter) -> Dict[str, Any]:
         """Get surveys with filtering support for multiple values"""
         try:
             # Convert filters to dict, excluding None values
             filter_dict = {}
             for field, values in filters.dict(exclude_unset=True).items():
-                if field in ["page", "size"]:
+                if field in ["page", "size", "date_from", "date_to", "sort", "approx"]:
                     continue
                 if values is not None and len(values) > 0:
                     filter_dict[field] = values
@@ -158,6 +430,8 @@ class DremioService:
 
             # Build WHERE clause
             where_clause = self.build_where_clause(filter_dict)
+            where_clause += self.build_date_clause(filters.date_from, filters.date_to)
+            order_clause = self.build_order_clause(filters.sort)
 
             # Calculate offset for pagination
             offset = (filters.page - 1) * filters.size
@@ -207,7 +481,7 @@ class DremioService:
                     company
                 FROM {self.table_path}
                 WHERE {where_clause}
-                ORDER BY survey_qstn_resp_id
+                ORDER BY {order_clause}
                 LIMIT {filters.size} OFFSET {offset}
             """
 
@@ -215,13 +489,12 @@ class DremioService:
             results = self.api.execute_query(base_query)
 
             # Get total count for pagination
-            count_query = f"""
-                SELECT COUNT(*) as total_count
-                FROM {self.table_path}
-                WHERE {where_clause}
-            """
-            count_result = self.api.execute_query(count_query)
-            total_count = count_result[0]["total_count"] if count_result else 0
+            estimate = None
+            if filters.approx:
+                estimate = self._sampled_count(where_clause)
+                total_count = estimate.pop("total")
+            else:
+                total_count = self._count(where_clause)
 
             total_pages = (total_count + filters.size - 1) // filters.size
 
@@ -229,13 +502,302 @@ class DremioService:
                 f"Returning page {filters.page}/{total_pages} with {len(results)} surveys out of {total_count} total"
             )
 
-            return {
+            result = {
                 "surveys": results,
                 "total": total_count,
                 "page": filters.page,
                 "size": filters.size,
                 "total_pages": total_pages,
             }
+            if estimate is not None:
+                result["approx"] = estimate
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in get_surveys: {str(e)}")
+            raise
+
+    def get_surveys_batch(
+        self, items: Dict[str, SurveyFilter], workers: int = 4
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run several /surveys/ queries concurrently, keyed by request id
+
+        At most ``workers`` queries are in flight at a time, and counts of
+        repeated filter sets come from the count cache. A failing query is
+        reported in its own result and does not fail the others.
+        """
+
+        def run(filters: SurveyFilter) -> Dict[str, Any]:
+            try:
+                return {"status": "ok", **self.get_surveys(filters)}
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+
+        workers = max(1, min(workers, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(
+                zip(items, executor.map(in_request_context(run), items.values()))
+            )
+
+    def suggest_filter_values(
+        self,
+        field: str,
+        prefix: str,
+        applied_filters: Optional[Dict[str, List[str]]] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Get values of a filter field starting with the given prefix
+
+        Matching is case-insensitive and restricted to values present under
+        the other applied filters.
+        """
+        try:
+            db_column = self.FILTER_FIELD_MAPPING.get(field, field)
+
+            # Remove target filter from applied filters
+            filter_dict = {
+                k: v for k, v in (applied_filters or {}).items() if k != field
+            }
+            where_clause = self.build_where_clause(filter_dict)
+
+            # Escape quotes and LIKE wildcards in the prefix
+            escaped_prefix = (
+                prefix.lower()
+                .replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+                .replace("'", "''")
+            )
+            match_clause = (
+                f'"{db_column}" IS NOT NULL '
+                f"AND LOWER(\"{db_column}\") LIKE '{escaped_prefix}%' ESCAPE '\\'"
+            )
+
+            values_query = f"""
+                SELECT DISTINCT "{db_column}" AS value
+                FROM {self.table_path}
+                WHERE {where_clause} AND {match_clause}
+                ORDER BY "{db_column}"
+                LIMIT {limit}
+            """
+            results = self.api.execute_query(values_query)
+
+            count_query = f"""
+                SELECT COUNT(DISTINCT "{db_column}") AS total_count
+                FROM {self.table_path}
+                WHERE {where_clause} AND {match_clause}
+            """
+            count_result = self.api.execute_query(count_query)
+            total_count = count_result[0]["total_count"] if count_result else 0
+
+            return {
+                "field": field,
+                "prefix": prefix,
+                "suggestions": [str(row["value"]) for row in results],
+                "total": total_count,
+            }
+
+        except Exception as e:
+            logger.error(f"Error in suggest_filter_values: {str(e)}")
+            raise
+
+    def resolve_group_by(self, fields: List[str]) -> List[str]:
+        """Map group_by entries (filter parameter or column names) to filter parameter names"""
+        if len(fields) > self.MAX_GROUP_BY_FIELDS:
+            raise ValueError(
+                f"Cannot group by more than {self.MAX_GROUP_BY_FIELDS} fields"
+            )
+        column_to_param = {v: k for k, v in self.FILTER_FIELD_MAPPING.items()}
+
+        params = []
+        for field in fields:
+            param_name = (
+                field
+                if field in self.FILTER_FIELD_MAPPING
+                else column_to_param.get(field)
+            )
+            if param_name is None:
+                raise ValueError(f"Cannot group by unknown field: {field}")
+            params.append(param_name)
+
+        return params
+
+    def aggregate_surveys(
+        self,
+        filters: Dict[str, List[str]],
+        group_by: List[str],
+        metric: str = "count",
+    ) -> Dict[str, Any]:
+        """Grouped counts over the filtered rows, pushed down as a GROUP BY"""
+        try:
+            if metric not in self.AGGREGATE_METRICS:
+                raise ValueError(f"Unknown aggregate metric: {metric}")
+            params = self.resolve_group_by(group_by)
+
+            cache_key = make_cache_key(canonical_filters(filters), params, metric)
+            cached = self._aggregate_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            where_clause = self.build_where_clause(filters)
+            columns = [self.FILTER_FIELD_MAPPING[p] for p in params]
+            group_columns = ", ".join(f'"{c}"' for c in columns)
+
+            count_field = self.AGGREGATE_METRICS[metric]
+            if count_field is None:
+                metric_sql = "COUNT(*)"
+            else:
+                metric_sql = (
+                    f'COUNT(DISTINCT "{self.FILTER_FIELD_MAPPING[count_field]}")'
+                )
+
+            aggregate_query = f"""
+                SELECT {group_columns}, {metric_sql} AS "value"
+                FROM {self.table_path}
+                WHERE {where_clause}
+                GROUP BY {group_columns}
+                ORDER BY "value" DESC
+            """
+            rows = self.api.execute_query(aggregate_query, limit=500)
+
+            results = [
+                {**{c: row.get(c) for c in columns}, "value": row["value"]}
+                for row in rows
+            ]
+
+            result = {
+                "group_by": columns,
+                "metric": metric,
+                "rows": results,
+                "total_groups": len(results),
+            }
+            self._aggregate_cache.set(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in aggregate_surveys: {str(e)}")
+            raise
+
+    def get_timeseries(
+        self,
+        filters: Dict[str, List[str]],
+        bucket: str = "month",
+        group_by: Optional[str] = None,
+        date_from=None,
+        date_to=None,
+    ) -> Dict[str, Any]:
+        """Survey counts per day/week/month, pushed down as a DATE_TRUNC group-by"""
+        try:
+            if bucket not in ("day", "week", "month"):
+                raise ValueError(f"Unknown time bucket: {bucket}")
+
+            param_name = self.resolve_group_by([group_by])[0] if group_by else None
+            column = self.FILTER_FIELD_MAPPING[param_name] if param_name else None
+
+            cache_key = make_cache_key(
+                "timeseries",
+                canonical_filters(filters),
+                bucket,
+                param_name,
+                str(date_from),
+                str(date_to),
+            )
+            cached = self._aggregate_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            where_clause = self.build_where_clause(filters)
+            where_clause += self.build_date_clause(date_from, date_to)
+
+            period_sql = (
+                f"DATE_TRUNC('{bucket.upper()}', CAST(\"{self.DATE_COLUMN}\" AS DATE))"
+            )
+            select_sql = f"{period_sql} AS period"
+            group_sql = period_sql
+            if column:
+                select_sql += f', "{column}"'
+                group_sql += f', "{column}"'
+
+            timeseries_query = f"""
+                SELECT {select_sql}, COUNT(*) AS "value"
+                FROM {self.table_path}
+                WHERE {where_clause} AND "{self.DATE_COLUMN}" IS NOT NULL
+                GROUP BY {group_sql}
+                ORDER BY period
+            """
+            rows = self.api.execute_query(timeseries_query, limit=500)
+
+            label_length = 7 if bucket == "month" else 10
+            series = []
+            for row in rows:
+                point = {"period": str(row["period"])[:label_length]}
+                if column:
+                    point[column] = row.get(column)
+                point["value"] = row["value"]
+                series.append(point)
+
+            result = {
+                "bucket": bucket,
+                "group_by": column,
+                "series": series,
+                "source": "dremio",
+            }
+            self._aggregate_cache.set(cache_key, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in get_timeseries: {str(e)}")
+            raise
+
+    def get_data_summary(
+        self, filters: Optional[Dict[str, List[str]]] = None, top_k: int = 5
+    ) -> Dict[str, Any]:
+        """Compact statistical summary of the filtered rows
+
+        Computed from a single pushed-down GROUP BY over the summarized
+        fields and cached per filter set.
+        """
+        try:
+            cache_key = make_cache_key("summary", canonical_filters(filters), top_k)
+            cached = self._aggregate_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            where_clause = self.build_where_clause(filters or {})
+            columns = [
+                self.FILTER_FIELD_MAPPING[p] for p in self.SUMMARY_FIELDS.values()
+            ]
+            group_columns = ", ".join(f'"{c}"' for c in columns)
+            date_sql = f'CAST("{self.DATE_COLUMN}" AS DATE)'
+
+            summary_query = f"""
+                SELECT {group_columns}, COUNT(*) AS n,
+                    MIN({date_sql}) AS first_date, MAX({date_sql}) AS last_date
+                FROM {self.table_path}
+                WHERE {where_clause}
+                GROUP BY {group_columns}
+            """
+            rows = self.api.execute_query(summary_query, limit=500)
+
+            summary = {"row_count": sum(row["n"] for row in rows)}
+            for name, column in zip(self.SUMMARY_FIELDS, columns):
+                counts: Dict[str, int] = {}
+                for row in rows:
+                    if row.get(column) is not None:
+                        counts[row[column]] = counts.get(row[column], 0) + row["n"]
+                top = sorted(counts.items(), key=lambda item: -item[1])[:top_k]
+                summary[name] = [{"value": v, "count": c} for v, c in top]
+
+            first_dates = [row["first_date"] for row in rows if row.get("first_date")]
+            last_dates = [row["last_date"] for row in rows if row.get("last_date")]
+            summary["date_span"] = {
+                "from": str(min(first_dates))[:10] if first_dates else None,
+                "to": str(max(last_dates))[:10] if last_dates else None,
+            }
+
+            self._aggregate_cache.set(cache_key, summary)
+            return summary
 
         except Exception as e:
-            logger.error(f"Error in
+            logger.error(f"Error in get_data_summary: {str(e)}")
+            raise
@@ -0,0 +1,178 @@
+# app/services/filter_index.py
+import bisect
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Upper bound used to close a prefix range in the sorted key list
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class FieldIndex:
+    """Dictionary-encoded view of a single filter column
+
+    Built once when the data is loaded. Every row is mapped to an integer
+    code pointing into the sorted list of distinct values (-1 for missing
+    values); for string columns these are the column store's own codes, so
+    the index adds no per-row memory. A sorted list of lower-cased search
+    keys is kept alongside so prefix lookups are a pair of binary searches.
+
+    After delta rows are merged, values new to the column sit after the
+    sorted ones; ``value_order`` then lists the codes in value order so
+    option lists and suggestions stay sorted until the next compaction.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        codes: np.ndarray,
+        values: List[str],
+        labels: Optional[Dict[int, str]] = None,
+        counts: Optional[np.ndarray] = None,
+    ):
+        self.column = column
+
+        self.codes = codes
+        self.values: List[str] = values
+        self.labels: Dict[int, str] = labels or {}
+        self.lookup = {value: code for code, value in enumerate(self.values)}
+        if counts is None:
+            counts = np.bincount(codes[codes >= 0], minlength=len(self.values))
+        self.counts = counts
+
+        # Codes in value order, and the position of each code in that order;
+        # rank stays None while codes are already sorted
+        self.rank: Optional[np.ndarray] = None
+        self.value_order = np.arange(len(self.values))
+        if any(a > b for a, b in zip(self.values, self.values[1:])):
+            self.value_order = np.array(
+                sorted(range(len(self.values)), key=self.values.__getitem__),
+                dtype=np.int64,
+            )
+            self.rank = np.empty(len(self.values), dtype=np.int64)
+            self.rank[self.value_order] = np.arange(len(self.values))
+
+        self.by_frequency = self.by_count(self.value_order, self.counts)
+        self.display: List[str] = list(self.values)
+
+        keys = [(value.lower(), code) for code, value in enumerate(self.values)]
+
+        # Optional human readable labels (e.g. MSL display names), one per
+        # code. Labels are searchable too.
+        for code, label in self.labels.items():
+            value = self.values[code]
+            self.display[code] = f"{value}|{label} ({value})"
+            keys.append((str(label).lower(), code))
+
+        keys.sort()
+        self._keys: List[str] = [key for key, _ in keys]
+        self._key_codes = np.array([code for _, code in keys], dtype=np.int32)
+
+    @classmethod
+    def from_series(
+        cls, column: str, series: pd.Series, labels: Optional[pd.Series] = None
+    ) -> "FieldIndex":
+        """Build the index by encoding a column
+
+        The label of the first row carrying each value is used.
+        """
+        present = series.notna().to_numpy()
+        codes = np.full(len(series), -1, dtype=np.int32)
+        row_codes, uniques = pd.factorize(series[present].astype(str), sort=True)
+        codes[present] = row_codes
+
+        code_labels = {}
+        if labels is not None:
+            label_values = labels.to_numpy()[present]
+            for code, label in zip(row_codes, label_values):
+                if code in code_labels or label is None or pd.isna(label):
+                    continue
+                code_labels[int(code)] = label
+
+        return cls(column, codes, [str(v) for v in uniques], code_labels)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @staticmethod
+    def by_count(codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """``codes`` ordered by count (highest first), ties kept in order"""
+        return codes[np.argsort(-counts[codes], kind="stable")]
+
+    def codes_for(self, values: List[str]) -> np.ndarray:
+        """Codes of the given values, skipping values not present in the column"""
+        codes = [self.lookup[str(v)] for v in values if str(v) in self.lookup]
+        return np.array(sorted(set(codes)), dtype=np.int32)
+
+    def counts_for(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Row count per distinct value, restricted to the masked rows"""
+        if mask is None:
+            return self.counts
+        codes = self.codes[mask]
+        codes = codes[codes >= 0]
+        return np.bincount(codes, minlength=len(self.values))
+
+    def present_codes(self, mask: np.ndarray) -> np.ndarray:
+        """Boolean array (one entry per distinct value) of values present in the masked rows"""
+        return self.counts_for(mask) > 0
+
+    def option_page(
+        self,
+        mask: Optional[np.ndarray] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "value",
+    ) -> Tuple[List[str], int]:
+        """One page of the values present in the masked rows
+
+        Codes are kept in value order, so ``sort="value"`` needs no string
+        sorting at all. ``sort="frequency"`` orders by row count (highest
+        first), using the order precomputed at load time when no mask is
+        applied. Returns the page and the total number of values.
+        """
+        counts = self.counts_for(mask)
+        codes = self.present_order(counts, sort, precomputed=mask is None)
+
+        end = None if limit is None else offset + limit
+        return [self.display[code] for code in codes[offset:end]], len(codes)
+
+    def present_order(
+        self, counts: np.ndarray, sort: str = "value", precomputed: bool = False
+    ) -> np.ndarray:
+        """Codes with a non-zero count, in value or count order
+
+        ``precomputed`` says ``counts`` are the index's own counts, whose
+        frequency order is known from load time.
+        """
+        if sort == "frequency":
+            if precomputed:
+                codes = self.by_frequency
+            else:
+                codes = self.by_count(self.value_order, counts)
+            return codes[counts[codes] > 0]
+        if self.rank is None:
+            return np.flatnonzero(counts)
+        return self.value_order[counts[self.value_order] > 0]
+
+    def suggest(
+        self, prefix: str, limit: int, allowed: Optional[np.ndarray] = None
+    ) -> Tuple[List[str], int]:
+        """Case-insensitive prefix lookup
+
+        Returns up to ``limit`` matching display values in sorted order and
+        the total number of matching values. ``allowed`` optionally restricts
+        the result to codes present under the currently applied filters;
+        values with no remaining rows (all replaced by upserts) never match.
+        """
+        key = prefix.lower()
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + _MAX_CHAR, lo)
+
+        matched = np.unique(self._key_codes[lo:hi])
+        if self.rank is not None:
+            matched = matched[np.argsort(self.rank[matched])]
+        if allowed is None:
+            allowed = self.counts > 0
+        matched = matched[allowed[matched]]
+
+        return [self.display[code] for code in matched[:limit]], len(matched)
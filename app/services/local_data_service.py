@@ -1,12 +1,61 @@
 # app/services/local_data_service.py
+import argparse
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from app.models.filter import FilterOptions, SurveyFilter
+from app.core.cache import LRUCache, canonical_filters, make_cache_key
+from app.core.metrics import (
+    dataset_generation,
+    dataset_memory,
+    dataset_rows,
+    in_request_context,
+    register_cache,
+    stage,
+)
+from app.services.column_store import ColumnStore
+from app.services.date_index import DateIndex
+from app.services.filter_index import FieldIndex
+from app.services.shared_dataset import SharedDataset
+from app.services.survey_sample import StratifiedSample
 import logging
+import math
 import os
+import subprocess
+import sys
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def _reverse_runs(rows: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """Reverse the order of runs of equal ``keys``, keeping order within runs"""
+    if len(rows) == 0:
+        return rows
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    lengths = np.diff(np.r_[starts, len(rows)])
+    starts, lengths = starts[::-1], lengths[::-1]
+    placed = np.cumsum(lengths) - lengths
+    return rows[np.repeat(starts - placed, lengths) + np.arange(len(rows))]
+
+
+# Set bits of every byte value, for popcounts where np.bitwise_count
+# (numpy >= 2.0) is not available
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], np.uint8)
+
+
+def _popcount(bits: np.ndarray) -> int:
+    """Number of set bits in a packed bitmap"""
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bits).sum())
+    return int(_BYTE_POPCOUNT[bits].sum(dtype=np.int64))
+
 
 class LocalDataService:
     """Service to read data from CSV file for local testing"""
@@ -33,35 +82,817 @@ class LocalDataService:
         "institutions": "company",
     }
 
-    def __init__(self, csv_path: str = "data/survey_data.csv"):
+    # Map FilterOptions fields to the filter parameter they list values for
+    OPTION_FIELD_MAPPING = {
+        "country_geo_ids": "country_geo_ids",
+        "territories": "territories",
+        "regions": "regions",
+        "msl_names": "msl_names",
+        "titles": "titles",
+        "departments": "departments",
+        "user_types": "user_types",
+        "survey_names": "survey_names",
+        "questions": "questions",
+        "products": "products",
+        "product_expertise_options": "product_expertise",
+        "responses": "tumor_types",
+        "account_names": "account_names",
+        "companies": "institutions",
+        "channels": "channels",
+        "assignment_types": "assignment_types",
+    }
+
+    # Aggregate metrics and the filter field they count distinct values of
+    AGGREGATE_METRICS = {"count": None, "distinct_accounts": "account_names"}
+
+    # Most fields an aggregate can be grouped by at once
+    MAX_GROUP_BY_FIELDS = 6
+
+    # Top-k lists included in chat data-context summaries
+    SUMMARY_FIELDS = {"top_responses": "tumor_types", "top_products": "products"}
+
+    # Date column used for date-range filters and time series
+    DATE_COLUMN = "start_date"
+
+    # Fields with at most this many distinct values get time-series rollups
+    ROLLUP_MAX_CARDINALITY = 64
+
+    # Rows tested per step when approx=true scans for the first page
+    SCAN_CHUNK_ROWS = 65536
+
+    # Bumped whenever the shared snapshot layout changes, so workers rebuild
+    # instead of attaching to a snapshot written by older code
+    SHARED_LAYOUT_VERSION = 4
+
+    # Column identifying a row; delta upserts replace rows by this key
+    PRIMARY_KEY = "survey_qstn_resp_id"
+
+    # Delta files named ``*.append.csv`` are appended as they are, any other
+    # ``*.csv`` in the delta directory is an upsert by primary key
+    DELTA_MODES = ("append", "upsert")
+
+    def __init__(
+        self,
+        csv_path: str = "data/survey_data.csv",
+        shared_dir: Optional[str] = None,
+        delta_dir: Optional[str] = None,
+        compact_ratio: float = 0.1,
+        sample_rate: float = 0.01,
+    ):
         self.csv_path = csv_path
-        self.df = None
-        self._load_data()
+        self.shared_dir = shared_dir
+        self.delta_dir = delta_dir
+        self.compact_ratio = compact_ratio
+        self.sample_rate = sample_rate
+        self._sample: Optional[StratifiedSample] = None
+        self.store: Optional[ColumnStore] = None
+        self.version = None
+        self.source = None
+        self.generation = None
+        self._shared: Optional[SharedDataset] = None
+        self.applied_deltas: List[tuple] = []
+        self.delta_rows = 0
+        self.key_rows: Optional[np.ndarray] = None
+        self._key_overlay: Dict[int, int] = {}
+        self._set_dead_rows(np.empty(0, dtype=np.int64))
+        self.field_indexes: Dict[str, FieldIndex] = {}
+        self.date_index: Optional[DateIndex] = None
+        self.time_rollups: Dict[tuple, np.ndarray] = {}
+        self.sort_orders: Dict[str, np.ndarray] = {}
+        self.sort_runs: Dict[str, np.ndarray] = {}
+        self._aggregate_cache = LRUCache(maxsize=256)
+        self._bitmap_cache = LRUCache(maxsize=128)
+        if shared_dir:
+            self._load_shared()
+        else:
+            self._load_data()
+        self._build_indexes()
+        self._register_metrics()
+
+    @property
+    def row_count(self) -> int:
+        """Rows held by the store, including rows replaced by upserts"""
+        return self.store.row_count
+
+    @property
+    def live_count(self) -> int:
+        """Rows that are still current"""
+        return self.store.row_count - len(self.dead_rows)
+
+    def _set_dead_rows(self, dead_rows: np.ndarray):
+        """Record the rows replaced by upserts since the last compaction"""
+        self.dead_rows = dead_rows
+        self.live: Optional[np.ndarray] = None
+        self._live_rows: Optional[np.ndarray] = None
+        if len(dead_rows):
+            self.live = np.ones(self.store.row_count, dtype=bool)
+            self.live[dead_rows] = False
+
+    def _all_rows(self) -> np.ndarray:
+        """Positions of all current rows"""
+        if self.live is None:
+            return np.arange(self.row_count)
+        if self._live_rows is None:
+            self._live_rows = np.flatnonzero(self.live)
+        return self._live_rows
+
+    def _csv_key(self) -> str:
+        """Identity of the CSV file: changes whenever the file does"""
+        if not os.path.exists(self.csv_path):
+            raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+        stat = os.stat(self.csv_path)
+        return make_cache_key(
+            os.path.abspath(self.csv_path), stat.st_mtime_ns, stat.st_size
+        )
+
+    def _delta_files(self) -> List[tuple]:
+        """(name, size, mtime_ns) of every delta file, in the order they apply"""
+        if not self.delta_dir or not os.path.isdir(self.delta_dir):
+            return []
+        files = []
+        for name in sorted(os.listdir(self.delta_dir)):
+            if not name.endswith(".csv"):
+                continue
+            stat = os.stat(os.path.join(self.delta_dir, name))
+            files.append((name, stat.st_size, stat.st_mtime_ns))
+        return files
+
+    def _source_key(self, deltas: Optional[List[tuple]] = None) -> str:
+        """Identity of the CSV plus the delta files applied on top of it"""
+        key = self._csv_key()
+        if deltas is None:
+            deltas = self._delta_files()
+        return make_cache_key(key, deltas) if deltas else key
+
+    def source_state(self) -> Tuple[tuple, tuple]:
+        """Identity of the data source now, and of the data that was loaded
+
+        Both are (CSV and delta files identity, shared generation); they
+        differ once the CSV changes, a delta file arrives or another worker
+        publishes a newer generation. A missing file (e.g. mid-replacement)
+        reports the loaded identity.
+        """
+        loaded = (self.source, self.generation)
+        try:
+            source = self._source_key()
+        except FileNotFoundError:
+            return loaded, loaded
+        generation = self._shared.current() if self._shared is not None else None
+        return (source, generation), loaded
 
     def _load_data(self):
-        """Load CSV data into pandas DataFrame"""
+        """Load the CSV and the delta files into a compacted column store"""
         try:
-            if not os.path.exists(self.csv_path):
-                raise FileNotFoundError(f"CSV file not found: {self.csv_path}")
+            deltas = self._delta_files()
+            source = self._source_key(deltas)
+            df = pd.read_csv(self.csv_path)
+            logger.info(f"Loaded {len(df)} rows from {self.csv_path}")
+            logger.info(f"CSV columns: {list(df.columns)}")
+
+            self.store = ColumnStore.from_frame(df)
+            del df
+            self._build_key_index()
 
-            self.df = pd.read_csv(self.csv_path)
-            logger.info(f"Loaded {len(self.df)} rows from {self.csv_path}")
-            logger.info(f"CSV columns: {list(self.df.columns)}")
+            # Same merge as incremental ingestion, so a restart ends up with
+            # exactly the rows a long-running worker has
+            if deltas:
+                for name, _, _ in deltas:
+                    self._merge_delta(self._read_delta(name), self.delta_mode(name))
+                self._compact()
+            self.applied_deltas = deltas
 
-            # Convert NaN to None for JSON serialization
-            self.df = self.df.where(pd.notnull(self.df), None)
+            # Dataset version, used for ETags
+            self.source = source
+            self.version = source[:16]
 
         except Exception as e:
             logger.error(f"Error loading CSV: {str(e)}")
             raise
 
-    def build_filter_mask(self, filters: Dict[str, List[str]]) -> pd.Series:
-        """Build pandas boolean mask from filters
+    def _load_shared(self):
+        """Attach to the shared snapshot of the CSV, building it if needed
+
+        The first worker to get here builds the column store and date index
+        and publishes them; the others wait on the lock and map the same
+        files, so the per-row arrays exist once however many workers run.
+        """
+        try:
+            shared = self._shared = SharedDataset(self.shared_dir)
+            source = self._source_key()
+
+            with shared.lock():
+                generation = shared.current()
+                manifest = shared.manifest(generation) if generation else None
+                meta = manifest["meta"] if manifest else {}
+                if (
+                    meta.get("source") != source
+                    or meta.get("layout") != self.SHARED_LAYOUT_VERSION
+                ):
+                    # Built in a child process: the pandas frame used for the
+                    # build would otherwise stay in this worker's heap
+                    command = [
+                        sys.executable,
+                        "-m",
+                        __name__,
+                        os.path.abspath(self.csv_path),
+                        os.path.abspath(self.shared_dir),
+                        "--lock-held",
+                    ]
+                    if self.delta_dir:
+                        command += ["--delta-dir", os.path.abspath(self.delta_dir)]
+                    subprocess.run(command, check=True, cwd=PROJECT_ROOT)
+                    generation = shared.current()
+
+            self._attach(shared, generation)
+
+        except Exception as e:
+            logger.error(f"Error loading shared dataset: {str(e)}")
+            raise
+
+    @classmethod
+    def publish_snapshot(
+        cls, csv_path: str, shared_dir: str, delta_dir: Optional[str] = None
+    ) -> int:
+        """Load ``csv_path`` (plus deltas) and publish it as a new shared generation
+
+        The caller holds the shared dataset lock. Also runnable as
+        ``python -m app.services.local_data_service <csv> <shared_dir>`` to
+        build the snapshot before starting the workers.
+        """
+        service = cls.__new__(cls)
+        service.csv_path = csv_path
+        service.delta_dir = delta_dir
+        service.delta_rows = 0
+        service.key_rows = None
+        service._key_overlay = {}
+        service.store = None
+        service._set_dead_rows(np.empty(0, dtype=np.int64))
+        service.field_indexes = {}
+        service.date_index = None
+        service.sort_orders = {}
+        service.sort_runs = {}
+        service._load_data()
+        service._build_date_index()
+        service._build_sort_orders()
+        return SharedDataset(shared_dir).publish(
+            service._shared_arrays(),
+            {
+                "source": service.source,
+                "layout": cls.SHARED_LAYOUT_VERSION,
+                "version": service.version,
+                "columns": service.store.columns,
+            },
+        )
+
+    def _shared_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {f"store/{k}": v for k, v in self.store.arrays.items()}
+        if self.key_rows is not None:
+            arrays["key_index/rows"] = self.key_rows
+        if self.date_index is not None:
+            arrays.update(
+                {f"date_index/{k}": v for k, v in self.date_index.arrays().items()}
+            )
+        arrays.update({f"sort/{k}": v for k, v in self.sort_orders.items()})
+        arrays.update({f"runs/{k}": v for k, v in self.sort_runs.items()})
+        return arrays
+
+    def _attach(self, shared: SharedDataset, generation: int):
+        """Replace the in-process arrays with read-only maps of ``generation``"""
+        arrays, meta = shared.attach(generation)
+
+        def section(prefix):
+            return {
+                k[len(prefix) :]: v for k, v in arrays.items() if k.startswith(prefix)
+            }
+
+        self.store = ColumnStore(meta["columns"], section("store/"))
+        self.key_rows = arrays.get("key_index/rows")
+        date_arrays = section("date_index/")
+        self.date_index = (
+            DateIndex.from_arrays(self.DATE_COLUMN, date_arrays)
+            if date_arrays
+            else None
+        )
+        self.sort_orders = section("sort/")
+        self.sort_runs = section("runs/")
+        self.version = meta["version"]
+        self.source = meta["source"]
+        self.generation = generation
+        logger.info(
+            f"Attached shared dataset generation {generation} "
+            f"({self.store.row_count} rows, {self.store.nbytes} bytes mapped)"
+        )
+
+    def _register_metrics(self):
+        """Publish dataset size, memory and cache gauges
+
+        Index codes of string columns are the column store's own arrays, so
+        only the per-value arrays count towards the indexes.
+        """
+        frame_bytes = self.store.nbytes
+        index_bytes = sum(
+            index.counts.nbytes + index.by_frequency.nbytes + index._key_codes.nbytes
+            for index in self.field_indexes.values()
+        )
+        if self.date_index is not None:
+            index_bytes += sum(
+                array.nbytes for array in self.date_index.arrays().values()
+            )
+        index_bytes += sum(order.nbytes for order in self.sort_orders.values())
+        index_bytes += sum(runs.nbytes for runs in self.sort_runs.values())
+
+        dataset_rows.set_function(lambda: self.live_count)
+        dataset_memory.set_function(lambda: frame_bytes, "frame")
+        dataset_memory.set_function(lambda: index_bytes, "indexes")
+        dataset_generation.set_function(lambda: self.generation or 0)
+        register_cache("aggregate", self._aggregate_cache)
+        register_cache("bitmap", self._bitmap_cache)
+
+    def _build_indexes(self):
+        """Build per-field value indexes used for option lists and typeahead lookups"""
+        for param_name, csv_column in self.FILTER_FIELD_MAPPING.items():
+            if csv_column not in self.store:
+                continue
+
+            label_column = None
+            if param_name == "msl_names" and "name" in self.store:
+                label_column = "name"
+
+            if self.store.is_string(csv_column):
+                codes = self.store.codes(csv_column)
+                labels = None
+                if label_column:
+                    labels = self.store.first_values(codes, label_column)
+                index = FieldIndex(
+                    csv_column,
+                    codes,
+                    self.store.dictionary(csv_column).to_list(),
+                    labels,
+                )
+            else:
+                index = FieldIndex.from_series(
+                    csv_column,
+                    self.store.series(csv_column),
+                    self.store.series(label_column) if label_column else None,
+                )
+            self.field_indexes[param_name] = index
+
+        logger.info(f"Built value indexes for {len(self.field_indexes)} filter fields")
+
+        if self.date_index is None:
+            self._build_date_index()
+        if self.date_index is not None:
+            self._build_time_rollups()
+        if not self.sort_orders:
+            self._build_sort_orders()
+
+    def _build_date_index(self):
+        """Index the start date column, parsing each distinct date string once"""
+        column = self.DATE_COLUMN
+        if column not in self.store:
+            return
+
+        if self.store.is_string(column):
+            values = self.store.dictionary(column).to_list()
+            parsed = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce")
+            parsed = parsed.to_numpy().astype("datetime64[D]")
+            # Missing values (code -1) pick up the trailing NaT
+            dates = np.append(parsed, np.datetime64("NaT", "D"))[
+                self.store.codes(column)
+            ]
+            self.date_index = DateIndex(column, dates)
+        else:
+            self.date_index = DateIndex.from_series(column, self.store.series(column))
+
+    def _build_time_rollups(self):
+        """Precompute per-bucket counts for the totals and low-cardinality fields"""
+        rows = self._all_rows() if self.live is not None else None
+        for bucket in DateIndex.BUCKETS:
+            self.time_rollups[(bucket, None)] = self.date_index.rollup(
+                bucket, rows=rows
+            )
+
+            for param_name, index in self.field_indexes.items():
+                if len(index) <= self.ROLLUP_MAX_CARDINALITY:
+                    self.time_rollups[(bucket, param_name)] = self.date_index.rollup(
+                        bucket, index.codes, len(index), rows=rows
+                    )
+
+        logger.info(f"Built {len(self.time_rollups)} time-series rollups")
+
+    def _build_sort_orders(self):
+        """Row positions of every sortable column in ascending value order
+
+        Filter fields, the start date and the primary key can be sorted by.
+        Stable, so ties keep row order, with missing values last. For string
+        columns the rows of each value form one run of the order; its
+        bounds are kept in ``sort_runs`` so a value's rows can be looked up
+        without a scan.
+        """
+        columns = [
+            *self.FILTER_FIELD_MAPPING.values(),
+            self.DATE_COLUMN,
+            self.PRIMARY_KEY,
+        ]
+        rows = np.arange(self.row_count)
+        for column in dict.fromkeys(columns):
+            if column in self.store:
+                keys = self._sort_keys(column, rows)
+                self.sort_orders[column] = np.argsort(keys, kind="stable").astype(
+                    np.int32
+                )
+                if self.store.is_string(column):
+                    dictionary = self.store.dictionary(column)
+                    if dictionary.tail:
+                        continue
+                    codes = self.store.codes(column)
+                    counts = np.bincount(codes[codes >= 0], minlength=len(dictionary))
+                    runs = np.zeros(len(dictionary) + 1, dtype=np.int64)
+                    np.cumsum(counts, out=runs[1:])
+                    self.sort_runs[column] = runs
+
+        logger.info(f"Built sort orders for {len(self.sort_orders)} columns")
+
+    def _sort_keys(self, column: str, rows: np.ndarray) -> np.ndarray:
+        """Float sort key of ``column`` for each of ``rows``; missing is +inf"""
+        if column == self.DATE_COLUMN and self.date_index is not None:
+            dates = self.date_index.dates[rows]
+            keys = dates.astype(np.int64).astype(np.float64)
+            keys[np.isnat(dates)] = np.inf
+            return keys
+        if self.store.is_string(column):
+            codes = self.store.codes(column)[rows]
+            return self.store.dictionary(column).sort_keys(codes)
+
+        keys = self.store.series(column).to_numpy()[rows].astype(np.float64)
+        keys[np.isnan(keys)] = np.inf
+        return keys
+
+    def resolve_sort(self, sort: Optional[str]) -> Optional[Tuple[str, bool]]:
+        """Parse ``field[:asc|:desc]`` into (column, descending)
+
+        ``field`` is a filter parameter or column name; raises ValueError
+        for anything that cannot be sorted by.
+        """
+        if not sort:
+            return None
+        field, _, direction = sort.partition(":")
+        direction = direction.lower() or "asc"
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Unknown sort direction: {direction}")
+        column = self.FILTER_FIELD_MAPPING.get(field, field)
+        if column not in self.sort_orders:
+            raise ValueError(f"Cannot sort by unknown field: {field}")
+        return column, direction == "desc"
+
+    def _sorted_rows(
+        self,
+        column: str,
+        descending: bool,
+        rows: Optional[np.ndarray],
+        mask: Optional[np.ndarray],
+        stop: int,
+    ) -> np.ndarray:
+        """The first ``stop`` of the selected rows in ``column`` order
+
+        ``rows`` are the selected positions in row order (None for every
+        row) and ``mask``, if known, the same selection as a boolean mask.
+        A small selection is sorted directly; otherwise the load-time order
+        of the column is filtered by the mask, which is linear, and rows
+        merged from deltas since then are sorted on their own and merged
+        in. Ties keep row order and missing values come last in both
+        directions.
+        """
+        order = self.sort_orders[column]
+        covered = len(order)
+        if rows is None and not descending and covered == self.row_count:
+            return order[:stop]
+
+        if rows is None:
+            rows = np.arange(self.row_count)
+        elif len(rows) * 16 <= covered:
+            keys = self._sort_keys(column, rows)
+            if descending:
+                keys = np.where(np.isinf(keys), np.inf, -keys)
+            return rows[np.argsort(keys, kind="stable")[:stop]]
+        elif mask is None:
+            mask = np.zeros(self.row_count, dtype=bool)
+            mask[rows] = True
+
+        ordered = order[mask[order]] if mask is not None else order
+        tail = rows[np.searchsorted(rows, covered) :]
+        if not descending and not len(tail):
+            return ordered[:stop]
+
+        keys = self._sort_keys(column, ordered)
+        if len(tail):
+            tail_keys = self._sort_keys(column, tail)
+            by_key = np.argsort(tail_keys, kind="stable")
+            tail, tail_keys = tail[by_key], tail_keys[by_key]
+            at = np.searchsorted(keys, tail_keys, side="right")
+            ordered = np.insert(ordered, at, tail)
+            keys = np.insert(keys, at, tail_keys)
+
+        if descending:
+            present = np.searchsorted(keys, np.inf)
+            ordered = np.concatenate(
+                [_reverse_runs(ordered[:present], keys[:present]), ordered[present:]]
+            )
+        return ordered[:stop]
+
+    def _value_rows(self, column: str, values: List[str]) -> np.ndarray:
+        """Rows whose ``column`` is one of ``values``, in row order
+
+        Read from the value runs of the column's sort order, so the cost
+        follows the number of matching rows; rows merged since the order was
+        built are tested directly.
+        """
+        order, runs = self.sort_orders[column], self.sort_runs[column]
+        dictionary = self.store.dictionary(column)
+        codes = sorted({dictionary.code_of(str(value)) for value in values})
+        parts = [order[runs[c] : runs[c + 1]] for c in codes if 0 <= c < len(runs) - 1]
+        if len(order) < self.row_count:
+            tail = np.arange(len(order), self.row_count)
+            parts.append(tail[self.store.isin(column, values, tail)])
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+    def _build_key_index(self):
+        """Map every primary key code to the last row carrying it"""
+        self.key_rows = None
+        self._key_overlay = {}
+        if self.PRIMARY_KEY not in self.store or not self.store.is_string(
+            self.PRIMARY_KEY
+        ):
+            return
+
+        codes = self.store.codes(self.PRIMARY_KEY)
+        rows = np.flatnonzero(codes >= 0)[::-1]
+        found, last = np.unique(codes[rows], return_index=True)
+        self.key_rows = np.full(
+            len(self.store.dictionary(self.PRIMARY_KEY)), -1, dtype=np.int64
+        )
+        self.key_rows[found] = rows[last]
+
+    def _key_row(self, code: int) -> int:
+        """Row currently holding primary key ``code``, or -1"""
+        row = self._key_overlay.get(code)
+        if row is None:
+            row = int(self.key_rows[code]) if code < len(self.key_rows) else -1
+        return row
+
+    @classmethod
+    def delta_mode(cls, name: str) -> str:
+        return "append" if name.endswith(".append.csv") else "upsert"
+
+    def _read_delta(self, name: str) -> pd.DataFrame:
+        """Read one delta file, keeping string columns as strings"""
+        dtype = {c: str for c in self.store.columns if self.store.is_string(c)}
+        return pd.read_csv(os.path.join(self.delta_dir, name), dtype=dtype)
+
+    def pending_deltas(self) -> Optional[List[tuple]]:
+        """Delta files added since this service was loaded
+
+        None when they cannot be merged incrementally and a full reload is
+        needed instead: with a shared dataset (workers map one generation,
+        so deltas are folded into the next one), or when the CSV or an
+        already applied delta file changed or disappeared.
+        """
+        if self._shared is not None or not self.delta_dir:
+            return None
+        try:
+            if self._source_key(self.applied_deltas) != self.source:
+                return None
+            files = self._delta_files()
+        except FileNotFoundError:
+            return None
+
+        applied = len(self.applied_deltas)
+        if files[:applied] != self.applied_deltas:
+            return None
+        return files[applied:]
+
+    def with_deltas(self, deltas: List[tuple]) -> "LocalDataService":
+        """New service with the given delta files merged in
 
-        Maps filter parameter names to actual CSV column names
+        Only the delta rows are parsed, encoded and indexed, so the cost
+        follows the size of the deltas rather than of the table. The new
+        service shares the store buffers with this one, which keeps serving
+        its own rows unchanged until the new one is swapped in.
         """
-        mask = pd.Series([True] * len(self.df))
+        service = copy.copy(self)
+        for name, _, _ in deltas:
+            service._merge_delta(service._read_delta(name), self.delta_mode(name))
+
+        service.applied_deltas = self.applied_deltas + list(deltas)
+        service.source = service._source_key(service.applied_deltas)
+        service.version = service.source[:16]
+        service._aggregate_cache = LRUCache(maxsize=256)
+        service._bitmap_cache = LRUCache(maxsize=128)
+        service._register_metrics()
+        return service
+
+    def _merge_delta(self, delta: pd.DataFrame, mode: str):
+        """Append the rows of ``delta``, replacing rows by key when upserting
+
+        Rebinds every structure it changes instead of modifying it, so a
+        shallow copy of a service can be merged into safely.
+        """
+        if mode not in self.DELTA_MODES:
+            raise ValueError(f"Unknown delta mode: {mode}")
+        if mode == "upsert":
+            if self.key_rows is None or self.PRIMARY_KEY not in delta.columns:
+                raise ValueError(f"Upserts need a '{self.PRIMARY_KEY}' column")
+            # The last row wins when a key repeats within the delta
+            keys = delta[self.PRIMARY_KEY]
+            delta = delta[~keys.duplicated(keep="last") | keys.isna()]
+
+        start = self.row_count
+        store = self.store.append(delta)
+        new_rows = np.arange(start, store.row_count)
+
+        dead = []
+        if self.key_rows is not None:
+            overlay = dict(self._key_overlay)
+            codes = store.codes(self.PRIMARY_KEY)[new_rows]
+            for row, code in zip(new_rows.tolist(), codes.tolist()):
+                if code < 0:
+                    continue
+                if mode == "upsert":
+                    previous = self._key_row(code)
+                    if previous >= 0:
+                        dead.append(previous)
+                overlay[code] = row
+            self._key_overlay = overlay
+        dead = np.array(dead, dtype=np.int64)
+
+        self.store = store
+        self._set_dead_rows(np.concatenate([self.dead_rows, dead]))
+        self.delta_rows += len(new_rows)
+        if self.field_indexes:
+            self._update_indexes(new_rows, dead)
+
+        logger.info(
+            f"Merged {mode} delta: {len(new_rows)} rows added, {len(dead)} replaced"
+        )
+
+    def _update_indexes(self, new_rows: np.ndarray, dead: np.ndarray):
+        """Fold the added and replaced rows into the value, date and rollup indexes"""
+        field_indexes = {}
+        for param_name, index in self.field_indexes.items():
+            column = index.column
+            if not self.store.is_string(column):
+                rebuilt = FieldIndex.from_series(column, self.store.series(column))
+                field_indexes[param_name] = FieldIndex(
+                    column,
+                    rebuilt.codes,
+                    rebuilt.values,
+                    rebuilt.labels,
+                    counts=rebuilt.counts_for(self.live),
+                )
+                continue
+
+            values = self.store.dictionary(column).to_list()
+            codes = self.store.codes(column)
+            counts = np.zeros(len(values), dtype=np.int64)
+            counts[: len(index.counts)] = index.counts
+            for rows, sign in ((new_rows, 1), (dead, -1)):
+                row_codes = codes[rows]
+                counts += sign * np.bincount(
+                    row_codes[row_codes >= 0], minlength=len(values)
+                )
+
+            labels = index.labels
+            if param_name == "msl_names" and "name" in self.store:
+                found = self.store.first_values(codes, "name", new_rows)
+                labels = {**found, **labels}
+
+            field_indexes[param_name] = FieldIndex(
+                column, codes, values, labels, counts=counts
+            )
+        self.field_indexes = field_indexes
 
+        if self.date_index is None:
+            return
+
+        previous = self.date_index
+        column = self.DATE_COLUMN
+        if self.store.is_string(column):
+            dictionary = self.store.dictionary(column)
+            found, inverse = np.unique(
+                self.store.codes(column)[new_rows], return_inverse=True
+            )
+            values = [dictionary[code] if code >= 0 else None for code in found]
+        else:
+            values = self.store.series(column).to_numpy()[new_rows]
+            inverse = slice(None)
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce")
+        dates = parsed.to_numpy().astype("datetime64[D]")[inverse]
+        self.date_index = previous.appended(dates)
+
+        # Buckets only ever get appended; anything else means a rebuild
+        if any(
+            not np.array_equal(
+                self.date_index.bucket_starts[b][: len(previous.bucket_starts[b])],
+                previous.bucket_starts[b],
+            )
+            for b in DateIndex.BUCKETS
+        ):
+            self.time_rollups = {}
+            self._build_time_rollups()
+            return
+
+        rollups = {}
+        for (bucket, param_name), matrix in self.time_rollups.items():
+            index = self.field_indexes[param_name] if param_name else None
+            codes = index.codes if index else None
+            n_values = len(index) if index else 0
+
+            counts = np.zeros(
+                (len(self.date_index.bucket_starts[bucket]), n_values + 1),
+                dtype=matrix.dtype,
+            )
+            counts[: matrix.shape[0], : matrix.shape[1]] = matrix
+            counts += self.date_index.rollup(bucket, codes, n_values, rows=new_rows)
+            if len(dead):
+                counts -= self.date_index.rollup(bucket, codes, n_values, rows=dead)
+            rollups[(bucket, param_name)] = counts
+        self.time_rollups = rollups
+
+    def needs_compaction(self) -> bool:
+        """Whether enough delta rows piled up to be worth a compaction"""
+        return self.delta_rows > 0 and self.delta_rows >= self.compact_ratio * max(
+            self.live_count, 1
+        )
+
+    def compacted(self) -> "LocalDataService":
+        """New service with the deltas folded into a compacted store
+
+        Replaced rows are dropped, dictionaries sorted again and every index
+        rebuilt from the column store; nothing is re-read from disk. This
+        service keeps serving until the new one is swapped in.
+        """
+        service = copy.copy(self)
+        service._compact()
+        service._build_indexes()
+        service._aggregate_cache = LRUCache(maxsize=256)
+        service._bitmap_cache = LRUCache(maxsize=128)
+        service._register_metrics()
+        return service
+
+    def _compact(self):
+        """Rewrite the store without replaced rows; indexes need a rebuild"""
+        rows = self._all_rows()
+        self.store = self.store.compact(rows)
+        self._set_dead_rows(np.empty(0, dtype=np.int64))
+        self._build_key_index()
+        self.delta_rows = 0
+        self.field_indexes = {}
+        self.date_index = None
+        self.time_rollups = {}
+        self.sort_orders = {}
+        self.sort_runs = {}
+        self._sample = None
+        logger.info(f"Compacted the dataset to {len(rows)} rows")
+
+    def _date_mask(self, date_from=None, date_to=None) -> Optional[np.ndarray]:
+        """Row mask for a start date range, or None when no range is given"""
+        if date_from is None and date_to is None:
+            return None
+        if self.date_index is None:
+            logger.warning(f"Column '{self.DATE_COLUMN}' not found in CSV")
+            return None
+        return self.date_index.range_mask(date_from, date_to)
+
+    @staticmethod
+    def _shared_mask(masks: Optional[Dict[tuple, np.ndarray]], key: tuple, build):
+        """``build()``, memoized in ``masks`` while evaluating a batch"""
+        if masks is None:
+            return build()
+        mask = masks.get(key)
+        if mask is None:
+            mask = masks[key] = build()
+        return mask
+
+    def _filter_predicates(
+        self,
+        filters: Dict[str, List[str]],
+        date_from=None,
+        date_to=None,
+        masks: Optional[Dict[tuple, np.ndarray]] = None,
+    ) -> List[tuple]:
+        """(estimated rows, name, select, test) for every predicate of a query
+
+        ``select()`` returns the matching row positions in row order and
+        ``test(rows)`` a boolean mask over the given positions. Field
+        estimates are exact live-row counts from the per-value counts of
+        the field indexes; columns without one are assumed to match
+        everything. Selective string predicates select from the value runs
+        of the sort orders rather than scanning the column.
+        """
+        indexes = {index.column: index for index in self.field_indexes.values()}
+        predicates = []
         for param_name, values in filters.items():
             if not values or len(values) == 0:
                 continue
@@ -69,55 +900,355 @@ class LocalDataService:
             # Get the actual CSV column name
             csv_column = self.FILTER_FIELD_MAPPING.get(param_name, param_name)
 
-            # Check if column exists in dataframe
-            if csv_column not in self.df.columns:
+            # Check if column exists in the dataset
+            if csv_column not in self.store:
                 logger.warning(
                     f"Column '{csv_column}' not found in CSV (from parameter '{param_name}')"
                 )
                 continue
 
-            # Create OR condition for multiple values (matches any value in the list)
-            field_mask = self.df[csv_column].isin(values)
-            mask = mask & field_mask
+            index = indexes.get(csv_column)
+            if index is not None and self.store.is_string(csv_column):
+                estimate = int(index.counts[index.codes_for(values)].sum())
+            else:
+                estimate = self.row_count
 
+            # OR condition for multiple values (matches any value in the list)
+            key = (csv_column, tuple(sorted({str(v) for v in values})))
+
+            def select(key=key, column=csv_column, values=values, estimate=estimate):
+                shared = masks is not None and key in masks
+                # A few rows: gather them from the value runs instead of a scan
+                if (
+                    not shared
+                    and column in self.sort_runs
+                    and estimate * 16 <= self.row_count
+                ):
+                    return self._value_rows(column, values)
+                mask = self._shared_mask(
+                    masks, key, lambda: self.store.isin(column, values)
+                )
+                return np.flatnonzero(mask)
+
+            def test(rows, key=key, column=csv_column, values=values):
+                if masks is not None and key in masks:
+                    return masks[key][rows]
+                return self.store.isin(column, values, rows)
+
+            predicates.append(
+                (estimate, f"{param_name} -> {csv_column} = {values}", select, test)
+            )
+
+        if date_from is not None or date_to is not None:
+            if self.date_index is None:
+                logger.warning(f"Column '{self.DATE_COLUMN}' not found in CSV")
+            else:
+                matched = self.date_index.range_rows(date_from, date_to)
+                # Sorted on first use; a batch sorts each date range once
+                select = partial(
+                    self._shared_mask,
+                    masks,
+                    (self.DATE_COLUMN, date_from, date_to),
+                    partial(np.sort, matched),
+                )
+                predicates.append(
+                    (
+                        len(matched),
+                        f"{self.DATE_COLUMN} in [{date_from}, {date_to}]",
+                        select,
+                        lambda rows: self.date_index.in_range(rows, date_from, date_to),
+                    )
+                )
+
+        if self.live is not None:
+            predicates.append(
+                (
+                    self.live_count,
+                    "live rows",
+                    self._all_rows,
+                    lambda rows: self.live[rows],
+                )
+            )
+        return predicates
+
+    def filter_rows(
+        self,
+        filters: Dict[str, List[str]],
+        date_from=None,
+        date_to=None,
+        masks: Optional[Dict[tuple, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """Positions of the live rows matching the filters, in row order
+
+        A small planner: predicates are ordered by estimated selectivity,
+        only the most selective one is evaluated over the whole column and
+        the others just test the rows that survived so far. A predicate
+        matching nothing ends the query at once. Per-field masks are taken
+        from and added to ``masks`` when given.
+        """
+        predicates = self._filter_predicates(filters, date_from, date_to, masks)
+        if not predicates:
+            return np.arange(self.row_count)
+        predicates.sort(key=lambda predicate: predicate[0])
+        if predicates[0][0] == 0:
+            logger.info(f"Filter: {predicates[0][1]} matches no rows")
+            return np.empty(0, dtype=np.int64)
+
+        rows = None
+        for estimate, name, select, test in predicates:
+            rows = select() if rows is None else rows[test(rows)]
+            logger.info(f"Filter: {name} (estimated {estimate} rows, {len(rows)} left)")
+            if len(rows) == 0:
+                break
+        return rows
+
+    def _approx_sample(self) -> StratifiedSample:
+        """Sample behind approx=true answers, drawn on first use
+
+        Stratified by month of the start date. Rows merged from deltas
+        afterwards are not part of it and are counted exactly instead.
+        """
+        sample = self._sample
+        if sample is None:
+            if self.date_index is not None:
+                strata = self.date_index.bucket_codes["month"] + 1
+            else:
+                strata = np.zeros(self.row_count, dtype=np.int64)
+            sample = self._sample = StratifiedSample(strata, self.sample_rate)
             logger.info(
-                f"Filter: {param_name} -> {csv_column} = {values} (matched {field_mask.sum()} rows)"
+                f"Drew a sample of {len(sample)} rows over {len(sample.sizes)} strata"
             )
+        return sample
 
-        return mask
+    def _sampled_matches(
+        self, predicates: List[tuple]
+    ) -> Tuple[StratifiedSample, np.ndarray, np.ndarray]:
+        """The sample, which of its rows match, and the matching rows it misses"""
+        sample = self._approx_sample()
+        positions = np.arange(len(sample))
+        later = np.arange(sample.covered, self.row_count)
+        for _, _, _, test in predicates:
+            positions = positions[test(sample.rows[positions])]
+            later = later[test(later)]
+
+        matched = np.zeros(len(sample), dtype=bool)
+        matched[positions] = True
+        return sample, matched, later
+
+    def _approx_rows(
+        self, predicates: List[tuple], stop: int
+    ) -> Tuple[np.ndarray, Optional[Dict[str, Any]]]:
+        """The first ``stop`` matching rows and an estimate of how many match
 
-    def get_surveys(self, filters: SurveyFilter) -> Dict[str, Any]:
-        """Get surveys with filtering support for multiple values"""
+        Rows are scanned in chunks and the scan stops once ``stop`` rows
+        matched; the total then comes from the sample, with a 95% interval.
+        The estimate is None when the scan reached the end, as the count
+        is exact then, or when the most selective predicate is small enough
+        to count exactly for about the cost of scanning.
+        """
+        predicates = sorted(predicates, key=lambda predicate: predicate[0])
+        if not predicates:
+            return np.arange(self.row_count), None
+        if predicates[0][0] == 0:
+            return np.empty(0, dtype=np.int64), None
+        if predicates[0][0] * 16 <= self.row_count:
+            rows = predicates[0][2]()
+            for _, _, _, test in predicates[1:]:
+                rows = rows[test(rows)]
+            return rows, None
+
+        found, count = [], 0
+        for start in range(0, self.row_count, self.SCAN_CHUNK_ROWS):
+            rows = np.arange(start, min(start + self.SCAN_CHUNK_ROWS, self.row_count))
+            for _, _, _, test in predicates:
+                rows = rows[test(rows)]
+            found.append(rows)
+            count += len(rows)
+            if count >= stop and start + self.SCAN_CHUNK_ROWS < self.row_count:
+                break
+        else:
+            return np.concatenate(found) if found else np.empty(0, np.int64), None
+
+        sample, matched, later = self._sampled_matches(predicates)
+        estimate, margin = sample.estimate(matched)
+        # Every matching row seen is a hard lower bound
+        seen = int(matched.sum()) + len(later)
+        total = float(estimate[0]) + len(later)
+        estimate = {
+            "total": min(max(int(round(total)), count, seen), self.live_count),
+            "exact": False,
+            "low": max(int(np.floor(total - margin[0])), count, seen),
+            "high": min(int(np.ceil(total + margin[0])), self.live_count),
+            "confidence": 0.95,
+            "sample_rows": len(sample),
+        }
+        return np.concatenate(found), estimate
+
+    def build_filter_mask(
+        self,
+        filters: Dict[str, List[str]],
+        masks: Optional[Dict[tuple, np.ndarray]] = None,
+    ) -> pd.Series:
+        """Build pandas boolean mask from filters
+
+        Maps filter parameter names to actual CSV column names; the rows
+        come from ``filter_rows``.
+        """
+        mask = np.zeros(self.row_count, dtype=bool)
+        mask[self.filter_rows(filters, masks=masks)] = True
+        return pd.Series(mask)
+
+    def _bitmap(self, key: tuple, build) -> np.ndarray:
+        """Packed row bitmap of the boolean mask ``build()``, cached by ``key``"""
+        bits = self._bitmap_cache.get(key)
+        if bits is None:
+            bits = np.packbits(build())
+            self._bitmap_cache.set(key, bits)
+        return bits
+
+    def count_surveys(
+        self, filters: Dict[str, List[str]], date_from=None, date_to=None
+    ) -> Dict[str, Any]:
+        """Number of surveys matching the filters, without building a page
+
+        A single filtered field is answered from its per-value counts;
+        anything else intersects packed row bitmaps, cached per field
+        selection, and counts the set bits.
+        """
         try:
-            # Convert filters to dict, excluding None and empty values
-            filter_dict = {}
-            for field, values in filters.dict(exclude_unset=True).items():
-                if field in ["page", "size"]:
+            filters = canonical_filters(filters)
+            columns = {}
+            for param_name, values in filters.items():
+                column = self.FILTER_FIELD_MAPPING.get(param_name, param_name)
+                if column not in self.store:
+                    logger.warning(
+                        f"Column '{column}' not found in CSV (from parameter '{param_name}')"
+                    )
                     continue
-                if values is not None and len(values) > 0:
-                    filter_dict[field] = values
+                columns[param_name] = (column, values)
+
+            dated = self.date_index is not None and (
+                date_from is not None or date_to is not None
+            )
+            if not dated and not columns:
+                return {"total": self.live_count}
+
+            if not dated and len(columns) == 1:
+                [(param_name, (column, values))] = columns.items()
+                index = self.field_indexes.get(param_name)
+                if (
+                    index is not None
+                    and index.column == column
+                    and self.store.is_string(column)
+                ):
+                    total = index.counts[index.codes_for(values)].sum()
+                    return {"total": int(total)}
+
+            parts = [
+                self._bitmap(
+                    ("field", column, tuple(values)),
+                    lambda: self.store.isin(column, values),
+                )
+                for column, values in columns.values()
+            ]
+            if dated:
+                parts.append(
+                    self._bitmap(
+                        ("dates", str(date_from), str(date_to)),
+                        lambda: self._date_mask(date_from, date_to),
+                    )
+                )
+            if self.live is not None:
+                parts.append(self._bitmap(("live",), lambda: self.live))
+
+            bits = parts[0]
+            if len(parts) > 1:
+                bits = np.bitwise_and(parts[0], parts[1])
+                for part in parts[2:]:
+                    np.bitwise_and(bits, part, out=bits)
+            return {"total": _popcount(bits)}
+
+        except Exception as e:
+            logger.error(f"Error in count_surveys: {str(e)}")
+            raise
+
+    @staticmethod
+    def _survey_filter_dict(filters: SurveyFilter) -> Dict[str, List[str]]:
+        """Field selections of a SurveyFilter, excluding None and empty values"""
+        filter_dict = {}
+        for field, values in filters.dict(exclude_unset=True).items():
+            if field in ["page", "size", "date_from", "date_to", "sort", "approx"]:
+                continue
+            if values is not None and len(values) > 0:
+                filter_dict[field] = values
+        return filter_dict
+
+    def get_surveys(
+        self,
+        filters: SurveyFilter,
+        masks: Optional[Dict[tuple, np.ndarray]] = None,
+    ) -> Dict[str, Any]:
+        """Get surveys with filtering support for multiple values
+
+        ``masks`` shares per-field and date masks between the queries of
+        a batch. With ``approx`` an unsorted page stops filtering once the
+        page is found and the total is estimated from the sample.
+        """
+        try:
+            filter_dict = self._survey_filter_dict(filters)
 
             logger.info(f"Applied filters: {filter_dict}")
 
+            sort = self.resolve_sort(filters.sort)
+            dated = filters.date_from is not None or filters.date_to is not None
+            offset = (filters.page - 1) * filters.size
+
             # Apply filters
-            if filter_dict:
-                mask = self.build_filter_mask(filter_dict)
-                filtered_df = self.df[mask]
+            mask = self.live
+            estimate = None
+            if filters.approx and sort is None and (filter_dict or dated):
+                with stage("filter_scan"):
+                    rows, estimate = self._approx_rows(
+                        self._filter_predicates(
+                            filter_dict, filters.date_from, filters.date_to, masks
+                        ),
+                        offset + filters.size,
+                    )
+            elif filter_dict or dated:
+                with stage("filter_mask"):
+                    mask = None
+                    rows = self.filter_rows(
+                        filter_dict, filters.date_from, filters.date_to, masks
+                    )
                 logger.info(
-                    f"After filtering: {len(filtered_df)} rows out of {len(self.df)}"
+                    f"After filtering: {len(rows)} rows out of {self.live_count}"
                 )
+            elif self.live is not None:
+                rows = self._all_rows()
             else:
-                filtered_df = self.df
+                rows = None
 
             # Calculate pagination
-            total_count = len(filtered_df)
-            offset = (filters.page - 1) * filters.size
+            total_count = len(rows) if rows is not None else self.row_count
+            if estimate is not None:
+                total_count = estimate.pop("total")
 
             # Apply pagination
-            paginated_df = filtered_df.iloc[offset : offset + filters.size]
+            with stage("paginate"):
+                if sort is not None:
+                    page_rows = self._sorted_rows(
+                        *sort, rows, mask, offset + filters.size
+                    )[offset:]
+                elif rows is not None:
+                    page_rows = rows[offset : offset + filters.size]
+                else:
+                    page_rows = np.arange(
+                        offset, min(offset + filters.size, total_count)
+                    )
 
-            # Convert to list of dicts
-            results = paginated_df.to_dict("records")
+            # Decode only the rows of the page
+            with stage("serialize"):
+                results = self.store.take(page_rows)
 
             total_pages = (
                 (total_count + filters.size - 1) // filters.size
@@ -129,13 +1260,20 @@ class LocalDataService:
                 f"Returning page {filters.page}/{total_pages} with {len(results)} surveys out of {total_count} total"
             )
 
-            return {
+            result = {
                 "surveys": results,
                 "total": total_count,
                 "page": filters.page,
                 "size": filters.size,
                 "total_pages": total_pages,
             }
+            if filters.approx:
+                result["approx"] = estimate or {
+                    "exact": True,
+                    "low": total_count,
+                    "high": total_count,
+                }
+            return result
 
         except Exception as e:
             logger.error(f"Error in get_surveys: {str(e)}")
@@ -144,6 +1282,47 @@ class LocalDataService:
             logger.error(traceback.format_exc())
             raise
 
+    def get_surveys_batch(
+        self, items: Dict[str, SurveyFilter], workers: int = 4
+    ) -> Dict[str, Dict[str, Any]]:
+        """Evaluate several /surveys/ queries at once, keyed by request id
+
+        Every distinct (field, values) mask of the batch is computed once,
+        then the queries run in parallel on ``workers`` threads sharing
+        those masks; the sorted rows of a date range are shared too, once a
+        query has needed them. A failing query is reported in its own result
+        and does not fail the others.
+        """
+        masks: Dict[tuple, np.ndarray] = {}
+        selections = {}
+        for filters in items.values():
+            for param_name, values in self._survey_filter_dict(filters).items():
+                column = self.FILTER_FIELD_MAPPING.get(param_name, param_name)
+                if column in self.store:
+                    key = (column, tuple(sorted({str(v) for v in values})))
+                    selections[key] = partial(self.store.isin, column, values)
+
+        def build(item):
+            key, make = item
+            masks[key] = make()
+
+        def run(filters: SurveyFilter) -> Dict[str, Any]:
+            try:
+                return {"status": "ok", **self.get_surveys(filters, masks)}
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            list(executor.map(in_request_context(build), selections.items()))
+            results = dict(
+                zip(items, executor.map(in_request_context(run), items.values()))
+            )
+
+        logger.info(
+            f"Survey batch: {len(items)} queries, {len(selections)} distinct field selections"
+        )
+        return results
+
     # def get_filter_options(
     #     self, applied_filters: Optional[Dict[str, List[str]]] = None
     # ) -> FilterOptions:
@@ -199,50 +1378,42 @@ class LocalDataService:
     #         logger.error(traceback.format_exc())
     #         raise
     def get_filter_options(
-        self, applied_filters: Optional[Dict[str, List[str]]] = None
+        self,
+        applied_filters: Optional[Dict[str, List[str]]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "value",
     ) -> FilterOptions:
-        """Get available filter options, optionally filtered by existing selections"""
+        """Get available filter options, optionally filtered by existing selections
+
+        Each option list can be paged with ``limit``/``offset`` and ordered
+        by value or by frequency; ``totals`` reports the full size of every
+        list so the caller knows when more values exist.
+        """
         try:
             # Apply filters if provided
+            mask = None
             if applied_filters:
-                mask = self.build_filter_mask(applied_filters)
-                filtered_df = self.df[mask]
-            else:
-                filtered_df = self.df
-
-            # Get unique values for each field using actual CSV column names
-            options = {
-                "country_geo_ids": self._get_unique_values(
-                    filtered_df, "country_geo_id"
-                ),
-                "territories": self._get_unique_values(filtered_df, "territory"),
-                "regions": self._get_unique_values(filtered_df, "region"),
-                "msl_names": self._get_msl_names_with_display(
-                    filtered_df
-                ),  # NEW: Special handling
-                "titles": self._get_unique_values(filtered_df, "title"),
-                "departments": self._get_unique_values(filtered_df, "department"),
-                "user_types": self._get_unique_values(filtered_df, "user_type"),
-                "survey_names": self._get_unique_values(filtered_df, "survey_name"),
-                "questions": self._get_unique_values(filtered_df, "question"),
-                "products": self._get_unique_values(filtered_df, "product"),
-                "product_expertise_options": self._get_unique_values(
-                    filtered_df, "product_expertise"
-                ),
-                "responses": self._get_unique_values(filtered_df, "response"),
-                "account_names": self._get_unique_values(filtered_df, "account_name"),
-                "companies": self._get_unique_values(filtered_df, "company"),
-                "channels": self._get_unique_values(filtered_df, "channels"),
-                "assignment_types": self._get_unique_values(
-                    filtered_df, "assignment_type"
-                ),
-            }
+                mask = self.build_filter_mask(applied_filters).to_numpy()
+
+            options = {}
+            totals = {}
+            for option_name, param_name in self.OPTION_FIELD_MAPPING.items():
+                index = self.field_indexes.get(param_name)
+                if index is None:
+                    logger.warning(f"No index for filter field '{param_name}'")
+                    options[option_name], totals[option_name] = [], 0
+                    continue
+
+                options[option_name], totals[option_name] = index.option_page(
+                    mask, limit, offset, sort
+                )
 
             logger.info(
-                f"Generated filter options: {len(options['msl_names'])} MSL names, {len(options['titles'])} titles"
+                f"Generated filter options: {totals['msl_names']} MSL names, {totals['titles']} titles"
             )
 
-            return FilterOptions(**options)
+            return FilterOptions(**options, totals=totals)
 
         except Exception as e:
             logger.error(f"Error in get_filter_options: {str(e)}")
@@ -251,75 +1422,33 @@ class LocalDataService:
             logger.error(traceback.format_exc())
             raise
 
-    def _get_unique_values(self, df: pd.DataFrame, column: str) -> List[str]:
-        """Get sorted unique values from a column, excluding None/NaN"""
-        if column not in df.columns:
-            logger.warning(f"Column '{column}' not found in CSV")
-            return []
-
-        unique_values = df[column].dropna().unique().tolist()
-        unique_values = [
-            str(v) for v in unique_values if v is not None and str(v) != "nan"
-        ]
-        return sorted(unique_values)
-
-    def _get_msl_names_with_display(self, df: pd.DataFrame) -> List[str]:
-        """Get MSL names in format 'msl_name|Name (msl_name)'
-
-        Returns list of strings in format: 'value|label'
-        Frontend will parse this to create {value, label} pairs
-        """
-        logger.info(f"DEBUG: Processing {len(df)} rows for MSL names")
-        logger.info(
-            f"DEBUG: Sample row - name: {df['name'].iloc[0]}, msl_name: {df['msl_name'].iloc[0]}"
-        )
-
-        if "name" not in df.columns or "msl_name" not in df.columns:
-            logger.warning("Required columns 'name' or 'msl_name' not found")
-            # Fallback to just msl_name if name is not available
-            if "msl_name" in df.columns:
-                return self._get_unique_values(df, "msl_name")
-            return []
-
-        # Get unique combinations of name and msl_name
-        # Don't use .dropna() here as it might drop valid rows
-        unique_msls = df[["name", "msl_name"]].drop_duplicates()
-
-        # Format as "value|label" where:
-        # - value is msl_name (for filtering)
-        # - label is "Name (msl_name)"
-        result = []
-        for _, row in unique_msls.iterrows():
-            msl_name_val = row["msl_name"]
-            name_val = row["name"]
-
-            # Convert to string and check for valid values
-            msl_name = str(msl_name_val) if pd.notna(msl_name_val) else None
-            name = str(name_val) if pd.notna(name_val) else None
-
-            # Only include if both values are valid
-            if msl_name and msl_name != "nan" and name and name != "nan":
-                # Format: value|label
-                result.append(f"{msl_name}|{name} ({msl_name})")
-                logger.debug(f"Formatted MSL: {msl_name} -> {name} ({msl_name})")
-            elif msl_name and msl_name != "nan":
-                # If we have email but no name, just use email
-                logger.warning(f"MSL {msl_name} has no name, using email only")
-                result.append(msl_name)
-
-        logger.info(f"Generated {len(result)} MSL name options with display names")
-        if result:
-            logger.info(f"Sample formatted MSL: {result[0]}")
-
-        return sorted(result)
-
     def get_progressive_filter_options(
-        self, target_filter: str, applied_filters: Dict[str, List[str]]
+        self,
+        target_filter: str,
+        applied_filters: Dict[str, List[str]],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "value",
     ) -> List[str]:
         """Get filter options for a specific field based on other applied filters"""
+        return self.get_progressive_filter_page(
+            target_filter, applied_filters, limit, offset, sort
+        )["values"]
+
+    def get_progressive_filter_page(
+        self,
+        target_filter: str,
+        applied_filters: Dict[str, List[str]],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "value",
+    ) -> Dict[str, Any]:
+        """Get one page of options for a specific field, plus the total count"""
         try:
-            # Get the actual CSV column name
-            csv_column = self.FILTER_FIELD_MAPPING.get(target_filter, target_filter)
+            index = self.field_indexes.get(target_filter)
+            if index is None:
+                logger.warning(f"No index for filter field '{target_filter}'")
+                return {"values": [], "total": 0}
 
             # Remove target filter from applied filters
             filter_dict = {
@@ -327,18 +1456,12 @@ class LocalDataService:
             }
 
             # Apply filters
+            mask = None
             if filter_dict:
-                mask = self.build_filter_mask(filter_dict)
-                filtered_df = self.df[mask]
-            else:
-                filtered_df = self.df
+                mask = self.build_filter_mask(filter_dict).to_numpy()
 
-            # Get unique values for target filter using the CSV column name
-            # Use special handling for MSL names
-            if target_filter == "msl_names":
-                return self._get_msl_names_with_display(filtered_df)
-            else:
-                return self._get_unique_values(filtered_df, csv_column)
+            values, total = index.option_page(mask, limit, offset, sort)
+            return {"values": values, "total": total}
 
         except Exception as e:
             logger.error(f"Error in get_progressive_filter_options: {str(e)}")
@@ -347,16 +1470,436 @@ class LocalDataService:
             logger.error(traceback.format_exc())
             raise
 
+    def estimate_filter_options(
+        self,
+        applied_filters: Dict[str, List[str]],
+        target_filter: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        sort: str = "value",
+    ) -> Dict[str, Any]:
+        """Filter options estimated from the sample, for approx=true
+
+        Covers every option list like ``get_filter_options``, or only
+        ``target_filter`` (ignoring its own selection) like
+        ``get_progressive_filter_page``. Each listed value comes with an
+        estimated row count and 95% interval; values too rare to be sampled
+        are missing, so totals count the values seen.
+        """
+        try:
+            if target_filter:
+                fields = {target_filter: target_filter}
+                applied_filters = {
+                    k: v for k, v in applied_filters.items() if k != target_filter
+                }
+            else:
+                fields = self.OPTION_FIELD_MAPPING
+
+            sample, matched, later = self._sampled_matches(
+                self._filter_predicates(applied_filters or {})
+            )
+
+            options, totals, estimates = {}, {}, {}
+            for option_name, param_name in fields.items():
+                index = self.field_indexes.get(param_name)
+                if index is None:
+                    logger.warning(f"No index for filter field '{param_name}'")
+                    options[option_name], totals[option_name] = [], 0
+                    estimates[option_name] = []
+                    continue
+
+                counts, margins = sample.estimate(
+                    matched, index.codes[sample.rows], len(index)
+                )
+                # Rows the sample misses are counted exactly
+                later_codes = index.codes[later]
+                exact = np.bincount(later_codes[later_codes >= 0], minlength=len(index))
+                sampled_codes = index.codes[sample.rows[matched]]
+                seen = exact + np.bincount(
+                    sampled_codes[sampled_codes >= 0], minlength=len(index)
+                )
+                counts = counts + exact
+
+                codes = index.present_order(counts, sort)
+                end = None if limit is None else offset + limit
+                page = codes[offset:end]
+                options[option_name] = [index.display[code] for code in page]
+                totals[option_name] = len(codes)
+                estimates[option_name] = [
+                    {
+                        "value": index.values[code],
+                        "count": min(
+                            max(int(round(counts[code])), int(seen[code])),
+                            int(index.counts[code]),
+                        ),
+                        "low": max(
+                            int(np.floor(counts[code] - margins[code])),
+                            int(seen[code]),
+                        ),
+                        "high": min(
+                            int(np.ceil(counts[code] + margins[code])),
+                            int(index.counts[code]),
+                        ),
+                    }
+                    for code in page
+                ]
+
+            return {
+                "options": options,
+                "totals": totals,
+                "estimates": estimates,
+                "approx": {"confidence": 0.95, "sample_rows": len(sample)},
+            }
+
+        except Exception as e:
+            logger.error(f"Error in estimate_filter_options: {str(e)}")
+            raise
+
     def get_survey_by_id(self, survey_id: str) -> Optional[Dict[str, Any]]:
         """Get specific survey by ID"""
         try:
-            result = self.df[self.df["survey_qstn_resp_id"] == survey_id]
+            if self.key_rows is None:
+                rows = np.flatnonzero(self.store.isin(self.PRIMARY_KEY, [survey_id]))
+            else:
+                code = self.store.dictionary(self.PRIMARY_KEY).code_of(str(survey_id))
+                rows = [self._key_row(code)] if code >= 0 else []
+                rows = [row for row in rows if row >= 0]
 
-            if len(result) == 0:
+            if len(rows) == 0:
                 return None
 
-            return result.iloc[0].to_dict()
+            return self.store.take(rows[:1])[0]
 
         except Exception as e:
             logger.error(f"Error in get_survey_by_id: {str(e)}")
             raise
+
+    def suggest_filter_values(
+        self,
+        field: str,
+        prefix: str,
+        applied_filters: Optional[Dict[str, List[str]]] = None,
+        limit: int = 20,
+    ) -> Dict[str, Any]:
+        """Get values of a filter field starting with the given prefix
+
+        Matching is case-insensitive and restricted to values present under
+        the other applied filters.
+        """
+        try:
+            index = self.field_indexes.get(field)
+            if index is None:
+                return {"field": field, "prefix": prefix, "suggestions": [], "total": 0}
+
+            # Remove target filter from applied filters
+            filter_dict = {
+                k: v for k, v in (applied_filters or {}).items() if k != field and v
+            }
+
+            allowed = None
+            if filter_dict:
+                mask = self.build_filter_mask(filter_dict)
+                allowed = index.present_codes(mask.to_numpy())
+
+            suggestions, total = index.suggest(prefix, limit, allowed)
+
+            return {
+                "field": field,
+                "prefix": prefix,
+                "suggestions": suggestions,
+                "total": total,
+            }
+
+        except Exception as e:
+            logger.error(f"Error in suggest_filter_values: {str(e)}")
+            raise
+
+    def resolve_group_by(self, fields: List[str]) -> List[str]:
+        """Map group_by entries (filter parameter or column names) to filter parameter names"""
+        if len(fields) > self.MAX_GROUP_BY_FIELDS:
+            raise ValueError(
+                f"Cannot group by more than {self.MAX_GROUP_BY_FIELDS} fields"
+            )
+        column_to_param = {v: k for k, v in self.FILTER_FIELD_MAPPING.items()}
+
+        params = []
+        for field in fields:
+            param_name = (
+                field
+                if field in self.FILTER_FIELD_MAPPING
+                else column_to_param.get(field)
+            )
+            if param_name is None or param_name not in self.field_indexes:
+                raise ValueError(f"Cannot group by unknown field: {field}")
+            params.append(param_name)
+
+        return params
+
+    @staticmethod
+    def _group_by_key(
+        codes: List[np.ndarray], radixes: List[int], count_field: Optional[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Groups and their counts via one mixed-radix int64 key per row
+
+        The last code column is the counted field when ``count_field`` is
+        set; its distinct values are counted per group instead of rows.
+        Groups come back as a (groups, fields) array of codes.
+        """
+        keys = np.zeros(len(codes[0]) if codes else 0, dtype=np.int64)
+        for column, radix in zip(codes, radixes):
+            keys = keys * radix + column
+        if count_field is not None:
+            keys = np.unique(keys) // radixes[-1]
+            radixes = radixes[:-1]
+        keys, values = np.unique(keys, return_counts=True)
+
+        groups = np.empty((len(keys), len(radixes)), dtype=np.int64)
+        for i in reversed(range(len(radixes))):
+            groups[:, i] = keys % radixes[i]
+            keys = keys // radixes[i]
+        return groups, values
+
+    @staticmethod
+    def _group_by_rows(
+        codes: List[np.ndarray], count_field: Optional[str]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Same as ``_group_by_key`` by grouping whole code rows, for any radix"""
+        stacked = np.column_stack(codes)
+        if count_field is not None:
+            stacked = np.unique(stacked, axis=0)[:, :-1]
+        return np.unique(stacked, axis=0, return_counts=True)
+
+    def aggregate_surveys(
+        self,
+        filters: Dict[str, List[str]],
+        group_by: List[str],
+        metric: str = "count",
+    ) -> Dict[str, Any]:
+        """Grouped counts over the filtered rows
+
+        Groups are formed by combining the per-field value codes into a
+        single integer key, so the whole group-by is a couple of vectorized
+        ``np.unique`` calls with no string handling until the output rows.
+        When that key would not fit in int64 the code rows are grouped
+        directly instead.
+        """
+        try:
+            if metric not in self.AGGREGATE_METRICS:
+                raise ValueError(f"Unknown aggregate metric: {metric}")
+            params = self.resolve_group_by(group_by)
+
+            cache_key = make_cache_key(canonical_filters(filters), params, metric)
+            cached = self._aggregate_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            filter_dict = {k: v for k, v in filters.items() if v}
+            rows = self.filter_rows(filter_dict) if filter_dict else self._all_rows()
+
+            # Group codes shifted so missing = 0, plus the counted field's code
+            indexes = [self.field_indexes[p] for p in params]
+            codes = [index.codes[rows] + 1 for index in indexes]
+            radixes = [len(index) + 1 for index in indexes]
+            count_field = self.AGGREGATE_METRICS[metric]
+            if count_field is not None:
+                count_index = self.field_indexes[count_field]
+                count_codes = count_index.codes[rows]
+                valid = count_codes >= 0
+                codes = [c[valid] for c in codes] + [count_codes[valid]]
+                radixes.append(len(count_index))
+
+            if math.prod(radixes) <= np.iinfo(np.int64).max:
+                groups, values = self._group_by_key(codes, radixes, count_field)
+            else:
+                groups, values = self._group_by_rows(codes, count_field)
+
+            order = np.argsort(-values, kind="stable")
+            groups, values = groups[order], values[order]
+
+            # Decode the group codes back into per-field values
+            columns = {
+                index.column: [
+                    index.values[code - 1] if code > 0 else None
+                    for code in groups[:, i]
+                ]
+                for i, index in enumerate(indexes)
+            }
+
+            results = [
+                {
+                    **{index.column: columns[index.column][i] for index in indexes},
+                    "value": int(values[i]),
+                }
+                for i in range(len(values))
+            ]
+
+            result = {
+                "group_by": [index.column for index in indexes],
+                "metric": metric,
+                "rows": results,
+                "total_groups": len(results),
+            }
+            self._aggregate_cache.set(cache_key, result)
+
+            logger.info(
+                f"Aggregated {len(rows)} rows into {len(results)} groups by {result['group_by']}"
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Error in aggregate_surveys: {str(e)}")
+            raise
+
+    def get_timeseries(
+        self,
+        filters: Dict[str, List[str]],
+        bucket: str = "month",
+        group_by: Optional[str] = None,
+        date_from=None,
+        date_to=None,
+    ) -> Dict[str, Any]:
+        """Survey counts per day/week/month, optionally split by one field
+
+        Served straight from the load-time rollups when the request only
+        filters on the grouped field (or on a single low-cardinality field);
+        any other filter combination falls back to a bincount over the
+        matching rows.
+        """
+        try:
+            if self.date_index is None:
+                raise ValueError(f"Column '{self.DATE_COLUMN}' not found in CSV")
+            if bucket not in DateIndex.BUCKETS:
+                raise ValueError(f"Unknown time bucket: {bucket}")
+
+            param_name = self.resolve_group_by([group_by])[0] if group_by else None
+            index = self.field_indexes[param_name] if param_name else None
+            filter_dict = {k: v for k, v in filters.items() if v}
+            has_dates = date_from is not None or date_to is not None
+
+            # A single filtered field can be served from its own rollup
+            rollup_field = param_name
+            if rollup_field is None and len(filter_dict) == 1:
+                rollup_field = next(iter(filter_dict))
+
+            labels = self.date_index.bucket_labels[bucket]
+            rollup = self.time_rollups.get((bucket, rollup_field))
+
+            if (
+                rollup is not None
+                and set(filter_dict) <= {rollup_field}
+                and (not has_dates or bucket == "day")
+            ):
+                source = "rollup"
+                counts = rollup
+                if rollup_field in filter_dict:
+                    keep = np.zeros(counts.shape[1], dtype=bool)
+                    keep[
+                        self.field_indexes[rollup_field].codes_for(
+                            filter_dict[rollup_field]
+                        )
+                        + 1
+                    ] = True
+                    counts = counts * keep
+                if param_name is None:
+                    counts = counts.sum(axis=1, keepdims=True)
+                if has_dates:
+                    window = self.date_index.bucket_range(bucket, date_from, date_to)
+                    counts = counts[window]
+                    labels = labels[window]
+            else:
+                source = "scan"
+                rows = self.filter_rows(filter_dict, date_from, date_to)
+                counts = self.date_index.rollup(
+                    bucket,
+                    index.codes if index else None,
+                    len(index) if index else 0,
+                    rows=rows,
+                )
+
+            series = []
+            for b, c in zip(*np.nonzero(counts)):
+                point = {"period": labels[b]}
+                if index is not None:
+                    point[index.column] = index.values[c - 1] if c > 0 else None
+                point["value"] = int(counts[b, c])
+                series.append(point)
+
+            return {
+                "bucket": bucket,
+                "group_by": index.column if index else None,
+                "series": series,
+                "source": source,
+            }
+
+        except Exception as e:
+            logger.error(f"Error in get_timeseries: {str(e)}")
+            raise
+
+    def get_data_summary(
+        self, filters: Optional[Dict[str, List[str]]] = None, top_k: int = 5
+    ) -> Dict[str, Any]:
+        """Compact statistical summary of the filtered rows
+
+        Row count, top-k responses and products, and the start date span,
+        computed from the value indexes and cached per filter set.
+        """
+        try:
+            cache_key = make_cache_key("summary", canonical_filters(filters), top_k)
+            cached = self._aggregate_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+            filter_dict = {k: v for k, v in (filters or {}).items() if v}
+            mask = None
+            if filter_dict:
+                mask = self.build_filter_mask(filter_dict).to_numpy()
+
+            summary = {
+                "row_count": int(mask.sum()) if mask is not None else self.live_count
+            }
+
+            for name, param_name in self.SUMMARY_FIELDS.items():
+                index = self.field_indexes.get(param_name)
+                if index is None:
+                    summary[name] = []
+                    continue
+                counts = index.counts_for(mask)
+                top = index.by_count(index.value_order, counts)[:top_k]
+                summary[name] = [
+                    {"value": index.values[code], "count": int(counts[code])}
+                    for code in top
+                    if counts[code] > 0
+                ]
+
+            first, last = (None, None)
+            if self.date_index is not None:
+                first, last = self.date_index.span(
+                    mask if mask is not None else self.live
+                )
+            summary["date_span"] = {"from": first, "to": last}
+
+            self._aggregate_cache.set(cache_key, summary)
+            return summary
+
+        except Exception as e:
+            logger.error(f"Error in get_data_summary: {str(e)}")
+            raise
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Publish a shared dataset snapshot")
+    parser.add_argument("csv_path")
+    parser.add_argument("shared_dir")
+    parser.add_argument("--delta-dir", default=None)
+    parser.add_argument("--lock-held", action="store_true")
+    args = parser.parse_args()
+    if args.lock_held:
+        LocalDataService.publish_snapshot(
+            args.csv_path, args.shared_dir, args.delta_dir
+        )
+    else:
+        with SharedDataset(args.shared_dir).lock():
+            LocalDataService.publish_snapshot(
+                args.csv_path, args.shared_dir, args.delta_dir
+            )
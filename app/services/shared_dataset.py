@@ -0,0 +1,137 @@
+# app/services/shared_dataset.py
+import json
+import logging
+import os
+import shutil
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, workers may each publish
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "lock"
+MANIFEST_FILE = "manifest.json"
+
+# Generations kept on disk; older ones are removed once nobody should map them
+KEEP_GENERATIONS = 2
+
+
+class SharedDataset:
+    """Generations of the dataset as memory-mapped ``.npy`` files
+
+    One process builds the arrays and publishes them as a new generation
+    directory; ``CURRENT`` (holding the generation counter) is swapped
+    atomically once the directory is complete, so readers never see a
+    partial generation. Every worker maps the same files read-only, so the
+    pages live once in the page cache (or in RAM when ``directory`` is on
+    tmpfs such as ``/dev/shm``) and each extra worker only adds its own
+    Python objects.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _generation_dir(self, generation: int) -> str:
+        return os.path.join(self.directory, f"gen-{generation:06d}")
+
+    @contextmanager
+    def lock(self):
+        """Exclusive lock so only one worker builds a generation at a time"""
+        with open(os.path.join(self.directory, LOCK_FILE), "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def current(self) -> Optional[int]:
+        """Generation currently published, or None before the first publish"""
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                return int(json.load(f)["generation"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def manifest(self, generation: int) -> Optional[Dict[str, Any]]:
+        try:
+            path = os.path.join(self._generation_dir(generation), MANIFEST_FILE)
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, arrays: Dict[str, np.ndarray], meta: Dict[str, Any]) -> int:
+        """Write ``arrays`` as the next generation and make it current
+
+        Call while holding ``lock()``.
+        """
+        generation = (self.current() or 0) + 1
+        final_dir = self._generation_dir(generation)
+        tmp_dir = f"{final_dir}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        files = {}
+        for i, (name, array) in enumerate(arrays.items()):
+            file_name = f"{i:04d}.npy"
+            np.save(os.path.join(tmp_dir, file_name), np.ascontiguousarray(array))
+            files[name] = {"file": file_name, "size": int(array.size)}
+
+        manifest = {"generation": generation, "arrays": files, "meta": meta}
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f)
+
+        shutil.rmtree(final_dir, ignore_errors=True)
+        os.rename(tmp_dir, final_dir)
+
+        current_tmp = os.path.join(self.directory, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(current_tmp, "w") as f:
+            json.dump({"generation": generation}, f)
+        os.replace(current_tmp, os.path.join(self.directory, CURRENT_FILE))
+
+        logger.info(f"Published shared dataset generation {generation} to {final_dir}")
+        self._cleanup(generation)
+        return generation
+
+    def attach(self, generation: int) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Map every array of ``generation`` read-only; returns arrays and meta"""
+        manifest = self.manifest(generation)
+        if manifest is None:
+            raise FileNotFoundError(
+                f"Shared dataset generation {generation} not found in {self.directory}"
+            )
+
+        directory = self._generation_dir(generation)
+        arrays = {}
+        for name, entry in manifest["arrays"].items():
+            path = os.path.join(directory, entry["file"])
+            # Empty arrays cannot be memory mapped
+            arrays[name] = np.load(path, mmap_mode="r" if entry["size"] else None)
+
+        return arrays, manifest["meta"]
+
+    def _cleanup(self, generation: int):
+        """Remove generations older than the last ``KEEP_GENERATIONS``
+
+        Workers still mapping a removed generation keep reading it until they
+        attach the new one; the files only disappear from the directory.
+        """
+        for name in os.listdir(self.directory):
+            if not name.startswith("gen-") or name.endswith(".tmp"):
+                continue
+            try:
+                number = int(name[len("gen-") :])
+            except ValueError:
+                continue
+            if number <= generation - KEEP_GENERATIONS:
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
@@ -0,0 +1,78 @@
+# app/services/survey_sample.py
+import numpy as np
+from typing import Optional, Tuple
+
+
+class StratifiedSample:
+    """Stratified random sample of row positions for approximate answers
+
+    Rows are drawn independently with probability ``rate`` within every
+    stratum (e.g. the month of the start date); strata too small to expect
+    ``min_expected`` sampled rows are taken whole. Counts are estimated by
+    weighting each sampled row with its stratum's size over its sample size,
+    with a normal-approximation confidence interval from the within-stratum
+    variance. The sample covers the first ``covered`` rows; rows added
+    later are for the caller to count exactly.
+    """
+
+    # Two-sided 95% normal quantile
+    Z = 1.96
+
+    def __init__(
+        self,
+        strata: np.ndarray,
+        rate: float,
+        seed: int = 0,
+        min_expected: int = 10,
+    ):
+        self.covered = len(strata)
+        self.rate = rate
+        self.sizes = np.bincount(strata)
+
+        chosen = np.random.default_rng(seed).random(self.covered) < rate
+        chosen |= (self.sizes * rate < min_expected)[strata]
+        self.rows = np.flatnonzero(chosen)
+        self.strata = strata[self.rows].astype(np.int64)
+        self.taken = np.bincount(self.strata, minlength=len(self.sizes))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def estimate(
+        self,
+        matched: np.ndarray,
+        groups: Optional[np.ndarray] = None,
+        n_groups: int = 1,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Estimated row counts and 95% margins per group
+
+        ``matched`` is a boolean mask over the sampled rows; ``groups``
+        optionally assigns each sampled row a group code (negative to leave
+        it out), otherwise everything is one group.
+        """
+        strata = self.strata[matched]
+        if groups is None:
+            groups = np.zeros(len(strata), dtype=np.int64)
+        else:
+            groups = groups[matched].astype(np.int64)
+            strata = strata[groups >= 0]
+            groups = groups[groups >= 0]
+
+        # Matched rows per (stratum, group) pair that occurs in the sample
+        pairs, counts = np.unique(strata * n_groups + groups, return_counts=True)
+        stratum, group = pairs // n_groups, pairs % n_groups
+        size = self.sizes[stratum].astype(np.float64)
+        taken = self.taken[stratum]
+        share = counts / taken
+
+        estimates = np.bincount(group, size * share, minlength=n_groups)
+        variance = np.bincount(
+            group,
+            size**2
+            * (1 - taken / size)
+            * share
+            * (1 - share)
+            / np.maximum(taken - 1, 1),
+            minlength=n_groups,
+        )
+        return estimates, self.Z * np.sqrt(variance)
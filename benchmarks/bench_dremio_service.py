@@ -0,0 +1,53 @@
+"""
+Benchmarks for DremioService against the fake Dremio server
+
+The fake runs with no queueing delay or page latency, so these numbers are
+the client-side cost of submit/poll/fetch round trips plus SQLite query time.
+Use benchmarks/fake_dremio.py directly to study slower clusters.
+"""
+
+import pytest
+
+from app.models.filter import SurveyFilter
+
+
+@pytest.fixture(autouse=True)
+def reset_stats(fake_dremio):
+    app, _ = fake_dremio
+    app.state.dremio.reset()
+
+
+@pytest.mark.benchmark(group="dremio_get_surveys")
+def test_dremio_get_surveys_unfiltered(benchmark, dremio_service):
+    result = benchmark(dremio_service.get_surveys, SurveyFilter(page=1, size=100))
+    assert len(result["surveys"]) == 100
+
+
+@pytest.mark.benchmark(group="dremio_get_surveys")
+def test_dremio_get_surveys_filtered(benchmark, dremio_service, common_filters):
+    filters = SurveyFilter(**common_filters, page=1, size=100)
+    result = benchmark(dremio_service.get_surveys, filters)
+    assert 0 < result["total"]
+
+
+@pytest.mark.benchmark(group="dremio_page_fanout")
+@pytest.mark.parametrize("rows", [100, 1000])
+def test_dremio_result_paging(benchmark, dremio_service, fake_dremio, rows):
+    app, _ = fake_dremio
+    sql = f"SELECT * FROM {dremio_service.table_path} LIMIT {rows}"
+    result = benchmark(dremio_service.api.execute_query, sql, limit=100)
+    assert len(result) == rows
+
+    stats = app.state.dremio.stats
+    benchmark.extra_info["pages_per_query"] = stats["pages"] / stats["jobs_submitted"]
+
+
+@pytest.mark.benchmark(group="dremio_aggregate")
+def test_dremio_aggregate(benchmark, dremio_service):
+    # Bypass the response cache so every round reaches the server
+    def aggregate():
+        dremio_service._aggregate_cache.clear()
+        return dremio_service.aggregate_surveys({}, ["regions"], "count")
+
+    result = benchmark(aggregate)
+    assert result["rows"]
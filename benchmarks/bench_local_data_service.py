@@ -0,0 +1,139 @@
+"""
+Benchmarks for LocalDataService over synthetic datasets
+
+Run from the repository root:
+    pytest benchmarks                                   # 100k rows
+    pytest benchmarks --bench-sizes=100k,1m,10m         # all sizes
+    pytest benchmarks --benchmark-autosave              # store a new baseline
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:20%
+"""
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.models.filter import SurveyFilter
+
+
+def _encode(payload) -> bytes:
+    """Encode a response body the way FastAPI does for a returned dict"""
+    return JSONResponse(jsonable_encoder(payload)).body
+
+
+@pytest.mark.benchmark(group="get_surveys")
+def test_get_surveys_unfiltered(benchmark, service):
+    result = benchmark(service.get_surveys, SurveyFilter(page=1, size=100))
+    assert result["total"] == service.row_count
+
+
+@pytest.mark.benchmark(group="get_surveys")
+def test_get_surveys_filtered(benchmark, service, common_filters):
+    filters = SurveyFilter(**common_filters, page=1, size=100)
+    result = benchmark(service.get_surveys, filters)
+    assert 0 < result["total"] < service.row_count
+
+
+@pytest.mark.benchmark(group="get_surveys")
+def test_get_surveys_selective(benchmark, service, narrow_filters):
+    filters = SurveyFilter(**narrow_filters, page=1, size=100)
+    result = benchmark(service.get_surveys, filters)
+    assert result["total"] > 0
+
+
+@pytest.mark.benchmark(group="get_surveys")
+def test_get_surveys_deep_page(benchmark, service, common_filters):
+    filters = SurveyFilter(**common_filters, page=1, size=100)
+    total = service.get_surveys(filters)["total"]
+    filters = SurveyFilter(**common_filters, page=max(1, total // 100), size=100)
+    result = benchmark(service.get_surveys, filters)
+    assert result["surveys"]
+
+
+@pytest.mark.benchmark(group="get_surveys")
+def test_get_surveys_approx(benchmark, service, common_filters):
+    filters = SurveyFilter(**common_filters, page=1, size=100, approx=True)
+    result = benchmark(service.get_surveys, filters)
+    assert result["approx"]["low"] <= result["total"] <= result["approx"]["high"]
+
+
+@pytest.mark.benchmark(group="get_progressive_filter_options")
+def test_estimate_filter_options(benchmark, service, common_filters):
+    result = benchmark(
+        service.estimate_filter_options, common_filters, "account_names", 50
+    )
+    assert len(result["options"]["account_names"]) <= 50
+
+
+@pytest.mark.benchmark(group="count_surveys")
+def test_count_surveys_filtered(benchmark, service, common_filters):
+    result = benchmark(service.count_surveys, common_filters)
+    expected = service.get_surveys(SurveyFilter(**common_filters, size=1))["total"]
+    assert result["total"] == expected
+
+
+@pytest.mark.benchmark(group="get_surveys_batch")
+def test_get_surveys_batch(benchmark, service, common_filters):
+    # A dashboard: widgets sharing most of their field selections
+    items = {
+        f"widget-{i}": SurveyFilter(
+            **{
+                field: common_filters[field]
+                for field in list(common_filters)[: i % 3 + 1]
+            },
+            page=i % 2 + 1,
+            size=50,
+        )
+        for i in range(10)
+    }
+    results = benchmark(service.get_surveys_batch, items)
+    assert all(result["status"] == "ok" for result in results.values())
+
+
+@pytest.mark.benchmark(group="get_filter_options")
+def test_get_filter_options_unfiltered(benchmark, service):
+    options = benchmark(service.get_filter_options)
+    assert options.regions
+
+
+@pytest.mark.benchmark(group="get_filter_options")
+def test_get_filter_options_filtered(benchmark, service, common_filters):
+    options = benchmark(service.get_filter_options, common_filters)
+    assert options.regions == common_filters["regions"]
+
+
+@pytest.mark.benchmark(group="get_filter_options")
+def test_get_filter_options_paged(benchmark, service, common_filters):
+    options = benchmark(
+        service.get_filter_options, common_filters, limit=50, sort="frequency"
+    )
+    assert len(options.account_names) <= 50
+
+
+@pytest.mark.benchmark(group="get_progressive_filter_options")
+@pytest.mark.parametrize("target", ["regions", "account_names", "questions"])
+def test_get_progressive_filter_options(benchmark, service, common_filters, target):
+    values = benchmark(service.get_progressive_filter_options, target, common_filters)
+    assert values
+
+
+@pytest.mark.benchmark(group="get_survey_by_id")
+def test_get_survey_by_id(benchmark, service):
+    row = service.row_count // 2
+    survey_id = service.store.take([row])[0]["survey_qstn_resp_id"]
+    survey = benchmark(service.get_survey_by_id, survey_id)
+    assert survey["survey_qstn_resp_id"] == survey_id
+
+
+@pytest.mark.benchmark(group="json_encoding")
+@pytest.mark.parametrize("page_size", [100, 1000])
+def test_encode_surveys_page(benchmark, service, page_size):
+    result = service.get_surveys(SurveyFilter(page=1, size=page_size))
+    body = benchmark(_encode, result)
+    assert body.startswith(b"{")
+
+
+@pytest.mark.benchmark(group="json_encoding")
+def test_encode_filter_options(benchmark, service):
+    options = service.get_filter_options()
+    body = benchmark(_encode, options)
+    assert body.startswith(b"{")
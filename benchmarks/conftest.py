@@ -0,0 +1,123 @@
+import logging
+import os
+from typing import Dict, List
+
+import pytest
+
+from app.services.local_data_service import LocalDataService
+from benchmarks.synthetic_data import DEFAULT_DIR, ensure_snapshot, parse_rows
+
+# Service construction logs every filter it evaluates; keep benchmark output readable
+logging.getLogger("app").setLevel(logging.WARNING)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-sizes",
+        default=os.getenv("GFMI_BENCH_SIZES", "100k"),
+        help="Comma separated dataset sizes to benchmark (100k, 1m, 10m)",
+    )
+    parser.addoption(
+        "--bench-seed",
+        type=int,
+        default=int(os.getenv("GFMI_BENCH_SEED", "42")),
+        help="Seed of the synthetic datasets",
+    )
+    parser.addoption(
+        "--bench-data-dir",
+        default=os.getenv("GFMI_BENCH_DATA_DIR", DEFAULT_DIR),
+        help="Directory holding the synthetic dataset snapshots",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "size" in metafunc.fixturenames:
+        sizes = [
+            s.strip() for s in metafunc.config.getoption("--bench-sizes").split(",")
+        ]
+        metafunc.parametrize("size", [s for s in sizes if s], scope="session")
+
+
+_services: Dict[str, LocalDataService] = {}
+
+
+@pytest.fixture(scope="session")
+def service(request, size) -> LocalDataService:
+    """LocalDataService over the synthetic snapshot for ``size``, loaded once"""
+    if size not in _services:
+        # Keep a single large dataset in memory at a time
+        _services.clear()
+        path = ensure_snapshot(
+            parse_rows(size),
+            seed=request.config.getoption("--bench-seed"),
+            directory=request.config.getoption("--bench-data-dir"),
+        )
+        _services[size] = LocalDataService(csv_path=path)
+    return _services[size]
+
+
+def _top_values(service: LocalDataService, field: str, n: int) -> List[str]:
+    index = service.field_indexes[field]
+    return [index.values[code] for code in index.by_frequency[:n]]
+
+
+@pytest.fixture(scope="session")
+def common_filters(service) -> Dict[str, List[str]]:
+    """A typical dashboard selection: one region, a few tumor types and products"""
+    return {
+        "regions": _top_values(service, "regions", 1),
+        "tumor_types": _top_values(service, "tumor_types", 3),
+        "products": _top_values(service, "products", 2),
+    }
+
+
+@pytest.fixture(scope="session")
+def narrow_filters(service) -> Dict[str, List[str]]:
+    """A selective query: a single account"""
+    return {"account_names": _top_values(service, "account_names", 1)}
+
+
+@pytest.fixture(scope="session")
+def fake_dremio(request, size):
+    """Fake Dremio server over the synthetic snapshot, running in a background thread"""
+    import socket
+    import threading
+    import time
+
+    import uvicorn
+
+    from benchmarks.fake_dremio import FakeDremioConfig, build_database, create_app
+
+    path = ensure_snapshot(
+        parse_rows(size),
+        seed=request.config.getoption("--bench-seed"),
+        directory=request.config.getoption("--bench-data-dir"),
+    )
+    app = create_app(FakeDremioConfig(db_path=build_database(path)))
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    yield app, f"http://127.0.0.1:{port}"
+
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture(scope="session")
+def dremio_service(fake_dremio):
+    """DremioService talking to the fake server"""
+    from app.services.dremio_service import DremioAPI, DremioService
+
+    _, url = fake_dremio
+    service = DremioService()
+    service.api = DremioAPI(server=url, token="benchmark")
+    return service
@@ -0,0 +1,346 @@
+"""
+Fake Dremio REST server for offline benchmarking
+Serves /api/v3/sql, /api/v3/job/{id} and /api/v3/job/{id}/results from SQLite
+
+Usage:
+    python -m benchmarks.fake_dremio --rows 100k --port 9047
+    python -m benchmarks.fake_dremio --db gfmi_local.db --queue-delay 1.5 \\
+        --page-latency 0.05 --job-failure-rate 0.05
+
+Point the API at it with DREMIO_SERVER=http://localhost:9047 and
+USE_LOCAL_DATA=false. GET /_fake/stats reports submitted jobs, polls, result
+pages and injected failures, which is how polling behavior and page fan-out
+are measured.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
+
+TABLE_NAME = "survey_responses"
+
+# Dremio rejects result pages larger than this
+MAX_PAGE_SIZE = 500
+
+# FROM "Space"."Folder".table (any dotted path) -> FROM survey_responses
+_TABLE_PATH = re.compile(r'\bFROM\s+(?:"[^"]+"|\w+)(?:\s*\.\s*(?:"[^"]+"|\w+))+', re.I)
+_CAST_DATE = re.compile(r'CAST\(\s*("[^"]+"|\w+)\s+AS\s+DATE\s*\)', re.I)
+_DATE_LITERAL = re.compile(r"\bDATE\s+'(\d{4}-\d{2}-\d{2})'", re.I)
+
+
+def translate_sql(sql: str, table: str = TABLE_NAME) -> str:
+    """Rewrite the Dremio SQL issued by DremioService into SQLite SQL"""
+    sql = _TABLE_PATH.sub(f'FROM "{table}"', sql)
+    sql = _CAST_DATE.sub(r"DATE(\1)", sql)
+    return _DATE_LITERAL.sub(r"'\1'", sql)
+
+
+def _date_trunc(unit: str, value: Optional[str]) -> Optional[str]:
+    if value is None:
+        return None
+    day = date.fromisoformat(str(value)[:10])
+    unit = unit.lower()
+    if unit == "month":
+        day = day.replace(day=1)
+    elif unit == "week":
+        day = day - timedelta(days=day.weekday())
+    elif unit == "year":
+        day = day.replace(month=1, day=1)
+    return f"{day.isoformat()} 00:00:00.000"
+
+
+def build_database(csv_path: str, db_path: Optional[str] = None) -> str:
+    """Import a survey CSV into SQLite next to it, once"""
+    db_path = db_path or os.path.splitext(csv_path)[0] + ".sqlite"
+    if os.path.exists(db_path) and os.path.getmtime(db_path) >= os.path.getmtime(
+        csv_path
+    ):
+        return db_path
+
+    print(f"Importing {csv_path} -> {db_path}")
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    with sqlite3.connect(tmp_path) as conn:
+        for chunk in pd.read_csv(csv_path, chunksize=200_000, dtype=str):
+            chunk.to_sql(TABLE_NAME, conn, if_exists="append", index=False)
+    os.replace(tmp_path, db_path)
+    return db_path
+
+
+class FakeDremioConfig:
+    """Latency and failure knobs; every delay is in seconds"""
+
+    def __init__(
+        self,
+        db_path: str,
+        queue_delay: float = 0.0,
+        run_time_factor: float = 1.0,
+        page_latency: float = 0.0,
+        submit_failure_rate: float = 0.0,
+        job_failure_rate: float = 0.0,
+        page_failure_rate: float = 0.0,
+        token: Optional[str] = None,
+        seed: int = 0,
+    ):
+        self.db_path = db_path
+        # Time a job stays ENQUEUED before it starts running
+        self.queue_delay = queue_delay
+        # Job stays RUNNING for this multiple of the real SQLite query time
+        self.run_time_factor = run_time_factor
+        # Added to every /results page
+        self.page_latency = page_latency
+        # Probabilities of a 503 on submit, a FAILED job and a 500 on a page
+        self.submit_failure_rate = submit_failure_rate
+        self.job_failure_rate = job_failure_rate
+        self.page_failure_rate = page_failure_rate
+        # When set, requests must carry "Authorization: Bearer <token>"
+        self.token = token
+        self.seed = seed
+
+
+class FakeJob:
+    def __init__(self, sql: str, submitted_at: float):
+        self.id = str(uuid.uuid4())
+        self.sql = sql
+        self.submitted_at = submitted_at
+        self.state = "ENQUEUED"
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.rows: List[Dict[str, Any]] = []
+        self.columns: List[str] = []
+        self.error: Optional[str] = None
+        self.polls = 0
+        self.pages = 0
+
+
+class FakeDremio:
+    """Job store and query engine behind the fake REST API"""
+
+    def __init__(self, config: FakeDremioConfig):
+        self.config = config
+        self.jobs: Dict[str, FakeJob] = {}
+        self._random = random.Random(config.seed)
+        if not os.path.exists(config.db_path):
+            raise FileNotFoundError(f"SQLite database not found: {config.db_path}")
+        self._conn = sqlite3.connect(config.db_path, check_same_thread=False)
+        self._conn.create_function("DATE_TRUNC", 2, _date_trunc, deterministic=True)
+        self._lock = threading.Lock()
+        self.stats = {
+            "jobs_submitted": 0,
+            "jobs_completed": 0,
+            "jobs_failed": 0,
+            "polls": 0,
+            "pages": 0,
+            "rows_returned": 0,
+            "submit_failures": 0,
+            "page_failures": 0,
+        }
+
+    def reset(self):
+        self.jobs.clear()
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def _should_fail(self, rate: float) -> bool:
+        return rate > 0 and self._random.random() < rate
+
+    def submit(self, sql: str) -> FakeJob:
+        if self._should_fail(self.config.submit_failure_rate):
+            self.stats["submit_failures"] += 1
+            raise HTTPException(status_code=503, detail="Injected submit failure")
+        job = FakeJob(sql, time.monotonic())
+        self.jobs[job.id] = job
+        self.stats["jobs_submitted"] += 1
+        return job
+
+    def _execute(self, job: FakeJob):
+        started = time.perf_counter()
+        try:
+            with self._lock:
+                cursor = self._conn.execute(translate_sql(job.sql))
+                job.columns = [d[0] for d in cursor.description or []]
+                job.rows = [dict(zip(job.columns, row)) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            job.error = f"Query failed: {e}"
+        elapsed = time.perf_counter() - started
+        job.ready_at = time.monotonic() + elapsed * max(
+            self.config.run_time_factor - 1, 0
+        )
+
+    async def poll(self, job: FakeJob) -> FakeJob:
+        job.polls += 1
+        self.stats["polls"] += 1
+        now = time.monotonic()
+
+        if (
+            job.state == "ENQUEUED"
+            and now - job.submitted_at >= self.config.queue_delay
+        ):
+            job.state = "RUNNING"
+            job.started_at = now
+            await run_in_threadpool(self._execute, job)
+
+        # ready_at stays unset while another poll is still executing the query
+        if (
+            job.state == "RUNNING"
+            and job.ready_at is not None
+            and time.monotonic() >= job.ready_at
+        ):
+            if job.error is None and self._should_fail(self.config.job_failure_rate):
+                job.error = "Injected job failure"
+            job.state = "FAILED" if job.error else "COMPLETED"
+            self.stats["jobs_failed" if job.error else "jobs_completed"] += 1
+        return job
+
+    async def results(self, job: FakeJob, offset: int, limit: int) -> Dict[str, Any]:
+        if job.state != "COMPLETED":
+            raise HTTPException(
+                status_code=400, detail=f"Job {job.id} is {job.state}, not COMPLETED"
+            )
+        if limit > MAX_PAGE_SIZE:
+            raise HTTPException(
+                status_code=400, detail=f"limit must not exceed {MAX_PAGE_SIZE}"
+            )
+        if self.config.page_latency:
+            await asyncio.sleep(self.config.page_latency)
+        if self._should_fail(self.config.page_failure_rate):
+            self.stats["page_failures"] += 1
+            raise HTTPException(status_code=500, detail="Injected page failure")
+
+        rows = job.rows[offset : offset + limit]
+        job.pages += 1
+        self.stats["pages"] += 1
+        self.stats["rows_returned"] += len(rows)
+        return {
+            "rowCount": len(job.rows),
+            "schema": [{"name": column} for column in job.columns],
+            "rows": rows,
+        }
+
+
+def create_app(config: FakeDremioConfig) -> FastAPI:
+    dremio = FakeDremio(config)
+    app = FastAPI(title="Fake Dremio")
+    app.state.dremio = dremio
+
+    def check_auth(request: Request):
+        if config.token and request.headers.get("authorization") != (
+            f"Bearer {config.token}"
+        ):
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+    def get_job(job_id: str) -> FakeJob:
+        job = dremio.jobs.get(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+        return job
+
+    @app.post("/api/v3/sql")
+    async def submit_sql(request: Request):
+        check_auth(request)
+        body = await request.json()
+        if not body or not body.get("sql"):
+            raise HTTPException(status_code=400, detail="Missing sql")
+        return {"id": dremio.submit(body["sql"]).id}
+
+    # DremioService polls "job/{id}/"; serve both forms instead of redirecting
+    @app.get("/api/v3/job/{job_id}")
+    @app.get("/api/v3/job/{job_id}/", include_in_schema=False)
+    async def job_status(job_id: str, request: Request):
+        check_auth(request)
+        job = await dremio.poll(get_job(job_id))
+        status = {"jobState": job.state, "queryType": "REST"}
+        if job.state == "COMPLETED":
+            status["rowCount"] = len(job.rows)
+        if job.state == "FAILED":
+            status["errorMessage"] = job.error
+        return status
+
+    @app.get("/api/v3/job/{job_id}/results")
+    async def job_results(
+        job_id: str, request: Request, offset: int = 0, limit: int = 100
+    ):
+        check_auth(request)
+        return await dremio.results(get_job(job_id), offset, limit)
+
+    @app.get("/_fake/stats")
+    async def stats():
+        jobs = list(dremio.jobs.values())
+        return {
+            **dremio.stats,
+            "mean_polls_per_job": (
+                sum(job.polls for job in jobs) / len(jobs) if jobs else 0
+            ),
+            "mean_pages_per_job": (
+                sum(job.pages for job in jobs) / len(jobs) if jobs else 0
+            ),
+        }
+
+    @app.post("/_fake/reset")
+    async def reset():
+        dremio.reset()
+        return {"status": "reset"}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake Dremio REST server")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--db", help="Existing SQLite database (survey_responses)")
+    source.add_argument("--csv", help="Survey CSV to import into SQLite")
+    source.add_argument("--rows", help="Synthetic snapshot size (100k, 1m, 10m)")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9047)
+    parser.add_argument("--queue-delay", type=float, default=0.0)
+    parser.add_argument("--run-time-factor", type=float, default=1.0)
+    parser.add_argument("--page-latency", type=float, default=0.0)
+    parser.add_argument("--submit-failure-rate", type=float, default=0.0)
+    parser.add_argument("--job-failure-rate", type=float, default=0.0)
+    parser.add_argument("--page-failure-rate", type=float, default=0.0)
+    parser.add_argument("--token", default=None)
+    args = parser.parse_args()
+
+    if args.db:
+        db_path = args.db
+    else:
+        csv_path = args.csv
+        if args.rows:
+            from benchmarks.synthetic_data import ensure_snapshot, parse_rows
+
+            csv_path = ensure_snapshot(parse_rows(args.rows), seed=args.seed)
+        db_path = build_database(csv_path)
+
+    config = FakeDremioConfig(
+        db_path=db_path,
+        queue_delay=args.queue_delay,
+        run_time_factor=args.run_time_factor,
+        page_latency=args.page_latency,
+        submit_failure_rate=args.submit_failure_rate,
+        job_failure_rate=args.job_failure_rate,
+        page_failure_rate=args.page_failure_rate,
+        token=args.token,
+        seed=args.seed,
+    )
+
+    import uvicorn
+
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
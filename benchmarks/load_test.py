@@ -0,0 +1,346 @@
+"""
+Concurrent HTTP load generator for GFMI Insight Buddy
+Replays a realistic traffic mix against a running API and reports JSON
+
+Usage:
+    python -m benchmarks.load_test --base-url http://localhost:8000 \\
+        --concurrency 32 --duration 60 --output load_report.json
+    python -m benchmarks.load_test --mix options=1,progressive=4,scroll=4,detail=3,export=0.2 \\
+        --max-error-rate 0.01 --max-p95-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+API = "/api/v1"
+
+DEFAULT_MIX = {
+    "options": 1.0,
+    "progressive": 4.0,
+    "scroll": 4.0,
+    "detail": 3.0,
+    "export": 0.2,
+}
+
+# Option lists the simulated users pick filter values from
+FILTER_OPTION_FIELDS = {
+    "regions": "regions",
+    "country_geo_ids": "country_geo_ids",
+    "tumor_types": "responses",
+    "products": "products",
+    "survey_names": "survey_names",
+    "titles": "titles",
+    "account_names": "account_names",
+}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(
+        0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values))) - 1)
+    )
+    return sorted_values[rank]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.status_codes: Dict[str, int] = {}
+        self.errors = 0
+
+    def record(self, latency_ms: float, status: str, error: bool):
+        self.latencies_ms.append(latency_ms)
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        if error:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        count = len(latencies)
+        return {
+            "count": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "status_codes": dict(sorted(self.status_codes.items())),
+            "latency_ms": {
+                "min": round(latencies[0], 2) if latencies else 0.0,
+                "mean": round(sum(latencies) / count, 2) if count else 0.0,
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+        }
+
+
+class LoadTest:
+    """Virtual users running weighted scenarios until the duration is up"""
+
+    def __init__(
+        self,
+        base_url: str,
+        concurrency: int = 16,
+        duration: float = 30.0,
+        mix: Optional[Dict[str, float]] = None,
+        page_size: int = 50,
+        timeout: float = 30.0,
+        seed: int = 0,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mix = mix or dict(DEFAULT_MIX)
+        self.page_size = page_size
+        self.timeout = timeout
+        self.seed = seed
+
+        self.routes: Dict[str, RouteStats] = {}
+        self.scenarios: Dict[str, int] = {}
+        self.filter_values: Dict[str, List[str]] = {}
+        self.survey_ids: List[str] = []
+
+        unknown = set(self.mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+
+    async def _request(
+        self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs
+    ) -> Optional[httpx.Response]:
+        """Send one request and record it under ``route`` (a path template)"""
+        stats = self.routes.setdefault(f"{method} {route}", RouteStats())
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            stats.record((time.perf_counter() - started) * 1000, type(e).__name__, True)
+            return None
+        stats.record(
+            (time.perf_counter() - started) * 1000,
+            str(response.status_code),
+            response.status_code >= 400,
+        )
+        return response
+
+    async def discover(self, client: httpx.AsyncClient):
+        """Learn real filter values and survey IDs to build requests from"""
+        response = await client.get(
+            f"{API}/filters/options", params={"limit": 50, "sort": "frequency"}
+        )
+        response.raise_for_status()
+        options = response.json()
+        for field, option_field in FILTER_OPTION_FIELDS.items():
+            values = [str(v).split("|")[0] for v in options.get(option_field) or []]
+            if values:
+                self.filter_values[field] = values
+
+        response = await client.get(f"{API}/surveys/", params={"size": 200})
+        response.raise_for_status()
+        self.survey_ids = [
+            s["survey_qstn_resp_id"]
+            for s in response.json().get("surveys", [])
+            if s.get("survey_qstn_resp_id")
+        ]
+
+    def _random_filters(self, rng: random.Random, fields: int) -> Dict[str, List[str]]:
+        available = list(self.filter_values)
+        chosen = rng.sample(available, min(fields, len(available)))
+        return {field: [rng.choice(self.filter_values[field])] for field in chosen}
+
+    # Scenarios -----------------------------------------------------------
+
+    async def scenario_options(self, client, rng):
+        """Initial dashboard load: every option list"""
+        await self._request(
+            client, f"{API}/filters/options", "GET", f"{API}/filters/options"
+        )
+
+    async def scenario_progressive(self, client, rng):
+        """A user narrowing down: each click refreshes the options and first page"""
+        applied: Dict[str, List[str]] = {}
+        for _ in range(rng.randint(2, 4)):
+            applied.update(self._random_filters(rng, 1))
+            await self._request(
+                client,
+                f"{API}/filters/progressive",
+                "POST",
+                f"{API}/filters/progressive",
+                json={"applied_filters": applied},
+            )
+            await self._request(
+                client,
+                f"{API}/surveys/",
+                "GET",
+                f"{API}/surveys/",
+                params={**applied, "page": 1, "size": self.page_size},
+            )
+
+    async def scenario_scroll(self, client, rng):
+        """Scrolling through a filtered result list page by page"""
+        filters = self._random_filters(rng, rng.randint(0, 2))
+        for page in range(1, rng.randint(3, 8) + 1):
+            response = await self._request(
+                client,
+                f"{API}/surveys/",
+                "GET",
+                f"{API}/surveys/",
+                params={**filters, "page": page, "size": self.page_size},
+            )
+            if response is None or response.status_code != 200:
+                break
+            if page >= response.json().get("total_pages", 0):
+                break
+
+    async def scenario_detail(self, client, rng):
+        """Opening a single survey response"""
+        if not self.survey_ids:
+            return
+        survey_id = rng.choice(self.survey_ids)
+        await self._request(
+            client, f"{API}/surveys/{{survey_id}}", "GET", f"{API}/surveys/{survey_id}"
+        )
+
+    async def scenario_export(self, client, rng):
+        """Export of a filtered selection, fetched in the largest pages allowed"""
+        filters = self._random_filters(rng, 1)
+        for page in range(1, 6):
+            response = await self._request(
+                client,
+                f"{API}/surveys/",
+                "GET",
+                f"{API}/surveys/",
+                params={**filters, "page": page, "size": 1000},
+            )
+            if response is None or response.status_code != 200:
+                break
+            if page >= response.json().get("total_pages", 0):
+                break
+
+    # Runner --------------------------------------------------------------
+
+    async def _user(self, client: httpx.AsyncClient, user: int, deadline: float):
+        rng = random.Random(self.seed * 100_003 + user)
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            self.scenarios[name] = self.scenarios.get(name, 0) + 1
+            await getattr(self, f"scenario_{name}")(client, rng)
+
+    async def run(self) -> Dict[str, Any]:
+        limits = httpx.Limits(
+            max_connections=self.concurrency, max_keepalive_connections=self.concurrency
+        )
+        async with httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout, limits=limits
+        ) as client:
+            await self.discover(client)
+
+            started = time.monotonic()
+            deadline = started + self.duration
+            await asyncio.gather(
+                *(
+                    self._user(client, user, deadline)
+                    for user in range(self.concurrency)
+                )
+            )
+            elapsed = time.monotonic() - started
+
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        total = sum(len(stats.latencies_ms) for stats in self.routes.values())
+        errors = sum(stats.errors for stats in self.routes.values())
+        all_latencies = sorted(
+            latency for stats in self.routes.values() for latency in stats.latencies_ms
+        )
+        return {
+            "config": {
+                "base_url": self.base_url,
+                "concurrency": self.concurrency,
+                "duration_s": self.duration,
+                "mix": self.mix,
+                "page_size": self.page_size,
+                "seed": self.seed,
+            },
+            "elapsed_s": round(elapsed, 2),
+            "requests": total,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(all_latencies, 50), 2),
+                "p95": round(percentile(all_latencies, 95), 2),
+                "p99": round(percentile(all_latencies, 99), 2),
+            },
+            "scenarios": dict(sorted(self.scenarios.items())),
+            "routes": {
+                route: stats.summary(elapsed)
+                for route, stats in sorted(self.routes.items())
+            },
+        }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse ``options=1,progressive=4`` into scenario weights"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running GFMI API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="Scenario weights")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--max-error-rate", type=float, default=None)
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    load_test = LoadTest(
+        base_url=args.base_url,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        mix=args.mix,
+        page_size=args.page_size,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+    report = asyncio.run(load_test.run())
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    # Non-zero exit when a threshold is exceeded, so CI can gate on it
+    failures = []
+    if args.max_error_rate is not None and report["error_rate"] > args.max_error_rate:
+        failures.append(f"error rate {report['error_rate']} > {args.max_error_rate}")
+    if args.max_p95_ms is not None and report["latency_ms"]["p95"] > args.max_p95_ms:
+        failures.append(f"p95 {report['latency_ms']['p95']}ms > {args.max_p95_ms}ms")
+    if failures:
+        print("Load test thresholds exceeded: " + "; ".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,705 @@
+"""
+Synthetic survey data generator for GFMI Insight Buddy
+Writes seeded, reproducible survey CSVs with realistic cardinalities
+
+Usage:
+    python -m benchmarks.synthetic_data --rows 100k --seed 42
+    python -m benchmarks.synthetic_data --rows 1m --rows 10m --out data/synthetic
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever the generated data changes so stale snapshots are rebuilt
+GENERATOR_VERSION = 1
+
+SIZES = {"100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Rows are generated and written in chunks to keep memory flat at 10M rows
+CHUNK_ROWS = 500_000
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Anchored to the repository root so snapshots land in one place whatever
+# directory the generator or the benchmarks are run from
+DEFAULT_DIR = os.path.join(PROJECT_ROOT, "data", "synthetic")
+
+# Same column order as the CRM export, plus the HCP columns the API filters on
+COLUMNS = [
+    "survey_qstn_resp_id",
+    "survey_qstn_resp_key",
+    "survey_key",
+    "msl_key",
+    "src_cd",
+    "account_key",
+    "prod_key",
+    "survey_name",
+    "assignment_type",
+    "channels",
+    "expired",
+    "language",
+    "product",
+    "region",
+    "segment",
+    "start_date",
+    "end_date",
+    "status",
+    "target_type",
+    "territory",
+    "answer_choice",
+    "question",
+    "survey",
+    "decimal",
+    "number",
+    "type",
+    "response",
+    "account_name",
+    "msl_id",
+    "country_geo_id",
+    "msl_name",
+    "src_cd_1",
+    "is_active",
+    "useremail",
+    "usertype",
+    "department",
+    "product_expertise",
+    "user_type",
+    "title",
+    "company",
+    "name",
+    "specialty",
+    "practice_setting",
+]
+
+# Columns behind LocalDataService.FILTER_FIELD_MAPPING
+FILTER_COLUMNS = [
+    "msl_name",
+    "title",
+    "department",
+    "user_type",
+    "region",
+    "country_geo_id",
+    "territory",
+    "response",
+    "survey_name",
+    "question",
+    "account_name",
+    "product",
+    "product_expertise",
+    "channels",
+    "assignment_type",
+    "specialty",
+    "practice_setting",
+    "company",
+]
+
+# Distinct values per dimension, in line with a production CRM extract
+N_MSLS = 450
+N_TERRITORIES = 600
+N_SURVEYS = 30
+N_ACCOUNTS = 40_000
+N_INSTITUTIONS = 3_000
+
+REGIONS = {
+    "EU": (
+        "CRM-EUR",
+        [
+            "GB",
+            "DE",
+            "FR",
+            "IT",
+            "ES",
+            "NL",
+            "BE",
+            "CH",
+            "AT",
+            "SE",
+            "NO",
+            "DK",
+            "FI",
+            "IE",
+            "PT",
+            "PL",
+            "CZ",
+            "GR",
+            "HU",
+            "RO",
+        ],
+    ),
+    # Not "NA": pandas reads that back as a missing value
+    "NAM": ("CRM-NAM", ["US", "CA"]),
+    "APAC": (
+        "CRM-APAC",
+        ["JP", "CN", "KR", "AU", "NZ", "SG", "TW", "HK", "IN", "TH", "MY"],
+    ),
+    "LATAM": ("CRM-LATAM", ["BR", "MX", "AR", "CO", "CL", "PE"]),
+    "MEA": ("CRM-MEA", ["AE", "SA", "IL", "ZA", "EG", "TR"]),
+}
+TITLES = [
+    "Medical Science Liaison",
+    "Senior Medical Science Liaison",
+    "Principal Medical Science Liaison",
+    "Field Medical Director",
+    "Dir Medical Affairs",
+    "Sr Dir Medical Affairs",
+    "Medical Advisor",
+    "Regional Medical Lead",
+    "Medical Manager",
+    "Associate Medical Director",
+    "Executive Director Medical Affairs",
+    "Field Medical Lead",
+]
+DEPARTMENTS = [
+    "Medical Affairs",
+    "Field Medical",
+    "Oncology Medical",
+    "Hematology Medical",
+    "Medical Excellence",
+    "Medical Information",
+    "Global Medical",
+    "HEOR",
+]
+USER_TYPES = ["Medical_vod", "Manager_vod", "Admin_vod", "Commercial_vod"]
+PRODUCTS = [
+    "Libtayo",
+    "Dupixent",
+    "Eylea",
+    "Praluent",
+    "Kevzara",
+    "Evkeeza",
+    "Odronextamab",
+    "Linvoseltamab",
+    "Fianlimab",
+    "Itepekimab",
+    "Pozelimab",
+    "Garetosmab",
+    "Mibavademab",
+    "Cemdisiran",
+    "Trevogrumab",
+]
+TUMOR_TYPES = [
+    "NSCLC",
+    "SCLC",
+    "Cutaneous SCC",
+    "Basal Cell Carcinoma",
+    "Melanoma",
+    "Cervical Cancer",
+    "Multiple Myeloma",
+    "Follicular Lymphoma",
+    "DLBCL",
+    "Mantle Cell Lymphoma",
+    "Marginal Zone Lymphoma",
+    "CLL",
+    "AML",
+    "MDS",
+    "Breast Cancer",
+    "Prostate Cancer",
+    "Colorectal Cancer",
+    "Gastric Cancer",
+    "Hepatocellular Carcinoma",
+    "Pancreatic Cancer",
+    "Ovarian Cancer",
+    "Endometrial Cancer",
+    "Head and Neck SCC",
+    "Renal Cell Carcinoma",
+    "Urothelial Carcinoma",
+    "Glioblastoma",
+    "Sarcoma",
+    "Mesothelioma",
+    "Thyroid Cancer",
+    "Merkel Cell Carcinoma",
+    "Hodgkin Lymphoma",
+    "Waldenstrom Macroglobulinemia",
+    "Other",
+    "Not Applicable",
+]
+CHANNELS = ["CRM_vod", "Email_vod", "Web_vod", "Event_vod", "Phone_vod", "Video_vod"]
+ASSIGNMENT_TYPES = ["Territory_vod", "Account_vod", "Location_vod", "Manual_vod"]
+SPECIALTIES = [
+    "Medical Oncology",
+    "Hematology",
+    "Hematology/Oncology",
+    "Radiation Oncology",
+    "Dermatology",
+    "Surgical Oncology",
+    "Thoracic Surgery",
+    "Pulmonology",
+    "Gynecologic Oncology",
+    "Urology",
+    "Pathology",
+    "Pharmacy",
+    "Nurse Practitioner",
+    "Internal Medicine",
+    "Neuro-Oncology",
+    "Pediatric Oncology",
+    "Head and Neck Surgery",
+    "Gastroenterology",
+    "Allergy/Immunology",
+    "Ophthalmology",
+]
+PRACTICE_SETTINGS = [
+    "Academic Medical Center",
+    "Community Hospital",
+    "Private Practice",
+    "Cancer Center",
+    "Integrated Delivery Network",
+    "Government/VA",
+    "Group Practice",
+    "Clinic",
+]
+COMPANIES = [
+    "Regeneron",
+    "Regeneron Ireland",
+    "Regeneron UK",
+    "Regeneron Japan",
+    "Sanofi Alliance",
+    "Contract Field Team",
+]
+SURVEY_TOPICS = [
+    "Oncology Organic Insights",
+    "Hematology Insights",
+    "Congress Debrief",
+    "Advisory Board Feedback",
+    "Treatment Landscape",
+    "Unmet Need Assessment",
+    "Biomarker Testing",
+    "Sequencing Practices",
+    "Safety Perceptions",
+    "Guideline Adoption",
+]
+
+FIRST_NAMES = [
+    "Anna",
+    "Ben",
+    "Carl",
+    "Diana",
+    "Elena",
+    "Felix",
+    "Grace",
+    "Hugo",
+    "Iris",
+    "Jonas",
+    "Kate",
+    "Luca",
+    "Maria",
+    "Nina",
+    "Oscar",
+    "Paula",
+    "Quentin",
+    "Rosa",
+    "Sam",
+    "Tara",
+    "Ugo",
+    "Vera",
+    "Will",
+    "Yara",
+    "Zoe",
+    "Akira",
+    "Mei",
+    "Raj",
+    "Sofia",
+    "Tomas",
+]
+LAST_NAMES = [
+    "Andersen",
+    "Becker",
+    "Costa",
+    "de Luca",
+    "Evans",
+    "Fischer",
+    "Garcia",
+    "Hansen",
+    "Ito",
+    "Jensen",
+    "Kowalski",
+    "Lambert",
+    "Moreau",
+    "Nakamura",
+    "O'Brien",
+    "Petrov",
+    "Quinn",
+    "Rossi",
+    "Schmidt",
+    "Tanaka",
+    "Ueda",
+    "Vidal",
+    "Weber",
+    "Xu",
+    "Yilmaz",
+    "Zimmermann",
+    "Kim",
+    "Singh",
+    "Silva",
+    "Novak",
+]
+
+
+def parse_rows(value) -> int:
+    """Row count from an int or a size label such as ``100k`` or ``1m``"""
+    if isinstance(value, int):
+        return value
+    label = str(value).lower().replace("_", "")
+    if label in SIZES:
+        return SIZES[label]
+    if label[-1:] in ("k", "m"):
+        return int(float(label[:-1]) * (1_000 if label[-1] == "k" else 1_000_000))
+    return int(label)
+
+
+def size_label(rows: int) -> str:
+    for label, count in SIZES.items():
+        if count == rows:
+            return label
+    return str(rows)
+
+
+def _zipf_weights(n: int, s: float) -> np.ndarray:
+    """Long-tailed weights: a few values are very common, most are rare"""
+    weights = 1.0 / np.arange(1, n + 1) ** s
+    return weights / weights.sum()
+
+
+def _unique_names(rng: np.random.Generator, n: int, fmt: str) -> List[str]:
+    """``n`` distinct person names, suffixed with a number once combinations run out"""
+    first = rng.choice(FIRST_NAMES, n)
+    last = rng.choice(LAST_NAMES, n)
+    seen: Dict[str, int] = {}
+    names = []
+    for f, l in zip(first, last):
+        name = fmt.format(first=f, last=l)
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name} {count + 1}")
+    return names
+
+
+def _sfdc_ids(rng: np.random.Generator, prefix: str, n: int) -> List[str]:
+    """Salesforce-style 18 character record IDs"""
+    alphabet = np.array(
+        list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+    )
+    chars = alphabet[rng.integers(0, len(alphabet), size=(n, 18 - len(prefix)))]
+    return [prefix + "".join(row) for row in chars]
+
+
+class SurveyDimensions:
+    """Lookup tables rows are sampled from
+
+    Attributes that belong together (an MSL's title and territory, a
+    territory's country and region, a survey's questions) are drawn once
+    here so the generated rows stay consistent with each other.
+    """
+
+    def __init__(self, seed: int):
+        rng = np.random.default_rng(seed)
+
+        # Geography: countries belong to a region, territories to a country
+        self.countries, country_regions = [], []
+        for region, (_, codes) in REGIONS.items():
+            for code in codes:
+                self.countries.append(f"{code}-{region}")
+                country_regions.append(region)
+        self.regions = list(REGIONS)
+        self.src_cds = [REGIONS[r][0] for r in self.regions]
+        self.country_region = np.array(
+            [self.regions.index(r) for r in country_regions], dtype=np.int32
+        )
+        self.territory_country = rng.choice(
+            len(self.countries),
+            N_TERRITORIES,
+            p=_zipf_weights(len(self.countries), 0.7),
+        )
+        self.territories = [
+            f"{self.countries[c].split('-')[0]}-T{i:03d}"
+            for i, c in enumerate(self.territory_country)
+        ]
+
+        # MSLs: each covers one territory and has a fixed profile
+        self.msl_names = _unique_names(rng, N_MSLS, "{first} {last}")
+        self.msl_emails = [
+            name.lower().replace(" ", ".").replace("'", "") + "@regeneron.com"
+            for name in self.msl_names
+        ]
+        self.msl_keys = _sfdc_ids(rng, "005", N_MSLS)
+        self.msl_territory = rng.integers(0, N_TERRITORIES, N_MSLS)
+        self.msl_region = self.country_region[
+            self.territory_country[self.msl_territory]
+        ]
+        # CRM logins look like "carl.deluca@regeneron.com.mcrmeu"
+        self.msl_logins = [
+            f"{email}.mcrm{self.regions[region].lower()}"
+            for email, region in zip(self.msl_emails, self.msl_region)
+        ]
+        self.msl_title = rng.choice(
+            len(TITLES), N_MSLS, p=_zipf_weights(len(TITLES), 1.0)
+        )
+        self.msl_department = rng.choice(
+            len(DEPARTMENTS), N_MSLS, p=_zipf_weights(len(DEPARTMENTS), 1.2)
+        )
+        self.msl_user_type = rng.choice(
+            len(USER_TYPES), N_MSLS, p=[0.85, 0.1, 0.03, 0.02]
+        )
+        self.msl_expertise = rng.choice(
+            len(PRODUCTS), N_MSLS, p=_zipf_weights(len(PRODUCTS), 1.1)
+        )
+        self.msl_company = rng.choice(
+            len(COMPANIES), N_MSLS, p=_zipf_weights(len(COMPANIES), 2.0)
+        )
+        self.msl_active = rng.random(N_MSLS) < 0.9
+
+        # Surveys: each has its own block of questions
+        self.survey_names = []
+        for i in range(N_SURVEYS):
+            topic = SURVEY_TOPICS[i % len(SURVEY_TOPICS)]
+            region = self.regions[i % len(self.regions)]
+            self.survey_names.append(f"{topic} ({region}) {2023 + i // 10}")
+        self.survey_keys = _sfdc_ids(rng, "a2B", N_SURVEYS)
+        self.survey_n_questions = rng.integers(3, 9, N_SURVEYS)
+        self.survey_first_question = np.concatenate(
+            ([0], np.cumsum(self.survey_n_questions)[:-1])
+        )
+        self.questions = [
+            f"Q{q + 1}. {self.survey_names[s]}: what did the HCP share about "
+            f"{TUMOR_TYPES[(s * 7 + q) % len(TUMOR_TYPES)]}?"
+            for s in range(N_SURVEYS)
+            for q in range(self.survey_n_questions[s])
+        ]
+
+        # HCP accounts with their institution, specialty and practice setting
+        self.account_names = _unique_names(rng, N_ACCOUNTS, "Dr. {first} {last}")
+        self.account_keys = _sfdc_ids(rng, "001", N_ACCOUNTS)
+        self.institutions = [
+            f"{LAST_NAMES[i % len(LAST_NAMES)]} {kind} {i}"
+            for i, kind in enumerate(
+                rng.choice(
+                    [
+                        "University Hospital",
+                        "Cancer Institute",
+                        "Medical Center",
+                        "Clinic",
+                    ],
+                    N_INSTITUTIONS,
+                )
+            )
+        ]
+        self.account_specialty = rng.choice(
+            len(SPECIALTIES), N_ACCOUNTS, p=_zipf_weights(len(SPECIALTIES), 1.0)
+        )
+        self.account_setting = rng.choice(
+            len(PRACTICE_SETTINGS),
+            N_ACCOUNTS,
+            p=_zipf_weights(len(PRACTICE_SETTINGS), 0.8),
+        )
+
+        self.msl_weights = _zipf_weights(N_MSLS, 0.6)
+        self.account_weights = _zipf_weights(N_ACCOUNTS, 1.05)
+        self.survey_weights = _zipf_weights(N_SURVEYS, 0.9)
+        self.response_weights = _zipf_weights(len(TUMOR_TYPES), 1.0)
+        self.product_weights = _zipf_weights(len(PRODUCTS), 1.2)
+
+
+def _categorical(
+    codes: np.ndarray, categories: List[str], null_mask=None
+) -> pd.Categorical:
+    codes = np.asarray(codes, dtype=np.int32)
+    if null_mask is not None:
+        codes = np.where(null_mask, -1, codes)
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def generate_chunk(
+    dims: SurveyDimensions, start: int, rows: int, seed: int
+) -> pd.DataFrame:
+    """Rows ``start`` .. ``start + rows`` of the dataset for ``seed``"""
+    rng = np.random.default_rng([seed, start])
+
+    msl = rng.choice(N_MSLS, rows, p=dims.msl_weights)
+    account = rng.choice(N_ACCOUNTS, rows, p=dims.account_weights)
+    survey = rng.choice(N_SURVEYS, rows, p=dims.survey_weights)
+    question = dims.survey_first_question[survey] + (
+        rng.random(rows) * dims.survey_n_questions[survey]
+    ).astype(np.int64)
+    response = rng.choice(len(TUMOR_TYPES), rows, p=dims.response_weights)
+    product = rng.choice(len(PRODUCTS), rows, p=dims.product_weights)
+    account_missing = rng.random(rows) < 0.05
+
+    territory = dims.msl_territory[msl]
+    country = dims.territory_country[territory]
+    region = dims.country_region[country]
+
+    # Start dates over three years, with fewer entries at weekends
+    days = rng.integers(0, 3 * 365, rows)
+    weekend = ((days + 6) % 7) >= 5
+    days = np.where(weekend & (rng.random(rows) < 0.7), days - 2, days).clip(0)
+    start_date = np.datetime64("2023-01-02") + days.astype("timedelta64[D]")
+    end_date = start_date + np.timedelta64(3 * 365, "D")
+
+    ids = pd.Series(np.arange(start, start + rows)).astype(str).str.zfill(10)
+    survey_key = np.asarray(dims.survey_keys, dtype=object)[survey]
+    msl_key = np.asarray(dims.msl_keys, dtype=object)[msl]
+    src_cd = np.asarray(dims.src_cds, dtype=object)[region]
+    resp_key = survey_key + "-R" + ids.to_numpy(dtype=object) + "-" + msl_key
+
+    frame = {
+        "survey_qstn_resp_id": resp_key + "-" + src_cd,
+        "survey_qstn_resp_key": resp_key,
+        "survey_key": survey_key,
+        "msl_key": msl_key,
+        "src_cd": src_cd,
+        "account_key": _categorical(account, dims.account_keys, account_missing),
+        "prod_key": None,
+        "survey_name": _categorical(survey, dims.survey_names),
+        "assignment_type": _categorical(
+            rng.choice(len(ASSIGNMENT_TYPES), rows, p=[0.7, 0.2, 0.07, 0.03]),
+            ASSIGNMENT_TYPES,
+        ),
+        "channels": _categorical(
+            rng.choice(len(CHANNELS), rows, p=_zipf_weights(len(CHANNELS), 1.5)),
+            CHANNELS,
+        ),
+        "expired": (rng.random(rows) < 0.08).astype(np.int8),
+        "language": "en_US",
+        "product": _categorical(product, PRODUCTS, rng.random(rows) < 0.2),
+        "region": _categorical(region, dims.regions, rng.random(rows) < 0.02),
+        "segment": None,
+        "start_date": pd.DatetimeIndex(start_date).strftime("%Y-%m-%d"),
+        "end_date": pd.DatetimeIndex(end_date).strftime("%Y-%m-%d"),
+        "status": "Published_vod",
+        "target_type": None,
+        "territory": _categorical(territory, dims.territories, rng.random(rows) < 0.03),
+        "answer_choice": None,
+        "question": _categorical(question, dims.questions),
+        "survey": survey_key,
+        "decimal": None,
+        "number": None,
+        "type": "0128d000000HBAyAAO",
+        "response": _categorical(response, TUMOR_TYPES, rng.random(rows) < 0.1),
+        "account_name": _categorical(account, dims.account_names, account_missing),
+        "msl_id": msl_key + "-" + src_cd,
+        "country_geo_id": _categorical(country, dims.countries),
+        "msl_name": _categorical(msl, dims.msl_logins),
+        "src_cd_1": src_cd,
+        "is_active": dims.msl_active[msl].astype(np.int8),
+        "useremail": _categorical(msl, dims.msl_emails),
+        "usertype": "Standard",
+        "department": _categorical(dims.msl_department[msl], DEPARTMENTS),
+        "product_expertise": _categorical(
+            dims.msl_expertise[msl], PRODUCTS, rng.random(rows) < 0.15
+        ),
+        "user_type": _categorical(dims.msl_user_type[msl], USER_TYPES),
+        "title": _categorical(dims.msl_title[msl], TITLES),
+        # Institution of the account where known, otherwise the MSL's company
+        "company": _categorical(
+            np.where(
+                rng.random(rows) < 0.6,
+                len(COMPANIES) + account % N_INSTITUTIONS,
+                dims.msl_company[msl],
+            ),
+            COMPANIES + dims.institutions,
+        ),
+        "name": _categorical(msl, dims.msl_names),
+        "specialty": _categorical(
+            dims.account_specialty[account], SPECIALTIES, rng.random(rows) < 0.05
+        ),
+        "practice_setting": _categorical(
+            dims.account_setting[account], PRACTICE_SETTINGS, rng.random(rows) < 0.05
+        ),
+    }
+    return pd.DataFrame(frame, columns=COLUMNS)
+
+
+def generate_csv(path: str, rows: int, seed: int = 42) -> Dict:
+    """Write a synthetic survey CSV and its manifest; returns the manifest"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    started = time.perf_counter()
+    dims = SurveyDimensions(seed)
+    distinct: Dict[str, set] = {column: set() for column in FILTER_COLUMNS}
+    tmp_path = f"{path}.tmp"
+
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = generate_chunk(dims, start, min(CHUNK_ROWS, rows - start), seed)
+        for column in FILTER_COLUMNS:
+            distinct[column].update(chunk[column].dropna().unique())
+        chunk.to_csv(
+            tmp_path, mode="w" if start == 0 else "a", header=start == 0, index=False
+        )
+        print(f"  {min(start + CHUNK_ROWS, rows):,}/{rows:,} rows")
+    os.replace(tmp_path, path)
+
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "rows": rows,
+        "seed": seed,
+        "path": os.path.basename(path),
+        "cardinality": {column: len(values) for column, values in distinct.items()},
+        "generated_in_seconds": round(time.perf_counter() - started, 2),
+    }
+    with open(_manifest_path(path), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _manifest_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".json"
+
+
+def snapshot_path(rows: int, seed: int = 42, directory: str = DEFAULT_DIR) -> str:
+    return os.path.join(directory, f"surveys_{size_label(rows)}_seed{seed}.csv")
+
+
+def ensure_snapshot(rows: int, seed: int = 42, directory: str = DEFAULT_DIR) -> str:
+    """Path of the snapshot CSV for (rows, seed), generating it if missing or stale"""
+    path = snapshot_path(rows, seed, directory)
+    manifest: Optional[Dict] = None
+    if os.path.exists(path) and os.path.exists(_manifest_path(path)):
+        with open(_manifest_path(path), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    if (
+        manifest is None
+        or manifest.get("generator_version") != GENERATOR_VERSION
+        or manifest.get("rows") != rows
+    ):
+        print(f"Generating {rows:,} synthetic rows (seed {seed}) -> {path}")
+        generate_csv(path, rows, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic survey CSVs")
+    parser.add_argument(
+        "--rows",
+        action="append",
+        default=None,
+        help="Row count or size label (100k, 1m, 10m); repeatable",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default=DEFAULT_DIR, help="Output directory")
+    parser.add_argument(
+        "--force", action="store_true", help="Regenerate existing files"
+    )
+    args = parser.parse_args()
+
+    for value in args.rows or ["100k"]:
+        rows = parse_rows(value)
+        if args.force:
+            path = snapshot_path(rows, args.seed, args.out)
+            manifest = generate_csv(path, rows, args.seed)
+        else:
+            path = ensure_snapshot(rows, args.seed, args.out)
+            with open(_manifest_path(path), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        print(f"✅ {path}: {json.dumps(manifest['cardinality'])}")
+
+
+if __name__ == "__main__":
+    main()
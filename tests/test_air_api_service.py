@@ -0,0 +1,83 @@
+"""
+Tests for AIRAPIService against a mocked AIR-API
+
+Run from the repository root:
+    pytest tests
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from app.core.metrics import stage_duration
+from app.services.air_api_service import AIRAPIService
+
+
+def _service(handler) -> AIRAPIService:
+    """An AIRAPIService whose shared client talks to ``handler``"""
+    service = AIRAPIService()
+    service._client = httpx.AsyncClient(
+        base_url="http://air-api.test", transport=httpx.MockTransport(handler)
+    )
+    return service
+
+
+def _air_api_calls() -> int:
+    """Number of air_api_call stage observations so far"""
+    series = stage_duration._series.get(("air_api_call",))
+    return 0 if series is None else sum(series[:-1])
+
+
+def test_send_chat_query():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(json.loads(request.content))
+        return httpx.Response(200, json={"answer": "42"})
+
+    service = _service(handler)
+    calls = _air_api_calls()
+
+    response = asyncio.run(
+        service.send_chat_query("How many?", {"regions": ["EU"]}, use_cache=False)
+    )
+
+    assert response == {"answer": "42", "cached": False}
+    assert len(requests) == 1 and "EU" in requests[0]["query"]
+    assert _air_api_calls() == calls + 1
+    assert service.in_flight == 0 and service.requests_total == 1
+
+
+def test_send_chat_query_upstream_error():
+    service = _service(lambda request: httpx.Response(502))
+
+    try:
+        asyncio.run(service.send_chat_query("How many?", use_cache=False))
+    except Exception as e:
+        assert "Error communicating with AI service" in str(e)
+    else:
+        raise AssertionError("expected the upstream error to be raised")
+    assert service.in_flight == 0
+
+
+def test_stream_chat_query():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(
+            200,
+            headers={"content-type": "text/event-stream"},
+            content=b"data: Hello\n\ndata: world\n\n",
+        )
+
+    service = _service(handler)
+    calls = _air_api_calls()
+
+    async def collect():
+        return [event async for event in service.stream_chat_query("Hi")]
+
+    events = asyncio.run(collect())
+
+    assert "data: Hello\n" in events and "data: world\n" in events
+    assert events[-1].startswith("event: done")
+    assert _air_api_calls() == calls + 1
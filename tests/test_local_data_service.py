@@ -0,0 +1,90 @@
+"""
+Tests for LocalDataService over a small synthetic dataset
+
+Run from the repository root:
+    pytest tests
+"""
+
+import logging
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.core.metrics import _request_timings
+from app.models.filter import SurveyFilter
+from app.services.local_data_service import LocalDataService
+from benchmarks.synthetic_data import generate_csv
+
+logging.getLogger("app").setLevel(logging.WARNING)
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory) -> str:
+    path = str(tmp_path_factory.mktemp("data") / "surveys.csv")
+    generate_csv(path, 20_000, seed=7)
+    return path
+
+
+@pytest.fixture(scope="module")
+def service(csv_path) -> LocalDataService:
+    return LocalDataService(csv_path=csv_path)
+
+
+def _reference_groups(csv_path: str, columns, metric: str):
+    """Aggregate rows computed with a pandas groupby"""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False, na_values=[""])
+    grouped = df.groupby(columns, dropna=False)
+    counts = grouped.size() if metric == "count" else grouped["account_name"].nunique()
+    groups = {}
+    for key, value in counts.items():
+        key = key if isinstance(key, tuple) else (key,)
+        if value > 0:
+            groups[tuple(None if pd.isna(v) else v for v in key)] = int(value)
+    return groups
+
+
+@pytest.mark.parametrize("metric", ["count", "distinct_accounts"])
+@pytest.mark.parametrize("n_fields", [1, 3, LocalDataService.MAX_GROUP_BY_FIELDS])
+def test_aggregate_matches_pandas(service, csv_path, metric, n_fields):
+    # The highest-cardinality fields, whose combined key overflows int64
+    params = sorted(service.field_indexes, key=lambda p: -len(service.field_indexes[p]))
+    params = params[:n_fields]
+    columns = [service.FILTER_FIELD_MAPPING[p] for p in params]
+
+    result = service.aggregate_surveys({}, params, metric)
+
+    groups = {tuple(row[c] for c in columns): row["value"] for row in result["rows"]}
+    assert groups == _reference_groups(csv_path, columns, metric)
+    values = [row["value"] for row in result["rows"]]
+    assert values == sorted(values, reverse=True)
+
+
+def test_aggregate_key_overflow_is_exercised(service):
+    params = sorted(service.field_indexes, key=lambda p: -len(service.field_indexes[p]))
+    radixes = [len(service.field_indexes[p]) + 1 for p in params]
+    radixes = radixes[: LocalDataService.MAX_GROUP_BY_FIELDS]
+    radixes.append(len(service.field_indexes["account_names"]))
+    assert math.prod(radixes) > np.iinfo(np.int64).max
+
+
+def test_aggregate_rejects_too_many_fields(service):
+    params = list(service.field_indexes)[: LocalDataService.MAX_GROUP_BY_FIELDS + 1]
+    with pytest.raises(ValueError):
+        service.aggregate_surveys({}, params)
+
+
+def test_batch_stages_reach_request_timings(service):
+    items = {"a": SurveyFilter(size=10), "b": SurveyFilter(page=2, size=10)}
+    timings = []
+    token = _request_timings.set(timings)
+    try:
+        results = service.get_surveys_batch(items, workers=2)
+    finally:
+        _request_timings.reset(token)
+
+    assert all(result["status"] == "ok" for result in results.values())
+    stages = [name for name, _ in timings]
+    assert stages.count("paginate") == len(items)
+    assert stages.count("serialize") == len(items)